@@ -3,16 +3,20 @@ from typing import Dict, List
 from src.measures.metrics.literature import EMDPol, EstebanRay, Experts, ShannonPol, VanDerEijkPol
 from src.measures.metrics.proposed import MEC, BiPol
 from src.measures.metrics.proposed.mec import MECNormalized
+from src.measures import MeasureSuite
 
 class MeasureCalculator:
-    def __init__(self, tolerance: float = 1e-4):
+    def __init__(self, tolerance: float = 1e-4, executor=None):
         """
         Initialize all polarization measures.
         
         Parameters:
             tolerance (float): Numerical tolerance for rounding values
+            executor: Parallel executor for process_batch ("threads", "processes"
+                or a BatchExecutor); serial when None
         """
         self.tolerance = tolerance
+        self.executor = executor
         self.measures = {
             'MEC(1,1)': MEC(alpha=1, beta=1),
             'MEC(2,1.15)N': MECNormalized(),
@@ -27,11 +31,12 @@ class MeasureCalculator:
             'VanDerEijk': VanDerEijkPol(),
             'BiPol': BiPol()
         }
+        self.suite = MeasureSuite(self.measures)
         self.results: Dict[str, List[float]] = {name: [] for name in self.measures}
         
     def calculate_all(self, x: np.ndarray, weights: np.ndarray) -> Dict[str, float]:
         """Calculate all measures for a given distribution."""
-        values = {name: measure(x, weights) for name, measure in self.measures.items()}
+        values = self.suite(x, weights)
         return {name: np.round(val/self.tolerance)*self.tolerance 
                for name, val in values.items()}
     
@@ -40,5 +45,11 @@ class MeasureCalculator:
         for name, value in results.items():
             self.results[name].append(value)
     
+    def process_batch(self, x: np.ndarray, weights: np.ndarray) -> None:
+        """Calculate all measures for an (m, k) matrix of distributions sharing x."""
+        for name, values in self.suite.compute_batch(x, weights, executor=self.executor).as_dict().items():
+            rounded = np.round(values/self.tolerance)*self.tolerance
+            self.results[name].extend(rounded.tolist())
+    
     def get_values(self) -> Dict[str, np.ndarray]:
         return {name: np.array(values) for name, values in self.results.items()}
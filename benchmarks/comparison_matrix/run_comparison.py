@@ -1,3 +1,4 @@
+import numpy as np
 from benchmarks.comparison_matrix import (
    generate_distributions, 
    count_distributions,
@@ -6,15 +7,22 @@ from benchmarks.comparison_matrix import (
    plot_correlation_matrix
 )
 
-def main(n: int = 5, k: int = 5):
+def main(n: int = 5, k: int = 5, batch_size: int = 10000):
     calculator = MeasureCalculator()
     total_distributions = count_distributions(n, k)
     print(f"Analyzing {total_distributions} distributions...")
 
-    for i, (x, weights) in enumerate(generate_distributions(n, k)):
-        calculator.process_distribution(x, weights)
-        if (i + 1) % 1000 == 0:
-            print(f"Processed {i + 1}/{total_distributions} distributions")
+    processed = 0
+    batch = []
+    for x, weights in generate_distributions(n, k):
+        batch.append(weights)
+        if len(batch) == batch_size:
+            calculator.process_batch(x, np.array(batch))
+            processed += len(batch)
+            batch = []
+            print(f"Processed {processed}/{total_distributions} distributions")
+    if batch:
+        calculator.process_batch(x, np.array(batch))
 
     values = calculator.get_values()
     correlation_matrix = compute_kendall_matrix(values)
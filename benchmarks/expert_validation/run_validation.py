@@ -4,6 +4,7 @@ import pandas as pd
 from src.measures.metrics.literature import EMDPol, EstebanRay, Experts, ShannonPol, VanDerEijkPol
 from src.measures.metrics.proposed import MEC, BiPol
 from src.measures.metrics.proposed.mec import MECNormalized
+from src.measures import MeasureSuite
 from scipy.stats import kendalltau
 from .data import ValidationData
 import matplotlib.pyplot as plt
@@ -23,15 +24,15 @@ class ValidationCalculator:
             'VanDerEijk': VanDerEijkPol(),
             'BiPol': BiPol(),
         }
+        self.suite = MeasureSuite(self.measures)
         self.results: Dict[str, list] = {name: [] for name in self.measures}
 
     def process_distributions(self, x_values: np.ndarray, distributions: np.ndarray) -> None:
         """Procesa todas las distribuciones en orden"""
-        for i, dist in enumerate(distributions):
-            for name, measure in self.measures.items():
-                # Truncar a 4 decimales
-                value = measure(x_values, dist)
-                self.results[name].append(np.trunc(value * 10000) / 10000)
+        result = self.suite.compute_batch(x_values, distributions)
+        for name, values in result.as_dict().items():
+            # Truncar a 4 decimales (redondeando antes el ruido de punto flotante)
+            self.results[name].extend((np.trunc(np.round(values, 12) * 10000) / 10000).tolist())
 
     def get_values(self) -> Dict[str, np.ndarray]:
         return {name: np.array(values) for name, values in self.results.items()}
@@ -10,12 +10,23 @@ setup(
         "scipy>=1.7.0",
     ],
     extras_require={
+        "jit": [
+            "numba>=0.57",
+        ],
+        "arrow": [
+            "pyarrow>=10.0",
+        ],
         "dev": [
             "pytest>=6.0",
             "black>=21.0",
             "mypy>=0.900",
         ],
     },
+    entry_points={
+        "console_scripts": [
+            "measures=measures.cli:main",
+        ],
+    },
     python_requires=">=3.8",
     author="Juan Camilo Narváez Tascón",
     author_email="juan.narvaez.tascon@correounivalle.edu.co",
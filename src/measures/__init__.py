@@ -1,5 +1,22 @@
 from .base import PolarizationMeasure
-from .validation import validate_histogram
+from .validation import validate_histogram, validate_batch, Histogram
+from .histograms import Grid, HistogramBatch
+from .trackers import PolarizationTracker
+from .executors import BatchExecutor, ThreadExecutor, ProcessExecutor
+from .suite import MeasureSuite, SuiteResult
+from .timeseries import SlidingWindowSeries, DecayedSeries, SeriesResult
+from .ingestion import ResponseCounter, histogram_from_responses, batch_from_responses
+from .groupby import group_by, GroupByResult
+from .profiles import item_profiles
+from .chunked import compute_chunked
+from .columnar import iter_record_batches, histograms_from_file, write_columns, HistogramTable
 from .metrics import literature, proposed
 
-__all__ = ["literature", "proposed", "PolarizationMeasure", "validate_histogram"]
+__all__ = ["literature", "proposed", "PolarizationMeasure", "validate_histogram", "validate_batch",
+           "Histogram", "Grid", "HistogramBatch", "MeasureSuite", "SuiteResult",
+           "ResponseCounter", "histogram_from_responses", "batch_from_responses",
+           "PolarizationTracker", "SlidingWindowSeries", "DecayedSeries", "SeriesResult",
+           "group_by", "GroupByResult", "item_profiles",
+           "BatchExecutor", "ThreadExecutor", "ProcessExecutor",
+           "compute_chunked", "iter_record_batches", "histograms_from_file", "write_columns",
+           "HistogramTable"]
@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Union, Tuple, Dict, Any, List
+from typing import Optional, Union, Tuple, Dict, Any, List, Callable
 import numpy as np
 import math
-from .validation import validate_histogram
-from .thresholds import THRESHOLDS, CATEGORY_LABELS
+from .validation import validate_histogram, validate_batch, Histogram
+from .histograms import Grid, HistogramBatch
+from .trackers import PolarizationTracker
+from .executors import BatchExecutor, get_executor
+from .thresholds import THRESHOLDS, _COMPILED_THRESHOLDS, category_labels
+
+_UNRESOLVED = object()
 
 class PolarizationMeasure(ABC):
     """Base class for all polarization measures."""
@@ -11,6 +16,17 @@ class PolarizationMeasure(ABC):
     def __init__(self) -> None:
         self._cached_result: Optional[float] = None
         self._measure_id: Optional[str] = None
+        self._parameter_set: Any = _UNRESOLVED
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        # The sentinel does not survive pickling; resolve again after unpickling
+        del state['_parameter_set']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._parameter_set = _UNRESOLVED
 
     @property
     def measure_id(self) -> str:
@@ -23,6 +39,7 @@ class PolarizationMeasure(ABC):
     def measure_id(self, value: str) -> None:
         """Set a custom identifier for threshold lookup."""
         self._measure_id = value
+        self._parameter_set = _UNRESOLVED
 
     @abstractmethod
     def compute(self, x: np.ndarray, weights: np.ndarray) -> float:
@@ -88,38 +105,55 @@ class PolarizationMeasure(ABC):
         else:
             return "default" if not current_params else None
 
+    def _resolve_parameter_set(self) -> Optional[str]:
+        """
+        Return find_matching_parameter_set(), resolved once per instance and
+        re-resolved after update_parameters or a new measure_id.
+        """
+        if self._parameter_set is _UNRESOLVED:
+            self._parameter_set = self.find_matching_parameter_set()
+        return self._parameter_set
+
     def __call__(
         self, 
-        x: np.ndarray, 
-        weights: np.ndarray, 
+        x: Union[np.ndarray, Histogram, Grid], 
+        weights: Optional[np.ndarray] = None, 
         labels: Optional[Union[int, str]] = None,
-        method: str = "kmeans"
+        method: str = "kmeans",
+        trusted: bool = False
     ) -> Union[float, Tuple[float, str], Dict[str, Any]]:
         """
         Compute polarization and optionally classify the result.
         
         Args:
-            x: The positions of the distribution
-            weights: The weights of the distribution
+            x: The positions of the distribution, a validated Histogram, or a
+                Grid whose positions are reused without re-checking them
+            weights: The weights of the distribution (omitted for a Histogram)
             labels: 
                 - None: Return only the numerical value (default)
                 - int: Return value and classification using k clusters
                 - "all": Return all available classification schemes
             method: Classification method ("kmeans" or "percentile")
+            trusted: Skip validation; x must be sorted and scaled to [0, 1]
+                and weights must sum to 1
             
         Returns:
             - float: When labels=None
             - (float, str): When labels is an integer
             - dict: When labels="all"
         """
-        x, weights = validate_histogram(x, weights)
+        if isinstance(x, Grid):
+            x, weights = (Histogram(x.x, np.asarray(weights, dtype=np.float64)) if trusted
+                          else x.histogram(weights))
+        else:
+            x, weights = validate_histogram(x, weights, trusted=trusted)
         self._cached_result = self.compute(x, weights)
 
         
         if labels is None:
             return self._cached_result
         
-        param_set = self.find_matching_parameter_set()
+        param_set = self._resolve_parameter_set()
         
         if labels == "all":
             if param_set is None:
@@ -143,6 +177,111 @@ class PolarizationMeasure(ABC):
         
         raise ValueError(f"Invalid value for 'labels': {labels}. Must be None, a positive integer, or 'all'.")
     
+    def compute_batch(
+        self,
+        x: Union[np.ndarray, Grid, HistogramBatch],
+        weights: Optional[np.ndarray] = None,
+        return_mask: bool = False,
+        trusted: bool = False,
+        executor: Union[str, BatchExecutor, None] = None
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Compute the polarization measure for every row of a weights matrix.
+
+        Args:
+            x: Shared positions of shape (K,), a Grid, per-row positions of
+                shape (m, K), or a HistogramBatch (then weights is omitted)
+            weights: Weights matrix of shape (m, K)
+            return_mask: Also return the per-row validity mask
+            trusted: Skip validation; every row must already be a normalized
+                histogram on a sorted grid scaled to [0, 1]
+            executor: Evaluate row chunks in parallel: "threads", "processes"
+                or a BatchExecutor; serial when None
+
+        Returns:
+            - np.ndarray: (m,) values, NaN for invalid rows, when return_mask=False
+            - (np.ndarray, np.ndarray): Values and boolean validity mask otherwise
+        """
+        executor = get_executor(executor)
+        if executor is not None:
+            values, valid = executor.evaluate(self, x, weights, trusted)
+            return (values, valid) if return_mask else values
+
+        if isinstance(x, Grid):
+            x = HistogramBatch(x, weights, trusted=trusted)
+        if isinstance(x, HistogramBatch):
+            return self._evaluate_histogram_batch(x, return_mask)
+
+        x, weights, valid = validate_batch(x, weights, trusted=trusted)
+        values = np.full(weights.shape[0], np.nan)
+
+        if np.all(valid):
+            values[:] = self._compute_batch(x, weights)
+        elif np.any(valid):
+            rows_x = x if x.ndim == 1 else x[valid]
+            values[valid] = self._compute_batch(rows_x, weights[valid])
+
+        if return_mask:
+            return values, valid
+        return values
+
+    def _evaluate_rows(self, x: Union[np.ndarray, Grid, HistogramBatch],
+                       weights: Optional[np.ndarray],
+                       trusted: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Values and validity mask of a chunk of rows; the task of a BatchExecutor."""
+        return self.compute_batch(x, weights, return_mask=True, trusted=trusted)
+
+    def _evaluate_histogram_batch(
+        self,
+        batch: HistogramBatch,
+        return_mask: bool
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """Evaluate the valid rows of a HistogramBatch, NaN elsewhere."""
+        values = np.full(len(batch), np.nan)
+
+        if np.all(batch.valid):
+            values[:] = self._compute_histogram_batch(batch)
+        elif np.any(batch.valid):
+            values[batch.valid] = self._compute_histogram_batch(batch.select(batch.valid))
+
+        if return_mask:
+            return values, batch.valid.copy()
+        return values
+
+    def _compute_histogram_batch(self, batch: HistogramBatch) -> np.ndarray:
+        """
+        Compute the measure for a HistogramBatch whose rows are all valid.
+
+        Defaults to _compute_batch on the shared grid; measures override it to
+        reuse the grid and batch caches.
+        """
+        return self._compute_batch(batch.grid.x, batch.weights)
+
+    def _compute_batch(self, x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """
+        Compute the measure for validated rows.
+
+        Generic fallback that calls compute once per row; measures override it
+        with a vectorized kernel. x is either the shared (K,) grid or an (m, K)
+        matrix of per-row grids.
+        """
+        if x.ndim == 1:
+            return np.array([self.compute(x, row) for row in weights], dtype=float)
+        return np.array([self.compute(x_row, row) for x_row, row in zip(x, weights)],
+                        dtype=float)
+
+    def tracker(self, x: Union[np.ndarray, Grid],
+                counts: Optional[np.ndarray] = None) -> PolarizationTracker:
+        """
+        Return a tracker that keeps this measure up to date as counts are added
+        to and removed from the bins of x.
+
+        Args:
+            x: Positions of the bins, shape (K,), or a Grid
+            counts: Initial counts, shape (K,); empty when omitted
+        """
+        return PolarizationTracker(self, x, counts)
+
     def _get_thresholds(self, num_categories: int, method: str = "kmeans", param_set: str = "default") -> List[float]:
         """
         Get thresholds for this measure from the threshold database.
@@ -176,6 +315,21 @@ class PolarizationMeasure(ABC):
             raise ValueError(f"No {method} thresholds for {num_categories} categories in measure: {self.measure_id}")
         
         return thresholds_data[method][num_categories]
+
+    def _threshold_array(self, num_categories: int, method: str = "kmeans",
+                         param_set: str = "default") -> np.ndarray:
+        """
+        Return the thresholds as a read-only sorted array, compiled once per
+        (measure, param set, method, number of categories).
+        """
+        key = (self.measure_id, param_set, method, num_categories)
+        thresholds = _COMPILED_THRESHOLDS.get(key)
+        if thresholds is None:
+            thresholds = np.array(self._get_thresholds(num_categories, method, param_set),
+                                  dtype=np.float64)
+            thresholds.flags.writeable = False
+            _COMPILED_THRESHOLDS[key] = thresholds
+        return thresholds
     
     def _classify_value(self, value: float, num_categories: int, method: str = "kmeans", 
                         param_set: str = "default") -> str:
@@ -191,14 +345,37 @@ class PolarizationMeasure(ABC):
         Returns:
             Classification label
         """
-        thresholds = self._get_thresholds(num_categories, method, param_set)
-        labels = CATEGORY_LABELS.get(num_categories, [f"category_{i+1}" for i in range(num_categories)])
-        
-        for i, threshold in enumerate(thresholds):
-            if value < threshold:
-                return labels[i]
-        
-        return labels[-1]
+        thresholds = self._threshold_array(num_categories, method, param_set)
+        # Category i holds thresholds[i - 1] <= value < thresholds[i]
+        return category_labels(num_categories)[int(np.searchsorted(thresholds, value, side='right'))]
+
+    def classify_batch(self, values: np.ndarray, num_categories: int,
+                       method: str = "kmeans") -> Tuple[np.ndarray, List[str]]:
+        """
+        Classify many values at once against the thresholds of this measure.
+
+        Args:
+            values: Values to classify, e.g. the output of compute_batch
+            num_categories: Number of categories for classification
+            method: Classification method ("kmeans" or "percentile")
+
+        Returns:
+            (np.ndarray, List[str]): int8 category codes with the shape of values,
+            -1 for NaN, and the labels the codes index into
+
+        Raises:
+            ValueError: If no thresholds match the measure and its parameters
+        """
+        param_set = self._resolve_parameter_set()
+        if param_set is None:
+            raise ValueError(f"No matching thresholds found for the current parameters of {self.measure_id}")
+
+        thresholds = self._threshold_array(num_categories, method, param_set)
+        values = np.asarray(values, dtype=np.float64)
+
+        codes = np.searchsorted(thresholds, values, side='right').astype(np.int8)
+        codes[np.isnan(values)] = -1
+        return codes, category_labels(num_categories)
     
     def _get_all_classifications(self, value: float, param_set: str = "default") -> Dict[str, Any]:
         """
@@ -236,8 +413,8 @@ class PolarizationMeasure(ABC):
             
             for num_cats in method_data:
                 try:
-                    category = self._classify_value(value, num_cats, method_name, param_set)
-                    result["classifications"][method_name][num_cats] = category
+                    result["classifications"][method_name][num_cats] = self._classify_value(
+                        value, num_cats, method_name, param_set)
                 except ValueError:
                     pass
         
@@ -253,10 +430,23 @@ class ParametricPolarizationMeasure(PolarizationMeasure):
     def __init__(self, **parameters) -> None:
         super().__init__()
         self.parameters = parameters
+        self._constants: Dict[str, float] = {}
 
     def update_parameters(self, **parameters) -> None:
         self.parameters.update(parameters)
         self._cached_result = None
+        self._constants.clear()
+        self._parameter_set = _UNRESOLVED
+
+    def _constant(self, name: str, factory: Callable[[], float]) -> float:
+        """
+        Return a constant that depends only on the parameters (e.g. a normalization
+        factor), computing it once per parameter set.
+        """
+        value = self._constants.get(name)
+        if value is None:
+            value = self._constants[name] = factory()
+        return value
     
     def get_parameters(self) -> Dict[str, Any]:
         """Return the current parameters of the measure."""
@@ -0,0 +1,133 @@
+from typing import Dict, Optional, Sequence, Union
+import json
+import os
+import numpy as np
+
+from .base import PolarizationMeasure
+from .executors import BatchExecutor
+from .histograms import Grid
+from .suite import MeasureSuite
+
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+def _progress_path(output: str) -> str:
+    return output + ".progress"
+
+def _describe(measure: PolarizationMeasure) -> str:
+    parameters = sorted(getattr(measure, "parameters", {}).items())
+    return f"{type(measure).__name__}({parameters!r})"
+
+def _fingerprint(weights: np.ndarray, path: Optional[str], grid: Grid,
+                 suite: MeasureSuite, shape: tuple) -> dict:
+    """
+    Describe a run: output shape, measures with their parameters, positions and
+    input, with the size and modification time of an input file.
+    """
+    path = path if path is not None else getattr(weights, "filename", None)
+    source = {"path": None, "shape": list(weights.shape), "dtype": str(weights.dtype)}
+    if path is not None:
+        stat = os.stat(path)
+        source.update(path=os.path.abspath(path), size=stat.st_size, mtime=stat.st_mtime_ns)
+    return {
+        "shape": list(shape),
+        "names": suite.names,
+        "measures": [_describe(measure) for measure in suite.measures],
+        "x": grid.x.tolist(),
+        "input": source,
+    }
+
+def _read_progress(output: str, fingerprint: dict) -> int:
+    """Rows already written to output by an earlier run with the same fingerprint, 0 if none."""
+    try:
+        with open(_progress_path(output)) as file:
+            progress = json.load(file)
+    except FileNotFoundError:
+        return 0
+    if progress.get("fingerprint") != fingerprint:
+        raise ValueError(f"{output} was written for other measures or another input; "
+                         "use resume=False to start over")
+    return int(progress["rows"])
+
+def _write_progress(output: str, fingerprint: dict, rows: int) -> None:
+    """Record the rows written so far, replacing the progress file atomically."""
+    path = _progress_path(output)
+    with open(path + ".tmp", "w") as file:
+        json.dump({"rows": rows, "fingerprint": fingerprint}, file)
+    os.replace(path + ".tmp", path)
+
+def compute_chunked(
+    weights: Union[str, np.ndarray],
+    x: Union[np.ndarray, Grid],
+    measures: Union[PolarizationMeasure, MeasureSuite, Dict[str, PolarizationMeasure],
+                    Sequence[PolarizationMeasure]],
+    output: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    resume: bool = True,
+    trusted: bool = False,
+    executor: Union[str, BatchExecutor, None] = None
+) -> np.memmap:
+    """
+    Evaluate measures on a weights matrix larger than memory, chunk by chunk,
+    into a memory-mapped .npy output.
+
+    Rows are read chunk_rows at a time from a memory-mapped input, evaluated
+    with the usual batch kernels (one MeasureSuite pass per chunk) and written
+    to the output, so memory use is bounded by the chunk size. After every
+    chunk the output is flushed and the number of rows done is recorded in
+    <output>.progress together with a fingerprint of the run (measures and
+    their parameters, positions, and the input's shape, dtype and, for a file,
+    path, size and modification time); with resume, a later call with the
+    same fingerprint continues after the last completed chunk.
+
+    Parameters:
+        weights: A (m, K) array, np.memmap, or path to a .npy file (memory-mapped read-only)
+        x (Union[np.ndarray, Grid]): Shared positions of shape (K,)
+        measures: A measure, a MeasureSuite, a {name: measure} mapping or a
+            sequence of measures
+        output (str): Path of the .npy file to write
+        chunk_rows (int): Rows evaluated at a time
+        resume (bool): Continue an interrupted run instead of starting over
+        trusted (bool): Skip validation, as in PolarizationMeasure.compute_batch
+        executor: Evaluate every chunk in parallel, as in compute_batch
+
+    Returns:
+        np.memmap: The output values, (m,) for a single measure or
+        (m, n_measures), NaN for invalid rows
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive")
+    path = None
+    if isinstance(weights, (str, os.PathLike)):
+        path = os.fspath(weights)
+        weights = np.load(path, mmap_mode="r")
+    if weights.ndim != 2:
+        raise ValueError("weights must be a 2D array (m, K)")
+
+    single = isinstance(measures, PolarizationMeasure)
+    suite = (MeasureSuite([measures]) if single
+             else measures if isinstance(measures, MeasureSuite) else MeasureSuite(measures))
+    grid = x if isinstance(x, Grid) else Grid(x)
+
+    m = weights.shape[0]
+    shape = (m,) if single else (m, len(suite))
+    output = os.fspath(output)
+    fingerprint = _fingerprint(weights, path, grid, suite, shape)
+    done = _read_progress(output, fingerprint) if resume and os.path.exists(output) else 0
+
+    if done:
+        values = np.lib.format.open_memmap(output, mode="r+")
+        if values.shape != shape:
+            raise ValueError(f"{output} has shape {values.shape}, expected {shape}")
+    else:
+        values = np.lib.format.open_memmap(output, mode="w+", dtype=np.float64, shape=shape)
+        _write_progress(output, fingerprint, 0)
+
+    for start in range(done, m, chunk_rows):
+        stop = min(start + chunk_rows, m)
+        result = suite.compute_batch(grid, np.asarray(weights[start:stop]),
+                                     trusted=trusted, executor=executor)
+        values[start:stop] = result.values[:, 0] if single else result.values
+        values.flush()
+        _write_progress(output, fingerprint, stop)
+
+    return values
@@ -0,0 +1,331 @@
+"""
+The measures command line: score histogram or response files, classify
+scored values against THRESHOLDS and time the batch kernels, without
+writing Python.
+
+    measures score counts.csv --columns c1,c2,c3,c4,c5 --keep id -m ER -m EMD -o values.csv
+    measures score answers.parquet --responses --columns q1,q2 --categories 1,2,3,4,5 \\
+        --keys country --weights weight --missing 9 --num-categories 3
+    cat counts.csv | measures score - --columns c1,c2,c3,c4,c5 --executor processes
+    measures classify values.csv -m ER -m BiPol --num-categories 3 -o classes.csv
+    measures bench --rows 1000000 --bins 7
+"""
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import numpy as np
+
+from .base import PolarizationMeasure
+from .chunked import compute_chunked
+from .columnar import (DEFAULT_BATCH_ROWS, histograms_from_file, iter_record_batches,
+                       write_columns, _format_of)
+from .executors import BatchExecutor, ProcessExecutor, ThreadExecutor
+from .suite import MeasureSuite, SuiteResult
+from .thresholds import THRESHOLDS
+from .metrics.literature import EMDPol, EstebanRay, Experts, ShannonPol, VanDerEijkPol
+from .metrics.proposed import BiPol, MEC, MECNormalized
+
+MEASURES = {
+    "EstebanRay": EstebanRay, "ER": EstebanRay,
+    "EMDPol": EMDPol, "EMD": EMDPol,
+    "Experts": Experts,
+    "ShannonPol": ShannonPol, "Shannon": ShannonPol,
+    "VanDerEijkPol": VanDerEijkPol, "VanDerEijk": VanDerEijkPol,
+    "MEC": MEC,
+    "MECNormalized": MECNormalized,
+    "BiPol": BiPol,
+}
+
+# Column name -> measure spec evaluated when no --measure is given
+DEFAULT_MEASURES = {
+    "ER": "ER", "EMD": "EMD", "Experts": "Experts:interpolate=true", "Shannon": "Shannon",
+    "VanDerEijk": "VanDerEijk", "MEC": "MEC", "MECNormalized": "MECNormalized", "BiPol": "BiPol",
+}
+
+def _parse_value(text: str) -> Any:
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    return text
+
+def parse_measure(spec: str) -> PolarizationMeasure:
+    """
+    Build a measure from a NAME[:param=value,...] spec, e.g. "ER:alpha=1.6"
+    or "MEC:alpha=1,beta=1".
+
+    Raises:
+        ValueError: For an unknown measure or invalid parameters
+    """
+    name, _, params = spec.partition(":")
+    if name not in MEASURES:
+        raise ValueError(f"Unknown measure {name!r}; choose from {', '.join(MEASURES)}")
+    kwargs = {}
+    for item in filter(None, params.split(",")):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Measure parameters are param=value pairs, got {item!r}")
+        kwargs[key.strip()] = _parse_value(value.strip())
+    try:
+        return MEASURES[name](**kwargs)
+    except TypeError as error:
+        raise ValueError(f"Invalid parameters for {name}: {error}") from None
+
+def parse_suite(specs: Optional[Sequence[str]]) -> MeasureSuite:
+    """
+    Build a MeasureSuite from --measure specs, each optionally named as
+    COLUMN=SPEC (e.g. "ER16=ER:alpha=1.6"); the default measures when empty.
+    """
+    if not specs:
+        return MeasureSuite({name: parse_measure(spec) for name, spec in DEFAULT_MEASURES.items()})
+    measures = {}
+    for spec in specs:
+        label, sep, rest = spec.partition("=")
+        name, spec = (label, rest) if sep and ":" not in label else (spec, spec)
+        measures[name] = parse_measure(spec)
+    return MeasureSuite(measures)
+
+def _list(text: Optional[str], convert=str) -> Optional[list]:
+    return None if text is None else [convert(item.strip()) for item in text.split(",") if item.strip()]
+
+def _classes(suite: MeasureSuite, values: np.ndarray, num_categories: int,
+             method: str) -> Dict[str, np.ndarray]:
+    """"<name> category" label columns (None for NaN); measures without thresholds are skipped."""
+    columns = {}
+    for j, (name, measure) in enumerate(zip(suite.names, suite.measures)):
+        try:
+            codes, labels = measure.classify_batch(values[:, j], num_categories, method)
+        except ValueError:
+            continue
+        # Code -1 picks the trailing None
+        columns[f"{name} category"] = np.array(labels + [None], dtype=object)[codes]
+    return columns
+
+class _Output:
+    """
+    Write result columns batch by batch: CSV outputs (and stdout) are
+    appended to as batches arrive, other formats are written once at the end.
+    """
+
+    def __init__(self, path: str, format: Optional[str], delimiter: str) -> None:
+        self.path = path
+        self.format = "csv" if path == "-" else _format_of(path, format)
+        self.delimiter = delimiter
+        self._file = None
+        self._header = True
+        self._parts: List[Dict[str, np.ndarray]] = []
+
+    def write(self, columns: Dict[str, np.ndarray]) -> None:
+        if self.format != "csv":
+            self._parts.append(columns)
+            return
+        if self._file is None:
+            self._file = sys.stdout if self.path == "-" else open(self.path, "w", newline="")
+        write_columns(self._file, columns, delimiter=self.delimiter, header=self._header)
+        self._header = False
+
+    def close(self) -> None:
+        if self._parts:
+            write_columns(self.path, {name: np.concatenate([part[name] for part in self._parts])
+                                      for name in self._parts[0]},
+                          format=self.format, delimiter=self.delimiter)
+        if self._file is not None:
+            self._file.flush()
+            if self._file is not sys.stdout:
+                self._file.close()
+
+def _executor(args: argparse.Namespace) -> Optional[BatchExecutor]:
+    if args.executor is None:
+        return None
+    return (ThreadExecutor if args.executor == "threads" else ProcessExecutor)(args.workers)
+
+def _input(args: argparse.Namespace):
+    return sys.stdin if args.input == "-" else args.input
+
+def _histogram_batches(args: argparse.Namespace) -> Iterator[Tuple[Dict[str, np.ndarray], np.ndarray]]:
+    """(kept columns, (m, K) weights) of every record batch of a histogram file."""
+    if args.input != "-" and args.input.endswith(".npy"):
+        weights = np.load(args.input, mmap_mode="r")
+        for start in range(0, weights.shape[0], args.chunk_rows):
+            yield {}, np.asarray(weights[start:start + args.chunk_rows])
+        return
+
+    columns = _list(args.columns)
+    if not columns:
+        raise ValueError("--columns is required: the count (or share) column of every bin")
+    keep = _list(args.keep) or []
+    for batch in iter_record_batches(_input(args), dict.fromkeys(keep + columns),
+                                     args.input_format, args.chunk_rows, args.delimiter,
+                                     numeric=columns):
+        yield ({name: batch[name] for name in keep},
+               np.column_stack([np.asarray(batch[name], dtype=np.float64) for name in columns]))
+
+def _score(args: argparse.Namespace) -> None:
+    suite = parse_suite(args.measure)
+    if args.responses and not _list(args.columns):
+        raise ValueError("--columns is required: the answer columns to count")
+
+    if args.input.endswith(".npy") and args.output.endswith(".npy"):
+        # Resumable, memory-mapped evaluation of .npy matrices
+        if args.num_categories is not None:
+            raise ValueError("Classification needs a CSV, Parquet, Arrow or NPZ output")
+        weights = np.load(args.input, mmap_mode="r")
+        x = _list(args.x, float) or np.arange(weights.shape[1])
+        with _executor(args) or contextlib.nullcontext() as executor:
+            compute_chunked(weights, np.asarray(x), suite, args.output, args.chunk_rows,
+                            resume=not args.no_resume, executor=executor)
+        return
+
+    output = _Output(args.output, args.output_format, args.delimiter)
+
+    def emit(keys: Dict[str, np.ndarray], result: SuiteResult) -> None:
+        columns = {**keys, **result.as_dict()}
+        if args.num_categories is not None:
+            columns.update(_classes(suite, result.values, args.num_categories, args.method))
+        output.write(columns)
+
+    with _executor(args) or contextlib.nullcontext() as executor:
+        if args.responses:
+            labels = _list(args.labels)
+            missing = None if args.missing is None else (
+                args.missing if labels is not None else float(args.missing))
+            table = histograms_from_file(
+                _input(args), _list(args.columns), _list(args.categories, float), labels,
+                _list(args.keys), args.weights, missing, args.input_format, args.chunk_rows)
+            emit({**table.keys, "total": table.totals},
+                 suite.compute_batch(table.batch, executor=executor))
+        else:
+            x = None
+            for keys, weights in _histogram_batches(args):
+                if x is None:
+                    x = np.asarray(_list(args.x, float) or np.arange(weights.shape[1]))
+                emit(keys, suite.compute_batch(x, weights, executor=executor))
+    output.close()
+
+def _classify(args: argparse.Namespace) -> None:
+    suite = parse_suite(args.measure)
+    output = _Output(args.output, args.output_format, args.delimiter)
+    for batch in iter_record_batches(_input(args), None, args.input_format, args.chunk_rows,
+                                     args.delimiter, numeric=suite.names):
+        missing = [name for name in suite.names if name not in batch]
+        if missing:
+            raise ValueError(f"No value columns for {missing}; name them with COLUMN=SPEC")
+        values = np.column_stack([np.asarray(batch[name], dtype=np.float64)
+                                  for name in suite.names])
+        output.write({**batch, **_classes(suite, values, args.num_categories, args.method)})
+    output.close()
+
+def _bench(args: argparse.Namespace) -> None:
+    suite = parse_suite(args.measure)
+    rng = np.random.default_rng(args.seed)
+    x = np.arange(1, args.bins + 1, dtype=np.float64)
+    weights = rng.dirichlet(np.full(args.bins, 0.5), args.rows)
+
+    targets = list(zip(suite.names, suite.measures)) + [("suite", suite)]
+    print(f"{args.rows} histograms, K={args.bins}, best of {args.repeat}"
+          f"{'' if args.executor is None else f', {args.executor} executor'}")
+    print(f"{'measure':<20}{'seconds':>12}{'histograms/s':>16}")
+    with _executor(args) or contextlib.nullcontext() as executor:
+        for name, target in targets:
+            best = np.inf
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                target.compute_batch(x, weights, executor=executor)
+                best = min(best, time.perf_counter() - start)
+            print(f"{name:<20}{best:>12.4f}{args.rows / best:>16.0f}")
+
+def _list_measures(args: argparse.Namespace) -> None:
+    aliases: Dict[type, List[str]] = {}
+    for name, cls in MEASURES.items():
+        aliases.setdefault(cls, []).append(name)
+    for cls, names in aliases.items():
+        thresholds = "thresholds" if cls.__name__ in THRESHOLDS else "no thresholds"
+        print(f"{' / '.join(names):<28}{thresholds}")
+
+def _add_io_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("input", help="input file, or - for CSV on stdin")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file (.csv, .parquet, .arrow, .npz), or - for CSV on stdout")
+    parser.add_argument("-m", "--measure", action="append",
+                        help="measure as [COLUMN=]NAME[:param=value,...]; repeat for several")
+    parser.add_argument("--input-format", choices=["csv", "parquet", "arrow", "npz"])
+    parser.add_argument("--output-format", choices=["csv", "parquet", "arrow", "npz"])
+    parser.add_argument("--delimiter", default=",", help="CSV field delimiter")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_BATCH_ROWS,
+                        help="rows read and evaluated at a time")
+    parser.add_argument("--method", choices=["kmeans", "percentile"], default="kmeans",
+                        help="threshold set used for classification")
+
+def _add_executor_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--executor", choices=["threads", "processes"],
+                        help="evaluate row chunks in parallel")
+    parser.add_argument("--workers", type=int, help="number of workers; all cores when omitted")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="measures", description="Polarization measures.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser("score", help="score histogram or response files")
+    _add_io_arguments(score)
+    _add_executor_arguments(score)
+    score.add_argument("--columns",
+                       help="comma-separated bin count columns, or answer columns with --responses")
+    score.add_argument("--x", help="comma-separated bin positions; 0..K-1 when omitted")
+    score.add_argument("--keep", help="comma-separated columns copied to the output")
+    score.add_argument("--responses", action="store_true",
+                       help="input rows are respondents; count their answers into histograms")
+    score.add_argument("--categories", help="comma-separated answer codes (with --responses)")
+    score.add_argument("--labels", help="comma-separated answer labels in scale order (with --responses)")
+    score.add_argument("--keys", help="comma-separated grouping columns (with --responses)")
+    score.add_argument("--weights", help="survey weight column (with --responses)")
+    score.add_argument("--missing", help="answer code or label to skip (with --responses)")
+    score.add_argument("--num-categories", type=int,
+                       help="also classify every value into this many categories")
+    score.add_argument("--no-resume", action="store_true",
+                       help="start .npy to .npy runs over instead of resuming")
+    score.set_defaults(handler=_score)
+
+    classify = commands.add_parser("classify", help="classify scored values with THRESHOLDS")
+    _add_io_arguments(classify)
+    classify.add_argument("--num-categories", type=int, required=True)
+    classify.set_defaults(handler=_classify)
+
+    bench = commands.add_parser("bench", help="time the batch kernels on random histograms")
+    _add_executor_arguments(bench)
+    bench.add_argument("-m", "--measure", action="append",
+                       help="measure as [COLUMN=]NAME[:param=value,...]; repeat for several")
+    bench.add_argument("--rows", type=int, default=100000)
+    bench.add_argument("--bins", type=int, default=5)
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.add_argument("--seed", type=int, default=0)
+    bench.set_defaults(handler=_bench)
+
+    listing = commands.add_parser("list", help="list the measures")
+    listing.set_defaults(handler=_list_measures)
+    return parser
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of the measures command; returns the exit status."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.handler(args)
+    except BrokenPipeError:
+        # The reader of stdout went away (e.g. | head): stop quietly, and point
+        # stdout at devnull so flushing it at exit does not fail again
+        with contextlib.suppress(OSError, ValueError, io.UnsupportedOperation):
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (ValueError, KeyError, ImportError, OSError) as error:
+        parser.exit(2, f"measures {args.command}: error: {error}\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
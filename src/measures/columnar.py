@@ -0,0 +1,365 @@
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Union
+import csv
+import itertools
+import os
+import zipfile
+import numpy as np
+
+from .histograms import Grid, HistogramBatch
+from .ingestion import ResponseCounter
+from .groupby import factorize_keys
+
+try:
+    import pyarrow
+    import pyarrow.csv
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    # Optional dependency: CSV falls back to the csv module, NPZ needs only numpy
+    pyarrow = None
+
+DEFAULT_BATCH_ROWS = 1 << 16
+
+_FORMATS = {".csv": "csv", ".tsv": "csv", ".txt": "csv", ".parquet": "parquet", ".pq": "parquet",
+            ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow", ".npz": "npz"}
+
+def _format_of(path: str, format: Optional[str]) -> str:
+    if format is None:
+        format = _FORMATS.get(os.path.splitext(path)[1].lower())
+        if format is None:
+            raise ValueError(f"Cannot infer the format of {path}; pass format=")
+    if format not in ("csv", "parquet", "arrow", "npz"):
+        raise ValueError(f"Unknown format: {format!r}")
+    if format in ("parquet", "arrow") and pyarrow is None:
+        raise ImportError(f"Reading and writing {format} files requires pyarrow")
+    return format
+
+def _text_column(name: str, values: Sequence[str], numeric: bool) -> np.ndarray:
+    """Parse a CSV column as float64 (empty fields as NaN) when numeric, else keep its strings."""
+    strings = np.array(values, dtype=str)
+    if not numeric:
+        return strings
+    try:
+        return np.where(strings == "", "nan", strings).astype(np.float64)
+    except ValueError:
+        raise ValueError(f"Column {name} holds values that are not numbers") from None
+
+def _arrow_columns(batch, columns: Optional[Sequence[str]]) -> Dict[str, np.ndarray]:
+    names = batch.schema.names if columns is None else columns
+    return {name: batch.column(name).to_numpy(zero_copy_only=False) for name in names}
+
+def _iter_csv(path: str, columns, batch_rows: int, delimiter: str, numeric: set):
+    if pyarrow is not None:
+        types = {name: pyarrow.float64() if name in numeric else pyarrow.string()
+                 for name in (columns if columns is not None else numeric)}
+        reader = pyarrow.csv.open_csv(
+            path, parse_options=pyarrow.csv.ParseOptions(delimiter=delimiter),
+            convert_options=pyarrow.csv.ConvertOptions(include_columns=columns,
+                                                       column_types=types))
+        for batch in reader:
+            yield _arrow_columns(batch, columns)
+        return
+
+    with open(path, newline="") as file:
+        yield from _iter_csv_text(file, columns, batch_rows, delimiter, numeric)
+
+def _iter_csv_text(file: TextIO, columns, batch_rows: int, delimiter: str, numeric: set):
+    rows = csv.reader(file, delimiter=delimiter)
+    header = next(rows, None)
+    if header is None:
+        return
+    names = header if columns is None else list(columns)
+    missing = [name for name in names if name not in header]
+    if missing:
+        raise KeyError(f"Columns not in the input: {missing}")
+    indices = [header.index(name) for name in names]
+    while True:
+        chunk = list(itertools.islice(rows, batch_rows))
+        if not chunk:
+            return
+        fields = list(zip(*chunk))
+        yield {name: _text_column(name, fields[i], name in numeric)
+               for name, i in zip(names, indices)}
+
+def _npz_member(path: str, archive: zipfile.ZipFile, name: str) -> np.ndarray:
+    """Memory-map an uncompressed .npz member; compressed members are read whole."""
+    info = archive.getinfo(name + ".npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        with archive.open(info) as file:
+            return np.lib.format.read_array(file)
+
+    with open(path, "rb") as file:
+        # The local header has its own name and extra field lengths
+        file.seek(info.header_offset + 26)
+        name_length, extra_length = np.frombuffer(file.read(4), dtype="<u2")
+        file.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+        version = np.lib.format.read_magic(file)
+        read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                       else np.lib.format.read_array_header_2_0)
+        shape, fortran_order, dtype = read_header(file)
+        offset = file.tell()
+    if dtype.hasobject:
+        raise ValueError(f"Member {name} holds Python objects and cannot be memory-mapped")
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+def _iter_npz(path: str, columns, batch_rows: int):
+    with zipfile.ZipFile(path) as archive:
+        names = ([member[:-4] for member in archive.namelist() if member.endswith(".npy")]
+                 if columns is None else list(columns))
+        arrays = {name: _npz_member(path, archive, name) for name in names}
+    n = len(next(iter(arrays.values()))) if arrays else 0
+    for start in range(0, n, batch_rows):
+        yield {name: np.asarray(array[start:start + batch_rows]) for name, array in arrays.items()}
+
+def _iter_arrow(path: str, format: str, columns, batch_rows: int):
+    if format == "parquet":
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=batch_rows,
+                                                                    columns=columns):
+            yield _arrow_columns(batch, columns)
+        return
+
+    with pyarrow.memory_map(path) as source:
+        reader = pyarrow.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for start in range(0, batch.num_rows, batch_rows):
+                yield _arrow_columns(batch.slice(start, batch_rows), columns)
+
+def iter_record_batches(
+    path: Union[str, TextIO],
+    columns: Optional[Sequence[str]] = None,
+    format: Optional[str] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    delimiter: str = ",",
+    numeric: Optional[Sequence[str]] = None
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Stream the columns of a CSV, Parquet, Arrow IPC (Feather) or NPZ file as
+    {column: array} record batches, without loading the whole file.
+
+    Parquet and Arrow files are read with pyarrow, which is also used for CSV
+    when installed; otherwise CSV is parsed with the csv module. CSV columns
+    listed in numeric are parsed as float64 (empty fields as NaN) and all
+    others are kept as strings, so identifiers such as "01" and empty keys
+    survive and every batch of a column has the same dtype. NPZ members are
+    memory-mapped when stored uncompressed.
+
+    Parameters:
+        path (Union[str, TextIO]): File to read, or a text stream such as
+            sys.stdin, read as CSV
+        columns (Optional[Sequence[str]]): Columns to read; all when None
+        format (Optional[str]): "csv", "parquet", "arrow" or "npz"; inferred
+            from the extension when None
+        batch_rows (int): Rows per batch (pyarrow's CSV reader uses its own block size)
+        delimiter (str): CSV field delimiter
+        numeric (Optional[Sequence[str]]): CSV columns to parse as numbers
+
+    Yields:
+        Dict[str, np.ndarray]: One array per column
+    """
+    columns = None if columns is None else list(columns)
+    numeric = set(numeric or [])
+    if hasattr(path, "read"):
+        return _iter_csv_text(path, columns, batch_rows, delimiter, numeric)
+    path = os.fspath(path)
+    format = _format_of(path, format)
+    if format == "csv":
+        return _iter_csv(path, columns, batch_rows, delimiter, numeric)
+    if format == "npz":
+        return _iter_npz(path, columns, batch_rows)
+    return _iter_arrow(path, format, columns, batch_rows)
+
+def _label_codes(answers: np.ndarray, labels: np.ndarray,
+                 missing: Optional[object]) -> np.ndarray:
+    """Map answer labels to their position on the scale; NaN for missing answers."""
+    answers = np.asarray(answers).astype(str)
+    order = np.argsort(labels)
+    position = np.minimum(np.searchsorted(labels, answers, sorter=order), labels.size - 1)
+    index = order[position]
+    matched = labels[index] == answers
+
+    skip = np.isin(answers, ["", "nan", "None"])
+    if missing is not None:
+        skip |= answers == str(missing)
+    if not np.all(matched | skip):
+        raise ValueError(f"Answer {answers[~matched & ~skip][0]!r} is not one of the labels")
+    return np.where(matched & ~skip, index, np.nan)
+
+class _KeyIndex:
+    """Number key combinations across record batches, in order of first appearance."""
+
+    def __init__(self, names: List[str]) -> None:
+        self.names = names
+        self._ids: Dict[tuple, int] = {}
+        self._values: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def groups(self, keys: Dict[str, np.ndarray]) -> np.ndarray:
+        """Return the group of every row of a batch, numbering new combinations."""
+        local, columns = factorize_keys(keys)
+        ids = np.empty(len(next(iter(columns.values()))), dtype=np.intp)
+        for i, key in enumerate(zip(*(columns[name].tolist() for name in self.names))):
+            group = self._ids.get(key)
+            if group is None:
+                group = self._ids[key] = len(self._values)
+                self._values.append(key)
+            ids[i] = group
+        return ids[local]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: np.array([key[j] for key in self._values])
+                for j, name in enumerate(self.names)}
+
+class HistogramTable(NamedTuple):
+    """
+    Histograms read from a file: one row per (key combination, answer column),
+    key combinations in lexicographic order and answer columns as given.
+
+    Attributes:
+        keys (Dict[str, np.ndarray]): The key columns and "item" (the answer
+            column) of every row
+        batch (HistogramBatch): The histograms; rows without answers are invalid
+        totals (np.ndarray): Weighted number of counted answers of every row
+    """
+    keys: Dict[str, np.ndarray]
+    batch: HistogramBatch
+    totals: np.ndarray
+
+def histograms_from_file(
+    path: Union[str, TextIO],
+    columns: Sequence[str],
+    categories: Optional[np.ndarray] = None,
+    labels: Optional[Sequence[str]] = None,
+    keys: Optional[Sequence[str]] = None,
+    weights: Optional[str] = None,
+    missing: Optional[object] = None,
+    format: Optional[str] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    dtype: type = np.float64
+) -> HistogramTable:
+    """
+    Stream a survey export into a HistogramBatch, one record batch at a time.
+
+    Every record batch is counted with a single weighted np.bincount over all
+    its answer columns; key combinations are numbered as they appear, so only
+    the (groups * items, K) counts are ever held in memory.
+
+    Parameters:
+        path (Union[str, TextIO]): CSV, Parquet, Arrow or NPZ file, or a CSV text stream
+        columns (Sequence[str]): Answer columns; all must use the same scale
+        categories (Optional[np.ndarray]): Sorted numeric answer codes
+        labels (Optional[Sequence[str]]): Answer labels in scale order, for
+            text answers; they become the codes 0..K-1
+        keys (Optional[Sequence[str]]): Key columns, e.g. ["country", "wave"];
+            one histogram per answer column when None
+        weights (Optional[str]): Survey weight column
+        missing: Answer code (or label) to skip; NaN and empty answers are always skipped
+        format (Optional[str]): File format, inferred from the extension when None
+        batch_rows (int): Rows per record batch
+        dtype (type): Storage type of the batch weights
+
+    Returns:
+        HistogramTable: Row keys, histograms and totals
+    """
+    if (categories is None) == (labels is None):
+        raise ValueError("Pass exactly one of categories and labels")
+    columns = list(columns)
+    keys = list(keys or [])
+    if labels is not None:
+        labels = np.asarray(labels, dtype=str)
+        categories = np.arange(labels.size)
+
+    categories = np.asarray(categories)
+    counter = ResponseCounter(categories, n_rows=len(columns),
+                              missing=None if labels is not None else missing)
+    index = _KeyIndex(keys)
+    read = columns + keys + ([weights] if weights is not None else [])
+
+    # Keys stay strings in CSV files; answers are numbers unless coded through labels
+    numeric = ([] if labels is not None else columns) + ([weights] if weights is not None else [])
+    for batch in iter_record_batches(path, dict.fromkeys(read), format, batch_rows,
+                                     numeric=numeric):
+        n = len(batch[columns[0]])
+        if n == 0:
+            continue
+        groups = index.groups({name: batch[name] for name in keys}) if keys else np.zeros(n, np.intp)
+        answers = [batch[name] for name in columns]
+        if labels is not None:
+            answers = [_label_codes(answer, labels, missing) for answer in answers]
+
+        counter.add(np.concatenate(answers),
+                    None if weights is None else np.tile(batch[weights], len(columns)),
+                    rows=np.concatenate([groups * len(columns) + j for j in range(len(columns))]))
+
+    # Groups seen only with missing answers have no counts yet; they get invalid rows
+    n_groups = max(len(index), 1)
+    counts = np.zeros((n_groups, len(columns), categories.size), dtype=counter.counts.dtype)
+    counts.reshape(-1, categories.size)[:counter.counts.shape[0]] = counter.counts
+
+    row_keys = {}
+    if keys:
+        # Put the groups in lexicographic key order, as group_by does
+        rank, group_keys = factorize_keys(index.columns())
+        counts[rank] = counts.copy()
+        row_keys = {name: np.repeat(values, len(columns)) for name, values in group_keys.items()}
+    row_keys["item"] = np.tile(np.array(columns), n_groups)
+
+    counts = counts.reshape(-1, categories.size)
+    return HistogramTable(row_keys, HistogramBatch(Grid(counter.categories), counts, dtype=dtype),
+                          counts.sum(axis=1))
+
+def _write_csv_text(file: TextIO, columns: Dict[str, np.ndarray], delimiter: str,
+                    header: bool) -> None:
+    writer = csv.writer(file, delimiter=delimiter)
+    if header:
+        writer.writerow(list(columns))
+    n = len(next(iter(columns.values()))) if columns else 0
+    for start in range(0, n, DEFAULT_BATCH_ROWS):
+        chunk = [values[start:start + DEFAULT_BATCH_ROWS].tolist() for values in columns.values()]
+        writer.writerows(zip(*chunk))
+
+def write_columns(path: Union[str, TextIO], columns: Dict[str, np.ndarray],
+                  format: Optional[str] = None, delimiter: str = ",",
+                  header: bool = True) -> None:
+    """
+    Write {name: (n,) array} columns, e.g. SuiteResult.as_dict() or
+    GroupByResult.as_dict(), as a CSV, Parquet, Arrow IPC or NPZ file.
+
+    Parameters:
+        path (Union[str, TextIO]): File to write, or a text stream such as
+            sys.stdout, written as CSV
+        columns (Dict[str, np.ndarray]): Columns of equal length
+        format (Optional[str]): File format, inferred from the extension when None
+        delimiter (str): CSV field delimiter
+        header (bool): Write the CSV header row; pass False to append batches to a stream
+    """
+    columns = {name: np.asarray(values) for name, values in columns.items()}
+    if len({values.shape for values in columns.values()}) > 1:
+        raise ValueError("All columns must have the same length")
+    if hasattr(path, "write"):
+        _write_csv_text(path, columns, delimiter, header)
+        return
+    path = os.fspath(path)
+    format = _format_of(path, format)
+
+    if format == "npz":
+        # Object columns (e.g. category labels with None) are stored as strings
+        np.savez(path, **{name: np.where(values == None, "", values).astype(str)
+                          if values.dtype == object else values
+                          for name, values in columns.items()})
+    elif format == "csv" and (pyarrow is None or not header):
+        with open(path, "w", newline="") as file:
+            _write_csv_text(file, columns, delimiter, header)
+    else:
+        table = pyarrow.table(columns)
+        if format == "csv":
+            pyarrow.csv.write_csv(table, path,
+                                  pyarrow.csv.WriteOptions(delimiter=delimiter))
+        elif format == "parquet":
+            pyarrow.parquet.write_table(table, path)
+        else:
+            with pyarrow.ipc.new_file(path, table.schema) as writer:
+                writer.write_table(table)
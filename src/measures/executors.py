@@ -0,0 +1,248 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import os
+import pickle
+import numpy as np
+
+from .histograms import Grid, HistogramBatch
+
+DEFAULT_CHUNK_ROWS = 16384
+
+# Unpickled measures and grids kept alive in every worker process between calls,
+# so their cached constants and distance matrices are built once per worker
+_WORKER_TARGETS: Dict[bytes, Any] = {}
+_WORKER_GRIDS: Dict[bytes, Grid] = {}
+_WORKER_CACHE_SIZE = 32
+
+class BatchExecutor(ABC):
+    """
+    Evaluate a measure or a MeasureSuite on many histograms in row chunks on a
+    persistent worker pool.
+
+    The pool is started on first use and kept until shutdown, so workers stay
+    warm between calls. Chunk results are merged in input order, so the output
+    is the same as a serial compute_batch whatever the completion order. Inputs
+    of at most chunk_rows rows are evaluated inline.
+
+    Parameters:
+        max_workers (Optional[int]): Number of workers; os.cpu_count() when None
+        chunk_rows (int): Rows per task
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be positive")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        self._pool: Optional[Executor] = None
+
+    @property
+    def pool(self) -> Executor:
+        """The worker pool, started on first use."""
+        if self._pool is None:
+            self._pool = self._create_pool()
+        return self._pool
+
+    def shutdown(self) -> None:
+        """Stop the workers; the next call starts a new pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "BatchExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def evaluate(self, target: Any, x: Union[np.ndarray, Grid, HistogramBatch],
+                 weights: Optional[np.ndarray], trusted: bool = False
+                 ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate target on every row of a weights matrix.
+
+        Args:
+            target: A PolarizationMeasure or a MeasureSuite
+            x: Shared positions of shape (K,), a Grid, per-row positions of
+                shape (m, K), or a HistogramBatch (then weights is omitted)
+            weights: Weights matrix of shape (m, K)
+            trusted: Skip validation, as in PolarizationMeasure.compute_batch
+
+        Returns:
+            (np.ndarray, np.ndarray): Values of shape (m,) for a measure or
+            (m, n_measures) for a suite, NaN for invalid rows, and the validity mask
+        """
+        if isinstance(x, HistogramBatch):
+            batch = x
+            if len(batch) <= self.chunk_rows or not np.any(batch.valid):
+                return target._evaluate_rows(batch, None, trusted)
+            # Only the valid rows are sent; they are already normalized
+            rows, valid = self.evaluate(target, batch.grid, batch.weights[batch.valid], True)
+            values = np.full((len(batch),) + rows.shape[1:], np.nan)
+            values[batch.valid] = rows
+            return values, batch.valid.copy()
+
+        weights = np.asarray(weights)
+        if weights.ndim != 2:
+            raise ValueError("weights must be a 2D array (m, K)")
+        if not isinstance(x, Grid):
+            x = np.asarray(x)
+            if x.ndim == 1:
+                x = Grid(x)
+
+        m = weights.shape[0]
+        if m <= self.chunk_rows:
+            return target._evaluate_rows(x, weights, trusted)
+
+        bounds = [(start, min(start + self.chunk_rows, m))
+                  for start in range(0, m, self.chunk_rows)]
+        parts = self._map(target, x, weights, bounds, trusted)
+        return (np.concatenate([values for values, _ in parts]),
+                np.concatenate([valid for _, valid in parts]))
+
+    @abstractmethod
+    def _create_pool(self) -> Executor:
+        """Start the worker pool."""
+
+    @abstractmethod
+    def _map(self, target: Any, x: Union[np.ndarray, Grid], weights: np.ndarray,
+             bounds: List[Tuple[int, int]], trusted: bool) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Evaluate target on the rows start:stop of every bound, results in bound order."""
+
+class ThreadExecutor(BatchExecutor):
+    """
+    Evaluate chunks on a thread pool. Chunks are views of the input and the
+    measures are shared, so nothing is copied; the numpy kernels release the
+    GIL for most of their work.
+    """
+
+    def _create_pool(self) -> Executor:
+        return ThreadPoolExecutor(self.max_workers)
+
+    def _map(self, target, x, weights, bounds, trusted):
+        per_row = not isinstance(x, Grid)
+        futures = [self.pool.submit(target._evaluate_rows, x[start:stop] if per_row else x,
+                                    weights[start:stop], trusted)
+                   for start, stop in bounds]
+        return [future.result() for future in futures]
+
+class ProcessExecutor(BatchExecutor):
+    """
+    Evaluate chunks on a process pool.
+
+    The measure (or suite) is pickled once per call and unpickled once per
+    worker, which keeps it, with its cached constants, for later calls; grids
+    are kept the same way. With shared_memory, the input is copied once into a
+    multiprocessing.shared_memory block that every worker maps without copying,
+    and only the block name and row range of a chunk are sent; otherwise every
+    chunk is pickled.
+
+    Parameters:
+        max_workers (Optional[int]): Number of worker processes; os.cpu_count() when None
+        chunk_rows (int): Rows per task
+        shared_memory (bool): Share the input through shared memory
+        mp_context: A multiprocessing context for the pool, e.g.
+            multiprocessing.get_context("spawn"); the platform default when None
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 shared_memory: bool = True, mp_context: Any = None) -> None:
+        super().__init__(max_workers, chunk_rows)
+        self.shared_memory = shared_memory
+        self.mp_context = mp_context
+
+    def _create_pool(self) -> Executor:
+        return ProcessPoolExecutor(self.max_workers, mp_context=self.mp_context)
+
+    def _map(self, target, x, weights, bounds, trusted):
+        payload = pickle.dumps(target)
+        grid_x = x.x if isinstance(x, Grid) else None
+        arrays = [weights] if grid_x is not None else [weights, x]
+
+        if not self.shared_memory:
+            futures = [self.pool.submit(_evaluate_chunk, payload, grid_x,
+                                        [array[start:stop] for array in arrays], trusted)
+                       for start, stop in bounds]
+            return [future.result() for future in futures]
+
+        blocks = []
+        try:
+            for array in arrays:
+                array = np.ascontiguousarray(array)
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks.append(block)
+                np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            specs = [(block.name, array.shape, array.dtype.str)
+                     for block, array in zip(blocks, arrays)]
+            futures = [self.pool.submit(_evaluate_shared, payload, grid_x, specs,
+                                        start, stop, trusted)
+                       for start, stop in bounds]
+            return [future.result() for future in futures]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+def _worker_target(payload: bytes) -> Any:
+    target = _WORKER_TARGETS.get(payload)
+    if target is None:
+        if len(_WORKER_TARGETS) >= _WORKER_CACHE_SIZE:
+            _WORKER_TARGETS.clear()
+        target = _WORKER_TARGETS[payload] = pickle.loads(payload)
+    return target
+
+def _worker_grid(x: np.ndarray) -> Grid:
+    key = x.tobytes()
+    grid = _WORKER_GRIDS.get(key)
+    if grid is None:
+        if len(_WORKER_GRIDS) >= _WORKER_CACHE_SIZE:
+            _WORKER_GRIDS.clear()
+        grid = _WORKER_GRIDS[key] = Grid(x)
+    return grid
+
+def _evaluate_chunk(payload: bytes, grid_x: Optional[np.ndarray],
+                    arrays: Sequence[np.ndarray], trusted: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Worker task: evaluate one chunk of weights (and per-row positions)."""
+    x = _worker_grid(grid_x) if grid_x is not None else arrays[1]
+    return _worker_target(payload)._evaluate_rows(x, arrays[0], trusted)
+
+def _evaluate_shared(payload: bytes, grid_x: Optional[np.ndarray], specs: list,
+                     start: int, stop: int, trusted: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Worker task: evaluate the rows start:stop of arrays held in shared memory."""
+    blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in specs]
+    try:
+        arrays = [np.ndarray(shape, np.dtype(dtype), buffer=block.buf)[start:stop]
+                  for block, (_, shape, dtype) in zip(blocks, specs)]
+        result = _evaluate_chunk(payload, grid_x, arrays, trusted)
+        # The views must be gone before the blocks are closed
+        del arrays
+        return result
+    finally:
+        for block in blocks:
+            block.close()
+
+_DEFAULT_EXECUTORS: Dict[str, BatchExecutor] = {}
+
+def get_executor(executor: Union[str, BatchExecutor, None]) -> Optional[BatchExecutor]:
+    """
+    Resolve the executor option of the batch APIs.
+
+    Args:
+        executor: None for serial evaluation, "threads" or "processes" for a
+            shared default pool kept for the lifetime of the interpreter, or a
+            BatchExecutor
+
+    Returns:
+        Optional[BatchExecutor]: The executor, None for serial evaluation
+    """
+    if executor is None or isinstance(executor, BatchExecutor):
+        return executor
+    if executor not in ("threads", "processes"):
+        raise ValueError(f"Unknown executor: {executor!r}; use 'threads', 'processes' or a BatchExecutor")
+    if executor not in _DEFAULT_EXECUTORS:
+        _DEFAULT_EXECUTORS[executor] = (ThreadExecutor() if executor == "threads"
+                                        else ProcessExecutor())
+    return _DEFAULT_EXECUTORS[executor]
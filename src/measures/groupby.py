@@ -0,0 +1,169 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .base import PolarizationMeasure
+from .suite import MeasureSuite
+from .ingestion import DEFAULT_CHUNK_SIZE, ResponseCounter, _categories_of, _count_chunks
+
+class GroupByResult(NamedTuple):
+    """
+    Columnar result of group_by: one row per key combination that occurs in
+    the data, in lexicographic key order.
+
+    Attributes:
+        keys (Dict[str, np.ndarray]): Key values of every group, one (G,) column per key
+        names (List[str]): Measure names, in column order
+        values (np.ndarray): (G, n_measures) values, NaN for groups without valid answers
+        valid (np.ndarray): Boolean (G,) validity mask
+        totals (np.ndarray): Weighted number of counted answers of every group, (G,)
+        classes (Dict[str, np.ndarray]): int8 category codes of every classified
+            measure, -1 for NaN; empty unless a classification was requested
+        labels (List[str]): Labels the category codes index into
+    """
+    keys: Dict[str, np.ndarray]
+    names: List[str]
+    values: np.ndarray
+    valid: np.ndarray
+    totals: np.ndarray
+    classes: Dict[str, np.ndarray]
+    labels: List[str]
+
+    def __getitem__(self, key):
+        """Return a measure or key column by name, or a tuple field by position."""
+        if isinstance(key, str):
+            if key in self.keys:
+                return self.keys[key]
+            return self.values[:, self.names.index(key)]
+        return tuple.__getitem__(self, key)
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        """
+        Return the table as flat {column: (G,) array} columns: the keys, "total",
+        the measures and, when classified, "<name> category" labels (None for NaN),
+        ready for e.g. pandas.DataFrame.
+        """
+        columns = dict(self.keys)
+        columns["total"] = self.totals
+        for j, name in enumerate(self.names):
+            columns[name] = self.values[:, j]
+        # Code -1 picks the trailing None
+        labels = np.array(self.labels + [None], dtype=object)
+        for name, codes in self.classes.items():
+            columns[f"{name} category"] = labels[codes]
+        return columns
+
+def _named_keys(keys: Union[np.ndarray, Sequence[np.ndarray], Dict[str, np.ndarray]]
+                ) -> Dict[str, np.ndarray]:
+    if isinstance(keys, dict):
+        named = dict(keys)
+    elif isinstance(keys, np.ndarray) and keys.ndim == 1:
+        named = {"key": keys}
+    else:
+        named = {f"key{i}": key for i, key in enumerate(keys)}
+
+    if not named:
+        raise ValueError("At least one key is required")
+    named = {name: np.asarray(key).ravel() for name, key in named.items()}
+    if len({key.size for key in named.values()}) != 1:
+        raise ValueError("All keys must have one entry per response")
+    return named
+
+def factorize_keys(keys: Dict[str, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Number the key combinations that occur, in lexicographic order.
+
+    The per-key codes from np.unique are combined into one integer per
+    response (mixed radix while the product of the cardinalities fits in
+    int64, re-numbered after every key otherwise) and numbered with a final
+    np.unique, so only combinations present in the data get a group.
+
+    Parameters:
+        keys (Dict[str, np.ndarray]): Key arrays of shape (n,)
+
+    Returns:
+        (np.ndarray, Dict[str, np.ndarray]): The group of every response, shape
+        (n,), and the key values of every group, one (G,) column per key
+    """
+    combined = np.zeros(next(iter(keys.values())).size, dtype=np.int64)
+    size = 1
+    for key in keys.values():
+        values, codes = np.unique(key, return_inverse=True)
+        if size * values.size >= 2 ** 62:
+            _, combined = np.unique(combined, return_inverse=True)
+            size = int(combined.max()) + 1 if combined.size else 1
+        combined = combined * values.size + codes.ravel()
+        size *= values.size
+
+    _, first, groups = np.unique(combined, return_index=True, return_inverse=True)
+    columns = {name: key[first] for name, key in keys.items()}
+    return groups.ravel(), columns
+
+def group_by(
+    keys: Union[np.ndarray, Sequence[np.ndarray], Dict[str, np.ndarray]],
+    responses: np.ndarray,
+    measures: Union[MeasureSuite, Dict[str, PolarizationMeasure], Sequence[PolarizationMeasure]],
+    categories: Optional[np.ndarray] = None,
+    weights: Optional[np.ndarray] = None,
+    missing: Optional[float] = None,
+    num_categories: Optional[int] = None,
+    method: str = "kmeans",
+    dtype: type = np.float64,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> GroupByResult:
+    """
+    Compute polarization for every key combination of keyed survey answers,
+    e.g. (country, region, item).
+
+    The keys are factorized into dense group ids, the (G, K) count matrix is
+    built with one weighted np.bincount pass (chunk_size answers at a time),
+    and the measures are evaluated on it as one MeasureSuite batch.
+
+    Parameters:
+        keys: One key array, a sequence of key arrays (named key0, key1, ...)
+            or a {name: key array} mapping, each of shape (n,)
+        responses (np.ndarray): Answer codes or values, shape (n,)
+        measures: A MeasureSuite, a {name: measure} mapping or a sequence of measures
+        categories (Optional[np.ndarray]): Sorted category values; inferred from
+            the distinct responses when None
+        weights (Optional[np.ndarray]): Survey weights, shape (n,)
+        missing (Optional[float]): Response code to skip
+        num_categories (Optional[int]): Also classify every value into this many
+            threshold categories; measures without matching thresholds are left
+            out of classes
+        method (str): Classification method ("kmeans" or "percentile")
+        dtype (type): Storage type of the batch weights
+        chunk_size (int): Responses counted per np.bincount call
+
+    Returns:
+        GroupByResult: One row per group
+    """
+    keys = _named_keys(keys)
+    responses = np.asarray(responses).ravel()
+    if next(iter(keys.values())).size != responses.size:
+        raise ValueError("keys must have one entry per response")
+    if responses.size == 0:
+        raise ValueError("At least one response is required")
+
+    suite = measures if isinstance(measures, MeasureSuite) else MeasureSuite(measures)
+    groups, columns = factorize_keys(keys)
+    if categories is None:
+        categories = _categories_of(responses, missing, chunk_size)
+
+    counter = ResponseCounter(categories, n_rows=int(groups.max()) + 1, missing=missing)
+    _count_chunks(counter, responses, weights, groups, chunk_size)
+    result = suite.compute_batch(counter.batch(dtype=dtype))
+
+    classes, labels = {}, []
+    if num_categories is not None:
+        for name, measure, values in zip(suite.names, suite.measures, result.values.T):
+            try:
+                classes[name], labels = measure.classify_batch(values, num_categories, method)
+            except ValueError:
+                # As measure(x, w, labels=k), measures without thresholds go unclassified
+                continue
+
+    return GroupByResult(columns, suite.names, result.values, result.valid,
+                         counter.counts.sum(axis=1), classes, labels)
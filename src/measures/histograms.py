@@ -0,0 +1,174 @@
+from typing import Callable, Dict, Hashable, Optional, Union
+import numpy as np
+
+from .validation import Histogram, minmax_normalize_x, normalize_weights, validate_batch
+from .utils.grids import distance_matrix
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+class Grid:
+    """
+    A validated scale: strictly increasing positions, min-max normalized to [0, 1]
+    once, with the grid-derived arrays the measures need computed on first use
+    and kept for the lifetime of the grid.
+
+    Parameters:
+        x (np.ndarray): Positions of shape (K,)
+    """
+
+    __slots__ = ("x", "_spacing", "_distances")
+
+    def __init__(self, x: Union[np.ndarray, "Grid"]) -> None:
+        if isinstance(x, Grid):
+            x = x.x
+        x = np.asarray(x, dtype=np.float64)
+
+        if x.ndim != 1:
+            raise ValueError("A grid must be one-dimensional")
+        if x.size < 2:
+            raise ValueError("At least two points are required")
+        if not np.all(np.diff(x) > 0):
+            raise ValueError("x values must be strictly increasing")
+
+        self.x = _read_only(minmax_normalize_x(x))
+        self._spacing: Optional[np.ndarray] = None
+        self._distances: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.x.size
+
+    def __repr__(self) -> str:
+        return f"Grid(K={self.x.size})"
+
+    @property
+    def spacing(self) -> np.ndarray:
+        """Gaps x[k + 1] - x[k], of shape (K - 1,)."""
+        if self._spacing is None:
+            self._spacing = _read_only(np.diff(self.x))
+        return self._spacing
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Pairwise distance matrix |x_i - x_j|, of shape (K, K)."""
+        if self._distances is None:
+            self._distances = distance_matrix(self.x)
+        return self._distances
+
+    def histogram(self, weights: np.ndarray) -> Histogram:
+        """
+        Validate weights on this grid without re-checking the positions.
+
+        Parameters:
+            weights (np.ndarray): Weights of shape (K,)
+
+        Returns:
+            Histogram: The normalized grid and weights
+        """
+        weights = np.asarray(weights)
+        if weights.shape != self.x.shape:
+            raise ValueError("x and weights must have the same shape")
+        return Histogram(self.x, normalize_weights(weights))
+
+    def batch(self, weights: np.ndarray, dtype: type = np.float64,
+              trusted: bool = False) -> "HistogramBatch":
+        """Build a HistogramBatch of (m, K) weights on this grid."""
+        return HistogramBatch(self, weights, dtype=dtype, trusted=trusted)
+
+class HistogramBatch:
+    """
+    An (m, K) matrix of histograms on one shared Grid, validated once.
+
+    Weights are stored row-normalized in a single C-contiguous matrix (float32
+    halves the memory of large batches; the measures still accumulate in
+    float64). Invalid rows are kept as zeros and flagged in valid. Quantities
+    several measures share (CDF, mean, powers of the weights) are computed on
+    first use and cached on the batch, so they are built once however many
+    measures are evaluated on it.
+
+    Parameters:
+        grid (Union[Grid, np.ndarray]): Shared positions of shape (K,)
+        weights (np.ndarray): Weights matrix of shape (m, K)
+        dtype (type): Storage type of the weights, np.float64 or np.float32
+        trusted (bool): Skip validation; every row must already sum to 1
+    """
+
+    __slots__ = ("grid", "weights", "valid", "_cdf", "_mean", "_powers", "_shared")
+
+    def __init__(self, grid: Union[Grid, np.ndarray], weights: np.ndarray,
+                 dtype: type = np.float64, trusted: bool = False) -> None:
+        if dtype not in (np.float64, np.float32):
+            raise ValueError("dtype must be np.float64 or np.float32")
+
+        grid = grid if isinstance(grid, Grid) else Grid(grid)
+        _, weights, valid = validate_batch(grid.x, weights, trusted=trusted)
+
+        self.grid = grid
+        self.weights = _read_only(np.ascontiguousarray(weights, dtype=dtype))
+        self.valid = _read_only(valid)
+        self._cdf: Optional[np.ndarray] = None
+        self._mean: Optional[np.ndarray] = None
+        self._powers: Dict[float, np.ndarray] = {}
+        self._shared: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.weights.shape[0]
+
+    def __repr__(self) -> str:
+        m, K = self.weights.shape
+        return f"HistogramBatch(m={m}, K={K}, dtype={self.weights.dtype})"
+
+    @property
+    def x(self) -> np.ndarray:
+        """The shared normalized positions."""
+        return self.grid.x
+
+    @property
+    def shape(self) -> tuple:
+        return self.weights.shape
+
+    @property
+    def cdf(self) -> np.ndarray:
+        """Cumulative weights of every row, of shape (m, K)."""
+        if self._cdf is None:
+            self._cdf = _read_only(np.cumsum(self.weights, axis=1, dtype=np.float64))
+        return self._cdf
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Mean position of every row, of shape (m,)."""
+        if self._mean is None:
+            self._mean = _read_only(self.weights @ self.grid.x)
+        return self._mean
+
+    def power(self, exponent: float) -> np.ndarray:
+        """Weights raised to exponent, cached per exponent."""
+        exponent = float(exponent)
+        powered = self._powers.get(exponent)
+        if powered is None:
+            powered = self._powers[exponent] = _read_only(
+                np.power(self.weights, exponent, dtype=np.float64))
+        return powered
+
+    def shared(self, key: Hashable, factory: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Return a measure-specific intermediate (e.g. the Esteban-Ray distance
+        sums), computing it once per batch so measures that need it share it.
+        """
+        value = self._shared.get(key)
+        if value is None:
+            value = self._shared[key] = _read_only(factory())
+        return value
+
+    def select(self, rows: np.ndarray) -> "HistogramBatch":
+        """Return the rows selected by a boolean mask or index array, on the same grid."""
+        batch = HistogramBatch.__new__(HistogramBatch)
+        batch.grid = self.grid
+        batch.weights = _read_only(np.ascontiguousarray(self.weights[rows]))
+        batch.valid = _read_only(self.valid[rows])
+        batch._cdf = None
+        batch._mean = None
+        batch._powers = {}
+        batch._shared = {}
+        return batch
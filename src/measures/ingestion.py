@@ -0,0 +1,232 @@
+from typing import Optional
+import numpy as np
+
+from .validation import Histogram, validate_histogram
+from .histograms import Grid, HistogramBatch
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+class ResponseCounter:
+    """
+    Accumulate (optionally weighted) per-respondent answers into category counts,
+    one chunk at a time, with np.bincount.
+
+    Responses are matched exactly against the sorted category values; NaN and
+    the missing code are skipped, and any other value raises ValueError. With
+    rows, every response also carries the index of the histogram it belongs to
+    (e.g. a question or a region), and the counter holds an (m, K) matrix that
+    grows as larger row indices are seen.
+
+    Parameters:
+        categories (np.ndarray): Sorted category values of the scale, shape (K,)
+        n_rows (Optional[int]): Number of histograms, or None for a single one
+        missing (Optional[float]): Response code to skip, e.g. -99 or 9
+    """
+
+    def __init__(self, categories: np.ndarray, n_rows: Optional[int] = None,
+                 missing: Optional[float] = None) -> None:
+        categories = np.asarray(categories)
+        if categories.ndim != 1 or categories.size < 2:
+            raise ValueError("At least two categories are required")
+        if not np.all(np.diff(categories) > 0):
+            raise ValueError("categories must be strictly increasing")
+
+        self.categories = categories
+        self.missing = missing
+        self.n_rows = n_rows
+        self._counts = np.zeros((n_rows or 1, categories.size), dtype=np.int64)
+
+        # Integer scales with unit steps map codes to columns by subtraction
+        self._offset: Optional[int] = None
+        if categories.dtype.kind in "iu" and categories[-1] - categories[0] == categories.size - 1:
+            self._offset = int(categories[0])
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Counts so far, shape (K,) for a single histogram or (m, K) with rows."""
+        return self._counts[0] if self.n_rows is None else self._counts
+
+    def _columns(self, responses: np.ndarray) -> np.ndarray:
+        """Map responses to category columns, -1 for skipped responses."""
+        keep = np.ones(responses.shape, dtype=bool)
+        if responses.dtype.kind == "f":
+            keep &= ~np.isnan(responses)
+        if self.missing is not None:
+            keep &= responses != self.missing
+
+        K = self.categories.size
+        if self._offset is not None and responses.dtype.kind in "iu":
+            columns = responses.astype(np.intp) - self._offset
+            matched = (columns >= 0) & (columns < K)
+        else:
+            columns = np.searchsorted(self.categories, responses)
+            np.minimum(columns, K - 1, out=columns)
+            matched = self.categories[columns] == responses
+
+        if not np.all(matched | ~keep):
+            bad = responses[keep & ~matched][0]
+            raise ValueError(f"Response {bad} is not one of the categories")
+
+        columns[~keep] = -1
+        return columns
+
+    def add(self, responses: np.ndarray, weights: Optional[np.ndarray] = None,
+            rows: Optional[np.ndarray] = None) -> "ResponseCounter":
+        """
+        Count a chunk of responses.
+
+        Parameters:
+            responses (np.ndarray): Answer codes or values, shape (n,)
+            weights (Optional[np.ndarray]): Non-negative survey weights, shape (n,)
+            rows (Optional[np.ndarray]): Histogram index of every response, shape (n,);
+                required when the counter was built with n_rows
+
+        Returns:
+            ResponseCounter: self, so calls can be chained
+        """
+        responses = np.asarray(responses).ravel()
+        columns = self._columns(responses)
+        keep = columns >= 0
+        K = self.categories.size
+
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64).ravel()
+            if weights.shape != responses.shape:
+                raise ValueError("weights must have one entry per response")
+            if np.any(weights[keep] < 0) or not np.all(np.isfinite(weights[keep])):
+                raise ValueError("Survey weights must be non-negative and finite")
+            weights = weights[keep]
+            if self._counts.dtype != np.float64:
+                self._counts = self._counts.astype(np.float64)
+
+        if self.n_rows is None:
+            if rows is not None:
+                raise ValueError("rows require a counter built with n_rows")
+            index = columns[keep]
+            m = 1
+        else:
+            if rows is None:
+                raise ValueError("rows are required when counting several histograms")
+            rows = np.asarray(rows).ravel()
+            if rows.shape != responses.shape:
+                raise ValueError("rows must have one entry per response")
+            rows = rows[keep].astype(np.intp)
+            if rows.size and rows.min() < 0:
+                raise ValueError("rows must be non-negative")
+            m = max(self._counts.shape[0], int(rows.max()) + 1 if rows.size else 0)
+            index = rows * K + columns[keep]
+
+        chunk = np.bincount(index, weights=weights, minlength=m * K).reshape(m, K)
+        if m > self._counts.shape[0]:
+            grown = np.zeros((m, K), dtype=self._counts.dtype)
+            grown[:self._counts.shape[0]] = self._counts
+            self._counts = grown
+            self.n_rows = m
+        self._counts += chunk
+        return self
+
+    def histogram(self) -> Histogram:
+        """Return the counts so far as a validated Histogram."""
+        if self.n_rows is not None:
+            raise ValueError("Use batch() for a counter with several histograms")
+        return validate_histogram(self.categories, self.counts)
+
+    def batch(self, dtype: type = np.float64) -> HistogramBatch:
+        """Return the counts so far as a HistogramBatch; empty rows are flagged invalid."""
+        return HistogramBatch(Grid(self.categories), np.atleast_2d(self.counts), dtype=dtype)
+
+def _count_chunks(counter: ResponseCounter, responses: np.ndarray,
+                  weights: Optional[np.ndarray], rows: Optional[np.ndarray],
+                  chunk_size: int, n_rows: Optional[int] = None) -> ResponseCounter:
+    """Add responses to counter chunk_size at a time; rows must stay below n_rows when given."""
+    for start in range(0, len(responses), chunk_size):
+        stop = start + chunk_size
+        if n_rows is not None:
+            top = int(np.max(rows[start:stop]))
+            if top >= n_rows:
+                raise ValueError(f"Row index {top} is out of range for n_rows={n_rows}")
+        counter.add(responses[start:stop],
+                    None if weights is None else weights[start:stop],
+                    rows=None if rows is None else rows[start:stop])
+    return counter
+
+def _categories_of(responses: np.ndarray, missing: Optional[float],
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Infer the categories as the distinct non-missing responses, chunk_size at
+    a time, so memory-mapped responses are never loaded or sorted whole.
+    """
+    values = np.unique(responses[:0])
+    for start in range(0, len(responses), chunk_size):
+        chunk = np.unique(responses[start:start + chunk_size])
+        if chunk.dtype.kind == "f":
+            chunk = chunk[~np.isnan(chunk)]
+        if missing is not None:
+            chunk = chunk[chunk != missing]
+        values = np.union1d(values, chunk)
+    return values
+
+def histogram_from_responses(
+    responses: np.ndarray,
+    categories: Optional[np.ndarray] = None,
+    weights: Optional[np.ndarray] = None,
+    missing: Optional[float] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Histogram:
+    """
+    Build a histogram from per-respondent answers.
+
+    Responses are counted chunk_size at a time, so memory-mapped or otherwise
+    very long arrays are never copied whole.
+
+    Parameters:
+        responses (np.ndarray): Answer codes or values, shape (n,)
+        categories (Optional[np.ndarray]): Sorted category values; inferred from
+            the distinct responses when None
+        weights (Optional[np.ndarray]): Survey weights, shape (n,)
+        missing (Optional[float]): Response code to skip
+        chunk_size (int): Responses counted per np.bincount call
+
+    Returns:
+        Histogram: Normalized categories and weighted response shares
+    """
+    if categories is None:
+        categories = _categories_of(responses, missing, chunk_size)
+
+    counter = ResponseCounter(categories, missing=missing)
+    return _count_chunks(counter, responses, weights, None, chunk_size).histogram()
+
+def batch_from_responses(
+    rows: np.ndarray,
+    responses: np.ndarray,
+    categories: Optional[np.ndarray] = None,
+    n_rows: Optional[int] = None,
+    weights: Optional[np.ndarray] = None,
+    missing: Optional[float] = None,
+    dtype: type = np.float64,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> HistogramBatch:
+    """
+    Build a HistogramBatch from per-respondent answers tagged with a row index.
+
+    Parameters:
+        rows (np.ndarray): Histogram index of every response, shape (n,)
+        responses (np.ndarray): Answer codes or values, shape (n,)
+        categories (Optional[np.ndarray]): Sorted category values; inferred from
+            the distinct responses when None
+        n_rows (Optional[int]): Number of histograms; max(rows) + 1 when None.
+            Row indices from n_rows on raise ValueError
+        weights (Optional[np.ndarray]): Survey weights, shape (n,)
+        missing (Optional[float]): Response code to skip
+        dtype (type): Storage type of the batch weights
+        chunk_size (int): Responses counted per np.bincount call
+
+    Returns:
+        HistogramBatch: One histogram per row; rows without answers are invalid
+    """
+    if categories is None:
+        categories = _categories_of(responses, missing, chunk_size)
+
+    counter = ResponseCounter(categories, n_rows=n_rows or 1, missing=missing)
+    return _count_chunks(counter, responses, weights, rows, chunk_size,
+                         n_rows).batch(dtype=dtype)
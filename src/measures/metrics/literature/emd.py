@@ -1,6 +1,10 @@
 import numpy as np
+from typing import Optional, Union
 from scipy.stats import wasserstein_distance
 from ...base import PolarizationMeasure
+from ...histograms import Grid, HistogramBatch
+from ...trackers import PolarizationTracker
+from ...utils import jit, kernels
 
 class EMDPolSciPy(PolarizationMeasure):
     def _create_target_distribution(self, n: int) -> np.ndarray:
@@ -20,8 +24,12 @@ class EMDPol(PolarizationMeasure):
     Compute the Earth Mover's Distance for a given distribution of weights and positions,
     constructing an optimal aimed distribution.
 
+    The aimed distribution puts 0.5 mass at each extreme. In 1-D the EMD is the
+    area between both CDFs, EMD = sum_k |F(x_k) - 0.5| * (x_{k+1} - x_k), so it is
+    computed with a cumulative sum over the actual spacing of x.
+
     Parameters:
-        x (np.ndarray): The positions of the distribution (Is not necessary; added for testing).
+        x (np.ndarray): The positions of the distribution.
         weights (np.ndarray): Weights of the distribution.
 
     Returns:
@@ -29,37 +37,39 @@ class EMDPol(PolarizationMeasure):
     """
     
     def compute(self, x: np.ndarray, weights: np.ndarray) -> float:
-        n = len(weights)
-        
-        left_mass = right_mass = 0.5
-        total_cost = 0
+        cdf = np.cumsum(weights[:-1])
+        return 0.5 - float(np.dot(np.abs(cdf - 0.5), np.diff(x)))
+
+    def _compute_batch(self, x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        if jit.enabled() and x.ndim == 1:
+            return kernels.emd_rows(x, weights)
+        cdf = np.cumsum(weights[:, :-1], axis=1)
+        gaps = np.abs(cdf - 0.5)
+        if x.ndim == 1:
+            return 0.5 - gaps @ np.diff(x)
+        return 0.5 - np.sum(gaps * np.diff(x, axis=1), axis=1)
+
+    def _compute_histogram_batch(self, batch: HistogramBatch) -> np.ndarray:
+        if jit.enabled():
+            return kernels.emd_rows(batch.grid.x, batch.weights)
+        return 0.5 - np.abs(batch.cdf[:, :-1] - 0.5) @ batch.grid.spacing
 
-        # Move from left
-        for i, target_mass in enumerate(weights):
-            if left_mass > 0:
-                mass_to_move = min(left_mass, target_mass)
-                cost = mass_to_move * i / (n - 1)
-                total_cost += cost
-                left_mass -= mass_to_move
-                target_mass -= mass_to_move
+    def tracker(self, x: Union[np.ndarray, Grid],
+                counts: Optional[np.ndarray] = None) -> "EMDPolTracker":
+        return EMDPolTracker(self, x, counts)
 
-            if target_mass > 0 and left_mass == 0:
-                break
+class EMDPolTracker(PolarizationTracker):
+    """Keeps the cumulative counts; updates and values are O(K)."""
 
-        # Move from right
-        for i in range(n-1, -1, -1):
-            target_mass = weights[i]
-            if right_mass > 0:
-                mass_to_move = min(right_mass, target_mass)
-                cost = mass_to_move * (n - 1 - i) / (n - 1)
-                total_cost += cost
-                right_mass -= mass_to_move
-                target_mass -= mass_to_move
+    def _reset(self) -> None:
+        self._cumulative = np.cumsum(self.counts)
 
-            if target_mass > 0 and right_mass == 0:
-                break
+    def _update(self, bin: int, delta: float) -> None:
+        self._cumulative[bin:] += delta
 
-        return 0.5 - total_cost
+    def _compute(self) -> float:
+        cdf = self._cumulative[:-1] / self.total
+        return 0.5 - float(np.abs(cdf - 0.5) @ self.grid.spacing)
 
 
 if __name__ == "__main__":
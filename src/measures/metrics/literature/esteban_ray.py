@@ -1,25 +1,193 @@
 from ...base import ParametricPolarizationMeasure
-from typing import Optional
+from ...validation import minmax_normalize_x, normalize_weights, validate_batch
+from ...histograms import Grid, HistogramBatch
+from ...trackers import PolarizationTracker
+from ...utils.grids import distance_matrix
+from ...utils import jit, kernels
+from typing import Optional, Sequence, Union
 import numpy as np
 
+def _distance_sums(x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Compute sum_j weights_j * |x_i - x_j| for every i along the last axis, in
+    linear time and memory, using prefix sums over sorted (non-decreasing) x.
+    """
+    mass_below = np.cumsum(weights, axis=-1)
+    moment_below = np.cumsum(weights * x, axis=-1)
+    mass_above = mass_below[..., -1:] - mass_below
+    moment_above = moment_below[..., -1:] - moment_below
+    return (x * mass_below - moment_below) + (moment_above - x * mass_above)
+
+def _weighted_distances(x: np.ndarray, weights: np.ndarray, dense_threshold: int) -> np.ndarray:
+    """
+    Compute sum_j weights_j * |x_i - x_j| for every row and point of a validated batch.
+
+    Shared grids use one cached distance matrix and a single matrix product up
+    to dense_threshold points; per-row grids, whose rows are sorted, and larger
+    grids use prefix sums, so no (m, K, K) tensor is ever built.
+    """
+    if x.ndim == 1 and weights.shape[1] <= dense_threshold:
+        return weights @ distance_matrix(x)
+    return _distance_sums(x, weights)
+
 class EstebanRay(ParametricPolarizationMeasure):
+    """
+    Esteban-Ray polarization, K * sum_i sum_j w_i^(1+alpha) w_j |x_i - x_j|.
+
+    Above dense_threshold points the double sum is evaluated with prefix sums
+    in O(n) memory instead of the n x n distance matrix, so the measure also
+    runs on fine-grained scales and per-respondent opinions.
+    """
+
+    dense_threshold: int = 256
+
     def __init__(self, alpha: float = 0.8, K: Optional[float] = None) -> None:
         if not 0 < alpha <= 1.6:
             raise ValueError("alpha must be in (0, 1.6]")
         
         super().__init__(alpha=alpha, K=K)
     
-    def compute(self, x: np.ndarray, weights: np.ndarray) -> float:
-        
+    def _compute_K(self) -> float:
+        """Return K, defaulting to 1 / (2 * 0.5^(2 + alpha)) when it is not set."""
         K = self.parameters['K']
         if K is None:
             K = 1 / (2 * ((0.5) ** (2 + self.parameters['alpha'])))
+        return K
+    
+    def compute(self, x: np.ndarray, weights: np.ndarray) -> float:
+        
+        K = self._constant('K', self._compute_K)
+        
+        if len(x) > self.dense_threshold:
+            if np.any(np.diff(x) < 0):
+                order = np.argsort(x, kind='stable')
+                x, weights = x[order], weights[order]
+            return K * float(np.dot(weights ** (1 + self.parameters['alpha']),
+                                    _distance_sums(x, weights)))
         
         return (K * 
                 np.sum(weights ** (1 + self.parameters['alpha']) * 
                       weights[:, None] * 
                       np.abs(x[:, None] - x)))
 
+    def compute_opinions(self, values: np.ndarray, weights: Optional[np.ndarray] = None,
+                         assume_sorted: bool = False) -> float:
+        """
+        Compute Esteban-Ray directly on per-respondent opinions.
+
+        Respondents with the same opinion form one group, so values may repeat;
+        the distinct values are min-max normalized like histogram positions and
+        the double sum is evaluated with prefix sums in O(n log n) time and O(n)
+        memory.
+
+        Parameters:
+            values (np.ndarray): One opinion per respondent
+            weights (Optional[np.ndarray]): Non-negative survey weights, uniform if None
+            assume_sorted (bool): Skip sorting when values are already non-decreasing
+
+        Returns:
+            float: Polarization value
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        weights = (np.ones_like(values) if weights is None
+                   else np.asarray(weights, dtype=np.float64).ravel())
+        if weights.shape != values.shape:
+            raise ValueError("weights must have one entry per opinion")
+        if values.size == 0 or not np.all(np.isfinite(values)):
+            raise ValueError("values must be finite and non-empty")
+        weights = normalize_weights(weights)
+
+        if not assume_sorted:
+            order = np.argsort(values, kind='stable')
+            values, weights = values[order], weights[order]
+        elif np.any(np.diff(values) < 0):
+            raise ValueError("values must be non-decreasing when assume_sorted")
+
+        starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+        x = minmax_normalize_x(values[starts])
+        weights = np.add.reduceat(weights, starts)
+
+        K = self._constant('K', self._compute_K)
+        return K * float(np.dot(weights ** (1 + self.parameters['alpha']),
+                                _distance_sums(x, weights)))
+
+    def _compute_batch(self, x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        if jit.enabled() and x.ndim == 1:
+            return kernels.esteban_ray_rows(x, weights, float(self.parameters['alpha']),
+                                            self._constant('K', self._compute_K))
+        return self._from_weighted_distances(
+            weights, _weighted_distances(x, weights, self.dense_threshold))
+
+    def _compute_histogram_batch(self, batch: HistogramBatch) -> np.ndarray:
+        if jit.enabled():
+            return self._compute_batch(batch.grid.x, batch.weights)
+        weighted_distances = batch.shared(
+            ('weighted_distances', self.dense_threshold),
+            lambda: _weighted_distances(batch.grid.x, batch.weights, self.dense_threshold))
+        K = self._constant('K', self._compute_K)
+        weights_alpha = batch.power(1 + self.parameters['alpha'])
+        return K * np.einsum('mi,mi->m', weights_alpha, weighted_distances)
+
+    def _from_weighted_distances(self, weights: np.ndarray,
+                                 weighted_distances: np.ndarray) -> np.ndarray:
+        """Finish the batch sum given sum_j w_j |x_i - x_j| for every row and point."""
+        K = self._constant('K', self._compute_K)
+        weights_alpha = weights ** (1 + self.parameters['alpha'])
+        return K * np.einsum('mi,mi->m', weights_alpha, weighted_distances)
+
+    def tracker(self, x: Union[np.ndarray, Grid],
+                counts: Optional[np.ndarray] = None) -> "EstebanRayTracker":
+        return EstebanRayTracker(self, x, counts)
+
+    @classmethod
+    def compute_batch_alphas(cls, x: np.ndarray, weights: np.ndarray,
+                             alphas: Sequence[float], K: Optional[float] = None) -> np.ndarray:
+        """
+        Compute the measure for every row of a weights matrix and several alphas at once.
+        
+        The alpha-independent term sum_j w_j |x_i - x_j| is computed once and shared.
+        
+        Parameters:
+            x (np.ndarray): Shared positions of shape (K,) or per-row positions of shape (m, K)
+            weights (np.ndarray): Weights matrix of shape (m, K)
+            alphas (Sequence[float]): Values of alpha
+            K (Optional[float]): Fixed K, or None for the default of each alpha
+            
+        Returns:
+            np.ndarray: (m, len(alphas)) values, NaN for invalid rows
+        """
+        measures = [cls(alpha=alpha, K=K) for alpha in alphas]
+        x, weights, valid = validate_batch(x, weights)
+        values = np.full((weights.shape[0], len(measures)), np.nan)
+
+        if np.any(valid):
+            rows_x = x if x.ndim == 1 else x[valid]
+            rows = weights[valid]
+            weighted_distances = _weighted_distances(rows_x, rows, cls.dense_threshold)
+            for j, measure in enumerate(measures):
+                values[valid, j] = measure._from_weighted_distances(rows, weighted_distances)
+
+        return values
+
+class EstebanRayTracker(PolarizationTracker):
+    """
+    Keeps sum_j n_j |x_i - x_j| for every bin, updated in O(K) without the
+    distance matrix; values are O(K).
+    """
+
+    def _reset(self) -> None:
+        self._distance_sums = _distance_sums(self.grid.x, self.counts)
+
+    def _update(self, bin: int, delta: float) -> None:
+        self._distance_sums += delta * np.abs(self.grid.x - self.grid.x[bin])
+
+    def _compute(self) -> float:
+        measure = self.measure
+        K = measure._constant('K', measure._compute_K)
+        weights = self.counts / self.total
+        return K * float(weights ** (1 + measure.parameters['alpha']) @
+                         (self._distance_sums / self.total))
+
 if __name__ == "__main__":
     # Crear instancia con valores por defecto
     er = EstebanRay()
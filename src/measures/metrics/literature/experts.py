@@ -1,29 +1,138 @@
 from ...base import PolarizationMeasure
+from ...histograms import Grid
+from ...trackers import PolarizationTracker
+from ...utils import jit, kernels
+from functools import lru_cache
+from typing import Dict, Optional, Union
+from scipy.interpolate import RegularGridInterpolator
 import numpy as np
 
+# Coefficients of the published formula, as a function of how far each member of
+# a pair lies from the centre of the scale (0 = centre, 1 = extreme)
+_DISTANCES_FROM_CENTRE = np.array([0.0, 0.5, 1.0])
+_PAIR_COEFFICIENTS = np.array([
+    [0.0, 0.00, 0.00],
+    [0.0, 2.14, 2.70],
+    [0.0, 2.70, 3.96]
+])
+
+@lru_cache(maxsize=None)
+def interpolate_coefficients(K: int) -> np.ndarray:
+    """
+    Build the coefficient matrix for a K-category scale.
+
+    Each pair of categories on opposite sides of the centre gets the bilinear
+    interpolation of the published coefficients at the pair's distances from the
+    centre; all other pairs get 0. For K = 5 this reproduces the original formula
+    exactly, and on every scale the extreme bimodal distribution scores 1.
+
+    Parameters:
+        K (int): Number of categories
+
+    Returns:
+        np.ndarray: Read-only symmetric (K, K) matrix C such that
+        w^T C w is the numerator of the measure
+    """
+    positions = np.linspace(0, 1, K)
+    interpolator = RegularGridInterpolator((_DISTANCES_FROM_CENTRE, _DISTANCES_FROM_CENTRE),
+                                           _PAIR_COEFFICIENTS)
+
+    left = positions < 0.5
+    right = positions > 0.5
+    i, j = np.meshgrid(np.flatnonzero(left), np.flatnonzero(right), indexing='ij')
+    pairs = np.stack([1 - 2 * positions[i], 2 * positions[j] - 1], axis=-1)
+
+    C = np.zeros((K, K))
+    C[i, j] = C[j, i] = interpolator(pairs.reshape(-1, 2)).reshape(i.shape) / 2
+    C.flags.writeable = False
+    return C
+
 class Experts(PolarizationMeasure):
     """
-    Expert-based polarization measure for 5-category Likert scales.
+    Expert-based polarization measure for Likert scales.
     
     Based on a study where 60 experts rated polarization in 15 Likert-like
     distributions, yielding the formula:
     P(n) = (2.14*n₂n₄ + 2.70(n₁n₄ + n₂n₅) + 3.96*n₁n₅)/(0.0099*n²)
     where nᵢ is the frequency of category i.
+    
+    The numerator is the quadratic form n^T C n with a symmetric coefficient
+    matrix C. Matrices for other scale lengths can be supplied, or interpolated
+    from the published coefficients with interpolate=True.
+    
+    Parameters:
+        coefficients (Optional[Dict[int, np.ndarray]]): Coefficient matrices by number of categories
+        interpolate (bool): Interpolate matrices for scales without one
     """
     
+    def __init__(self, coefficients: Optional[Dict[int, np.ndarray]] = None,
+                 interpolate: bool = False) -> None:
+        super().__init__()
+        self.interpolate = interpolate
+        self._coefficients: Dict[int, np.ndarray] = {5: interpolate_coefficients(5)}
+        for K, C in (coefficients or {}).items():
+            if np.shape(C) != (K, K):
+                raise ValueError(f"Coefficient matrix for {K} categories must have shape "
+                                 f"({K}, {K}), got {np.shape(C)}")
+            self.set_coefficients(C)
+    
+    def set_coefficients(self, C: np.ndarray) -> None:
+        """Use a symmetric (K, K) coefficient matrix for K-category histograms."""
+        C = np.array(C, dtype=np.float64)
+        if C.ndim != 2 or C.shape[0] != C.shape[1] or not np.allclose(C, C.T):
+            raise ValueError("Coefficient matrix must be square and symmetric")
+        C.flags.writeable = False
+        self._coefficients[C.shape[0]] = C
+    
+    def coefficient_matrix(self, K: int) -> np.ndarray:
+        """Return the coefficient matrix for K-category histograms."""
+        C = self._coefficients.get(K)
+        if C is None:
+            if not self.interpolate:
+                raise ValueError(f"Experts measure has no coefficients for {K}-category histograms "
+                                 "(it was designed for 5 categories; supply coefficients or use interpolate=True)")
+            C = self._coefficients[K] = interpolate_coefficients(K)
+        return C
+    
     def compute(self, x: np.ndarray, weights: np.ndarray) -> float:
-        if len(x) != 5:
-            raise ValueError("Experts measure was designed only for 5-category histograms")
-            
-        n2n4_term = 2.14 * weights[1] * weights[3]
-        n1n4_n2n5_term = 2.70 * (weights[0] * weights[3] + weights[1] * weights[4])
-        n1n5_term = 3.96 * weights[0] * weights[4]
+        C = self.coefficient_matrix(len(x))
         
-        numerator = n2n4_term + n1n4_n2n5_term + n1n5_term
+        numerator = weights @ C @ weights
         denominator = 0.0099 * (np.sum(weights) ** 2)
         
+        return float((numerator / denominator) / 100)
+
+    def tracker(self, x: Union[np.ndarray, Grid],
+                counts: Optional[np.ndarray] = None) -> "ExpertsTracker":
+        return ExpertsTracker(self, x, counts)
+
+    def _compute_batch(self, x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        C = self.coefficient_matrix(weights.shape[1])
+        if jit.enabled():
+            return kernels.experts_rows(C, weights)
+
+        numerator = np.einsum('mi,ij,mj->m', weights, C, weights)
+        denominator = 0.0099 * (np.sum(weights, axis=1) ** 2)
+
         return (numerator / denominator) / 100
 
+class ExpertsTracker(PolarizationTracker):
+    """
+    Keeps C n and the quadratic form n^T C n: an update is O(K) and a value O(1).
+    """
+
+    def _reset(self) -> None:
+        self._C = self.measure.coefficient_matrix(len(self.grid))
+        self._Cn = self._C @ self.counts
+        self._quadratic = float(self.counts @ self._Cn)
+
+    def _update(self, bin: int, delta: float) -> None:
+        self._quadratic += delta * (2 * self._Cn[bin] + delta * self._C[bin, bin])
+        self._Cn += delta * self._C[:, bin]
+
+    def _compute(self) -> float:
+        return (self._quadratic / (0.0099 * self.total ** 2)) / 100
+
 if __name__ == "__main__":
     # Crear instancia de la medida
     expert = Experts()
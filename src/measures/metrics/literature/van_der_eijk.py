@@ -1,6 +1,12 @@
 from ...base import PolarizationMeasure
+from ...utils import jit, kernels
+from typing import Dict, Optional
+import os
+import warnings
 import numpy as np
 
+_AGREEMENT_TABLES: Dict[int, np.ndarray] = {}
+
 class VanDerEijkPol(PolarizationMeasure):
     """
     Van Der Eijk's agreement measure adapted as a polarization measure.
@@ -8,78 +14,158 @@ class VanDerEijkPol(PolarizationMeasure):
     The measure decomposes empirical distributions into ideal-type distributions
     and calculates agreement based on patterns of unimodality and multimodality.
     Finally converts agreement to polarization.
-    """
     
-    def _pattern_vector(self, V: np.ndarray) -> np.ndarray:
-        """Create a pattern vector marking positive frequencies as 1."""
-        P = np.zeros_like(V)
-        P[V > 0] = 1
-        return P
+    For scales with at most table_max_K categories, the agreement of every
+    possible pattern is precomputed once per process in a table indexed by the
+    pattern's bitmask (bit k set when category k is non-empty). Setting
+    table_dir persists those tables as .npy files.
+    """
     
-    def _minnz(self, V: np.ndarray) -> float:
-        """Calculate the smallest non-zero value in the vector."""
-        non_zero_values = V[V > 0]
-        if non_zero_values.size == 0:
-            print("Warning: Minimum calculation failed. No non-zero elements found.")
-            return np.inf
-        return np.min(non_zero_values)
+    table_max_K: int = 16
+    table_dir: Optional[str] = None
     
     def _pattern_agreement(self, P: np.ndarray) -> float:
         """Calculate the agreement score from a pattern vector."""
-        K = len(P)
-        TDU = TU = 0
-
-        for i in range(K-2):
-            for j in range(i+1, K-1):
-                for m in range(j+1, K):
-                    if P[i] == 1 and P[j] == 0 and P[m] == 1:
-                        TDU += 1  # 101 pattern, bimodal
-                    if P[i] == 1 and P[j] == 1 and P[m] == 0:
-                        TU += 1   # 110 pattern, unimodal
-                    if P[i] == 0 and P[j] == 1 and P[m] == 1:
-                        TU += 1   # 011 pattern, unimodal
-
-        if TU == TDU == 0:
-            U = 1
-        else:
-            U = ((K-2) * TU - (K-1) * TDU) / ((K-2) * (TU + TDU))
-
-        S = np.sum(P)
+        return float(self._pattern_agreements(np.asarray(P)[None, :])[0])
+    
+    @staticmethod
+    def _pattern_agreements(P: np.ndarray) -> np.ndarray:
+        """
+        Calculate the agreement score for every row of an (m, K) pattern matrix.
+        
+        The triples i < j < m are counted from the number of ones and zeros before
+        and after each middle position j, in O(K) per pattern:
+        TDU counts 101 triples and TU counts 110 and 011 triples.
+        """
+        K = P.shape[1]
+        P = P.astype(float)
+        
+        ones_upto = np.cumsum(P, axis=1)
+        ones_before = ones_upto - P
+        ones_after = ones_upto[:, -1:] - ones_upto
+        zeros_before = np.arange(K) - ones_before
+        zeros_after = (K - 1 - np.arange(K)) - ones_after
+        
+        TDU = np.sum((1 - P) * ones_before * ones_after, axis=1)
+        TU = np.sum(P * (ones_before * zeros_after + zeros_before * ones_after), axis=1)
+        
+        total = TU + TDU
+        U = np.ones_like(total)
+        has_triples = total > 0
+        U[has_triples] = (((K-2) * TU[has_triples] - (K-1) * TDU[has_triples]) /
+                          ((K-2) * total[has_triples]))
+        
+        S = ones_upto[:, -1]
         A = U * (1 - (S - 1) / (K - 1))
+        A[S == 1] = 1
         
-        if np.isnan(A):
-            A = 0
-        if S == 1:
-            A = 1
-
         return A
     
+    @classmethod
+    def agreement_table(cls, K: int) -> np.ndarray:
+        """
+        Return the agreement of every K-category pattern, indexed by its bitmask.
+        
+        Tables are built lazily and shared by the whole process; when table_dir is
+        set they are loaded from, or saved to, van_der_eijk_agreement_<K>.npy there.
+        A stored table that fails _valid_table is rebuilt and overwritten; the files
+        are only a cache, so failing to write one keeps the table in memory.
+        """
+        table = _AGREEMENT_TABLES.get(K)
+        if table is not None:
+            return table
+        
+        path = None
+        if cls.table_dir is not None:
+            path = os.path.join(cls.table_dir, f"van_der_eijk_agreement_{K}.npy")
+        
+        if path is not None and os.path.exists(path):
+            try:
+                table = np.load(path)
+            except (OSError, ValueError):
+                table = None
+            if table is not None and not cls._valid_table(table, K):
+                table = None
+        
+        if table is None:
+            table = cls._pattern_agreements(cls._bits(np.arange(2 ** K), K))
+            if path is not None:
+                try:
+                    os.makedirs(cls.table_dir, exist_ok=True)
+                    np.save(path, table)
+                except OSError:
+                    pass
+        
+        table.flags.writeable = False
+        _AGREEMENT_TABLES[K] = table
+        return table
+    
+    @staticmethod
+    def _bits(masks: np.ndarray, K: int) -> np.ndarray:
+        """Pattern matrix of bitmasks, bit k giving category k."""
+        return (masks[:, None] >> np.arange(K)) & 1
+    
+    @classmethod
+    def _valid_table(cls, table: np.ndarray, K: int) -> bool:
+        """
+        Check a loaded table: 2^K floats in [-1, 1] that match direct computation
+        on an evenly spread sample of at most 257 patterns.
+        """
+        if (not isinstance(table, np.ndarray) or table.shape != (2 ** K,)
+                or not np.issubdtype(table.dtype, np.floating)):
+            return False
+        if not np.all(np.abs(table) <= 1):
+            return False
+        masks = np.unique(np.linspace(0, 2 ** K - 1, 257).astype(np.int64))
+        return bool(np.allclose(table[masks], cls._pattern_agreements(cls._bits(masks, K)),
+                                rtol=0, atol=1e-12))
+    
+    def _layered_agreement(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Decompose every row of an (m, K) frequency matrix into layers and return
+        the weighted sum of their agreements.
+        
+        Repeatedly removing the smallest non-zero frequency from every positive
+        category is equivalent to thresholding at the sorted frequencies: the layer
+        at level v_t has pattern (weights >= v_t) and mass (v_t - v_{t-1}) times its
+        number of categories, so all layers are built at once.
+        """
+        m, K = weights.shape
+        levels = np.sort(weights, axis=1)
+        steps = np.diff(levels, axis=1, prepend=0)
+        
+        patterns = weights[:, None, :] >= levels[:, :, None]
+        patterns &= (levels > 0)[:, :, None]
+        
+        if K <= self.table_max_K:
+            codes = patterns.astype(np.int64) @ (1 << np.arange(K, dtype=np.int64))
+            agreements = self.agreement_table(K)[codes]
+        else:
+            agreements = self._pattern_agreements(patterns.reshape(m * K, K)).reshape(m, K)
+        masses = steps * np.sum(patterns, axis=2)
+        
+        return np.sum(masses * agreements, axis=1) / np.sum(weights, axis=1)
+    
     def compute(self, x: np.ndarray, weights: np.ndarray) -> float:
         if len(weights) < 3:
-            print("Warning: length of vector < 3, measure is not defined.")
+            warnings.warn("Length of vector < 3, measure is not defined.", RuntimeWarning)
             return float('nan')
             
         if np.min(weights) < 0:
             raise ValueError("Error: negative values found in frequency vector.")
 
-        AA = 0
-        N = np.sum(weights)
-        R = np.array(weights, dtype=float)
-
-        for _ in range(len(weights)):
-            P = self._pattern_vector(R)
-            if np.max(P) == 0:
-                break
-                
-            A = self._pattern_agreement(P)
-            m = self._minnz(R)
-            L = P * m
-            w = np.sum(L) / N
-            AA += w * A
-            R -= L
-            
+        AA = self._layered_agreement(np.asarray(weights, dtype=float)[None, :])[0]
         return 1 - (1 + AA) * 0.5
 
+    def _compute_batch(self, x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        if weights.shape[1] < 3:
+            warnings.warn("Length of vector < 3, measure is not defined.", RuntimeWarning)
+            return np.full(weights.shape[0], np.nan)
+
+        if jit.enabled():
+            return kernels.van_der_eijk_rows(weights)
+        return 1 - (1 + self._layered_agreement(weights)) * 0.5
+
 if __name__ == "__main__":
     # Crear instancia de la medida
     veijk = VanDerEijkPol()
@@ -1,17 +1,124 @@
 import numpy as np
+from typing import Optional, Union
 from ...base import PolarizationMeasure
+from ...validation import normalize_weights
+from ...histograms import Grid, HistogramBatch
+from ...trackers import PolarizationTracker
+from ...utils import jit, kernels
 
 class BiPol(PolarizationMeasure):
+    """
+    Splits the population at its mean and computes
+    4 * m_L * m_R * (mean_R - mean_L), where m_L, m_R are the masses below and
+    at-or-above the mean. Written as 4 * (m_L * s_R - m_R * s_L), with s_L, s_R the
+    first moments of each side, it needs no division, so single-point
+    distributions (an empty side) give 0 without branching.
+    """
+
     def compute(self, x: np.ndarray, weights: np.ndarray) -> float:
         mu = np.average(x, weights=weights)
 
-        if np.all(x[weights > 0] == mu):
-            return 0
-
         L = x < mu
         R = ~L
 
-        mean_diff = (np.average(x[R], weights=weights[R]) - 
-                     np.average(x[L], weights=weights[L]))
+        mass_L, mass_R = weights[L].sum(), weights[R].sum()
+        moment_L, moment_R = np.dot(weights[L], x[L]), np.dot(weights[R], x[R])
+
+        return float(4 * (mass_L * moment_R - mass_R * moment_L))
+
+    def _compute_batch(self, x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        if jit.enabled() and x.ndim == 1:
+            return kernels.bipol_rows(x, weights)
+        moments = weights * x
+        return self._split_at_mean(x, weights, moments, np.sum(moments, axis=1))
+
+    def _compute_histogram_batch(self, batch: HistogramBatch) -> np.ndarray:
+        if jit.enabled():
+            return kernels.bipol_rows(batch.grid.x, batch.weights)
+        return self._split_at_mean(batch.grid.x, batch.weights,
+                                   batch.weights * batch.grid.x, batch.mean)
+
+    @staticmethod
+    def _split_at_mean(x: np.ndarray, weights: np.ndarray, moments: np.ndarray,
+                       mu: np.ndarray) -> np.ndarray:
+        """Evaluate the masses and moments on each side of the row means mu."""
+        L = x < mu[:, None]
+
+        mass_L = np.sum(weights * L, axis=1)
+        moment_L = np.sum(moments * L, axis=1)
+        mass_R = np.sum(weights, axis=1) - mass_L
+        moment_R = mu - moment_L
+
+        return 4 * (mass_L * moment_R - mass_R * moment_L)
+
+    def tracker(self, x: Union[np.ndarray, Grid],
+                counts: Optional[np.ndarray] = None) -> "BiPolTracker":
+        return BiPolTracker(self, x, counts)
+
+    def compute_opinions(self, values: np.ndarray, weights: Optional[np.ndarray] = None,
+                         assume_sorted: bool = False) -> float:
+        """
+        Compute BiPol directly on per-respondent opinions.
+
+        Values may repeat and are min-max normalized like histogram positions.
+        After sorting, the split at the mean is a prefix, so the masses and moments
+        of both sides come from prefix sums and a binary search.
+
+        Parameters:
+            values (np.ndarray): One opinion per respondent
+            weights (Optional[np.ndarray]): Non-negative survey weights, uniform if None
+            assume_sorted (bool): Skip sorting when values are already non-decreasing
+
+        Returns:
+            float: Polarization value
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        weights = (np.ones_like(values) if weights is None
+                   else np.asarray(weights, dtype=np.float64).ravel())
+        if weights.shape != values.shape:
+            raise ValueError("weights must have one entry per opinion")
+        if values.size == 0 or not np.all(np.isfinite(values)):
+            raise ValueError("values must be finite and non-empty")
+        weights = normalize_weights(weights)
+
+        if not assume_sorted:
+            order = np.argsort(values, kind='stable')
+            values, weights = values[order], weights[order]
+        elif np.any(np.diff(values) < 0):
+            raise ValueError("values must be non-decreasing when assume_sorted")
+
+        spread = values[-1] - values[0]
+        if spread == 0:
+            return 0.0
+        x = (values - values[0]) / spread
+
+        cumulative_mass = np.cumsum(weights)
+        cumulative_moment = np.cumsum(weights * x)
+        mu = cumulative_moment[-1]
+
+        k = int(np.searchsorted(x, mu, side='left'))
+        mass_L = cumulative_mass[k - 1] if k > 0 else 0.0
+        moment_L = cumulative_moment[k - 1] if k > 0 else 0.0
+
+        return float(4 * (mass_L * (mu - moment_L) - (1 - mass_L) * moment_L))
+
+class BiPolTracker(PolarizationTracker):
+    """
+    Keeps the cumulative masses and moments, so an update is O(K) and the split
+    at the mean is found with a binary search.
+    """
+
+    def _reset(self) -> None:
+        self._mass = np.cumsum(self.counts)
+        self._moment = np.cumsum(self.counts * self.grid.x)
+
+    def _update(self, bin: int, delta: float) -> None:
+        self._mass[bin:] += delta
+        self._moment[bin:] += delta * self.grid.x[bin]
 
-        return 4 * weights[L].sum() * weights[R].sum() * mean_diff
+    def _compute(self) -> float:
+        mu = self._moment[-1] / self.total
+        k = int(np.searchsorted(self.grid.x, mu, side='left'))
+        mass_L = self._mass[k - 1] / self.total if k > 0 else 0.0
+        moment_L = self._moment[k - 1] / self.total if k > 0 else 0.0
+        return float(4 * (mass_L * (mu - moment_L) - (1 - mass_L) * moment_L))
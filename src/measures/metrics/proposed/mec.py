@@ -1,10 +1,11 @@
 import numpy as np
-from scipy.optimize import minimize_scalar
-from typing import cast
-from scipy.optimize._optimize import OptimizeResult
+from typing import Optional, Tuple, Union
 
 from ...base import ParametricPolarizationMeasure
-from ...validation import validate_parameters
+from ...histograms import Grid, HistogramBatch
+from ...trackers import PolarizationTracker
+from ...validation import validate_histogram, validate_batch, validate_parameters, Histogram
+from ...utils.optimization import minimize_effort, minimize_effort_batch
 
 class MEC(ParametricPolarizationMeasure):
     """
@@ -12,14 +13,20 @@ class MEC(ParametricPolarizationMeasure):
     a single point of consensus p.
     """
     
-    def __init__(self, alpha: float = 2, beta: float = 1.15) -> None:
+    def __init__(self, alpha: float = 2, beta: float = 1.15, tol: float = 1e-12) -> None:
         super().__init__(alpha=alpha, beta=beta)
-        self._alpha = alpha
-        self._beta = beta
+        self.tol = tol
+    
+    def _solve(self, x: np.ndarray, weights: np.ndarray,
+               start: Optional[float] = None) -> Tuple[float, float]:
+        """Return the minimum effort and the consensus point attaining it."""
+        validate_parameters(**self.parameters)
+        return minimize_effort(x, weights ** self.parameters['alpha'],
+                               self.parameters['beta'], tol=self.tol, start=start)
     
     def compute(self, x: np.ndarray, weights: np.ndarray) -> float:
         """
-        Compute polarization using scipy's optimization.
+        Compute polarization with the exact consensus solver.
         
         Parameters:
             x (np.ndarray): The positions of the distribution
@@ -28,33 +35,89 @@ class MEC(ParametricPolarizationMeasure):
         Returns:
             float: Polarization value
         """
-        validate_parameters(**self.parameters)
-        
-        weights_alpha = weights ** self._alpha
-        
-        def obj_func(y: float) -> float:
-            return float(np.sum(weights_alpha * (np.abs(x - y) ** self._beta)))
+        return self._solve(x, weights)[0]
+    
+    def consensus(self, x: Union[np.ndarray, Histogram],
+                  weights: Optional[np.ndarray] = None) -> Tuple[float, float]:
+        """
+        Compute polarization together with its consensus point.
         
-        result = cast(OptimizeResult, minimize_scalar(
-            obj_func,
-            bounds=(0, 1),
-            method='bounded'
-        ))
+        Parameters:
+            x (np.ndarray): The positions of the distribution, or a validated Histogram
+            weights (np.ndarray): The weights of the distribution
+            
+        Returns:
+            Tuple[float, float]: Polarization value and consensus point, in the units of x
+        """
+        x_norm, weights = validate_histogram(x, weights)
+        self._cached_result, point = self._solve(x_norm, weights)
+        if isinstance(x, Histogram):
+            return self._cached_result, point
+        x = np.asarray(x, dtype=np.float64)
+        return self._cached_result, float(x[0] + point * (x[-1] - x[0]))
+
+    def _solve_batch(self, x: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the polarization values and consensus points of validated rows."""
+        validate_parameters(**self.parameters)
+        efforts, points = minimize_effort_batch(x, weights ** self.parameters['alpha'],
+                                                self.parameters['beta'], tol=self.tol)
+        return self._normalize_efforts(efforts), points
+
+    def _normalize_efforts(self, efforts: np.ndarray) -> np.ndarray:
+        """Map minimum efforts of validated rows to polarization values."""
+        return efforts
+
+    def _compute_batch(self, x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        return self._solve_batch(x, weights)[0]
+
+    def _compute_histogram_batch(self, batch: HistogramBatch) -> np.ndarray:
+        validate_parameters(**self.parameters)
+        alpha, beta = self.parameters['alpha'], self.parameters['beta']
+        # Shared by every MEC variant with the same parameters evaluated on the batch
+        efforts = batch.shared(
+            ('mec_efforts', alpha, beta, self.tol),
+            lambda: minimize_effort_batch(batch.grid.x, batch.power(alpha), beta, tol=self.tol)[0])
+        return self._normalize_efforts(efforts)
+
+    def tracker(self, x: Union[np.ndarray, Grid],
+                counts: Optional[np.ndarray] = None) -> "MECTracker":
+        return MECTracker(self, x, counts)
+
+    def consensus_batch(self, x: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute polarization and consensus points for every row of a weights matrix.
         
-        return float(result.fun)
+        Parameters:
+            x (np.ndarray): Shared positions of shape (K,) or per-row positions of shape (m, K)
+            weights (np.ndarray): Weights matrix of shape (m, K)
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (m,) values and consensus points in the units
+            of x, NaN for invalid rows
+        """
+        x = np.asarray(x, dtype=np.float64)
+        x_norm, weights, valid = validate_batch(x, weights)
+        values = np.full(weights.shape[0], np.nan)
+        points = np.full(weights.shape[0], np.nan)
+
+        if np.any(valid):
+            rows_x = x_norm if x.ndim == 1 else x_norm[valid]
+            values[valid], points[valid] = self._solve_batch(rows_x, weights[valid])
 
-class MECNormalized(ParametricPolarizationMeasure):
+        x_min, x_max = x[..., 0], x[..., -1]
+        if x.ndim == 2:
+            x_min, x_max = x_min[valid], x_max[valid]
+        points[valid] = x_min + points[valid] * (x_max - x_min)
+
+        return values, points
+
+class MECNormalized(MEC):
     """
     Normalized version of MEC measure. The normalization divides by the maximum
     possible value (which occurs when the population is divided between the extremes).
     """
     
-    def __init__(self, alpha: float = 2, beta: float = 1.15) -> None:
-        super().__init__(alpha=alpha, beta=beta)
-        self._alpha = alpha
-        self._beta = beta
-    
-    def _get_max_distribution(self, x: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    def _get_max_distribution(self, x: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         Create extreme bimodal distribution.
         """
@@ -62,38 +125,46 @@ class MECNormalized(ParametricPolarizationMeasure):
         w_extremes = np.array([0.5, 0.5])
         return x_extremes, w_extremes
 
-    def compute(self, x: np.ndarray, weights: np.ndarray) -> float:
-        """
-        Compute normalized polarization using scipy's optimization.
+    def _max_effort_root(self) -> float:
         """
-        validate_parameters(**self.parameters)
-        
-        weights_alpha = weights ** self._alpha
+        (beta)-th root of the minimum effort of the extreme distribution on [0, 1].
         
-        def obj_func(y: float) -> float:
-            return float(np.sum(weights_alpha * (np.abs(x - y) ** self._beta)))
-        
-        result = cast(OptimizeResult, minimize_scalar(
-            obj_func,
-            bounds=(0, 1),
-            method='bounded'
-        ))
-        min_f_val = float(result.fun)
-        
-        x_max, w_max = self._get_max_distribution(x, weights)
-        max_weights_alpha = w_max ** self._alpha
-        
-        def obj_func_max(y: float) -> float:
-            return float(np.sum(max_weights_alpha * (np.abs(x_max - y) ** self._beta)))
+        With 0.5 mass at each end the effort is 0.5^alpha * (y^beta + (1 - y)^beta),
+        minimized at y = 0.5 when beta > 1 and at either end when beta <= 1.
+        """
+        alpha, beta = self.parameters['alpha'], self.parameters['beta']
+        min_fmax_val = 0.5 ** alpha * min(1.0, 2 * 0.5 ** beta)
+        return min_fmax_val ** (1/beta)
+
+    def _solve(self, x: np.ndarray, weights: np.ndarray,
+               start: Optional[float] = None) -> Tuple[float, float]:
+        """Return the normalized minimum effort and the consensus point attaining it."""
+        min_f_val, point = super()._solve(x, weights, start)
         
-        result_max = cast(OptimizeResult, minimize_scalar(
-            obj_func_max,
-            bounds=(0, 1),
-            method='bounded'
-        ))
-        min_fmax_val = float(result_max.fun)
+        # The extreme distribution on [x[0], x[-1]] scales the unit one by the range
+        max_root = self._constant('max_effort_root', self._max_effort_root) * (x[-1] - x[0])
         
-        return (min_f_val ** (1/self._beta)) / (min_fmax_val ** (1/self._beta))
+        return (min_f_val ** (1/self.parameters['beta'])) / max_root, point
+
+    def _normalize_efforts(self, efforts: np.ndarray) -> np.ndarray:
+        # After validation every grid spans [0, 1]
+        max_root = self._constant('max_effort_root', self._max_effort_root)
+        return (efforts ** (1/self.parameters['beta'])) / max_root
+
+class MECTracker(PolarizationTracker):
+    """
+    Re-solves on every value, warm-started from the previous consensus point:
+    after a small update the new minimum usually lies between the same two
+    support points, so the bracket search is skipped.
+    """
+
+    def _reset(self) -> None:
+        self.point: Optional[float] = None
+
+    def _compute(self) -> float:
+        value, self.point = self.measure._solve(self.grid.x, self.counts / self.total,
+                                                start=self.point)
+        return value
 
 if __name__ == "__main__":
    # # Crear instancias con diferentes parámetros
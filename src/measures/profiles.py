@@ -0,0 +1,95 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .base import PolarizationMeasure
+from .suite import MeasureSuite, SuiteResult
+from .ingestion import DEFAULT_CHUNK_SIZE, ResponseCounter
+
+def _item_scales(scales: Union[int, Sequence[Union[int, np.ndarray]]],
+                 n_items: int) -> List[np.ndarray]:
+    """Expand the scale spec into the categories of every item."""
+    if isinstance(scales, (int, np.integer)):
+        scales = [scales] * n_items
+    if len(scales) != n_items:
+        raise ValueError("scales must be one scale length or one scale per item")
+    return [np.arange(1, scale + 1) if isinstance(scale, (int, np.integer))
+            else np.asarray(scale) for scale in scales]
+
+def _item_missing(missing: Optional[Union[float, Sequence[Optional[float]]]],
+                  n_items: int) -> List[Optional[float]]:
+    """Expand the missing-code spec into the code of every item."""
+    if missing is None or np.isscalar(missing):
+        return [missing] * n_items
+    if len(missing) != n_items:
+        raise ValueError("missing must be one code or one code per item")
+    return list(missing)
+
+def item_profiles(
+    answers: np.ndarray,
+    measures: Union[MeasureSuite, Dict[str, PolarizationMeasure], Sequence[PolarizationMeasure]],
+    scales: Union[int, Sequence[Union[int, np.ndarray]]],
+    missing: Optional[Union[float, Sequence[Optional[float]]]] = None,
+    weights: Optional[np.ndarray] = None,
+    dtype: type = np.float64,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> SuiteResult:
+    """
+    Compute every measure for every item of a (respondents, items) answer matrix,
+    e.g. a whole survey wave.
+
+    Items that share a scale and a missing code are counted together: the answer
+    block is raveled and counted into an (items, K) matrix with one weighted
+    np.bincount per chunk of respondents, and the measures are evaluated on it
+    as one MeasureSuite batch.
+
+    Parameters:
+        answers (np.ndarray): Answer codes, shape (n_respondents, n_items);
+            NaN answers are skipped
+        measures: A MeasureSuite, a {name: measure} mapping or a sequence of measures
+        scales: The scale length K of every item (categories 1..K), either one
+            length for all items or one entry per item, where an entry is a
+            length or an array of category values
+        missing: Answer code to skip, either one code or one per item (None for none)
+        weights (Optional[np.ndarray]): Survey weights of the respondents, shape (n_respondents,)
+        dtype (type): Storage type of the batch weights
+        chunk_size (int): Answers counted per np.bincount call
+
+    Returns:
+        SuiteResult: (n_items, n_measures) values and the item validity mask;
+        items without answers are invalid and NaN
+    """
+    answers = np.asarray(answers)
+    if answers.ndim != 2:
+        raise ValueError("answers must be a (respondents, items) matrix")
+    n, p = answers.shape
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape != (n,):
+            raise ValueError("weights must have one entry per respondent")
+
+    suite = measures if isinstance(measures, MeasureSuite) else MeasureSuite(measures)
+    categories = _item_scales(scales, p)
+    codes = _item_missing(missing, p)
+
+    # Items with the same scale and missing code share one count matrix
+    blocks: Dict[Tuple, List[int]] = {}
+    for item, (scale, code) in enumerate(zip(categories, codes)):
+        blocks.setdefault((tuple(scale.tolist()), code), []).append(item)
+
+    values = np.full((p, len(suite)), np.nan)
+    valid = np.zeros(p, dtype=bool)
+    for (_, code), items in blocks.items():
+        q = len(items)
+        counter = ResponseCounter(categories[items[0]], n_rows=q, missing=code)
+        rows = max(1, chunk_size // q)
+        for start in range(0, n, rows):
+            block = answers[start:start + rows, items]
+            counter.add(block.ravel(),
+                        None if weights is None else np.repeat(weights[start:start + rows], q),
+                        rows=np.tile(np.arange(q), block.shape[0]))
+
+        result = suite.compute_batch(counter.batch(dtype=dtype))
+        values[items] = result.values
+        valid[items] = result.valid
+
+    return SuiteResult(suite.names, values, valid)
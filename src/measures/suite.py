@@ -0,0 +1,130 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .base import PolarizationMeasure
+from .histograms import Grid, HistogramBatch
+from .executors import BatchExecutor, get_executor
+
+class SuiteResult(NamedTuple):
+    """
+    Columnar result of a MeasureSuite: one column of values per measure.
+
+    Attributes:
+        names (List[str]): Measure names, in column order
+        values (np.ndarray): (m, n_measures) values, NaN for invalid rows
+        valid (np.ndarray): Boolean (m,) validity mask
+    """
+    names: List[str]
+    values: np.ndarray
+    valid: np.ndarray
+
+    def __getitem__(self, key):
+        """Return the column of a measure by name, or a tuple field by position."""
+        if isinstance(key, str):
+            return self.values[:, self.names.index(key)]
+        return tuple.__getitem__(self, key)
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        """Return the columns as a {name: (m,) values} dict."""
+        return {name: self.values[:, j] for j, name in enumerate(self.names)}
+
+class MeasureSuite:
+    """
+    Evaluate several configured measures on the same histograms in one pass.
+
+    The histograms are validated and normalized once into a HistogramBatch, and
+    every measure reads the quantities it needs from the batch caches, so shared
+    subexpressions are computed once for the whole suite: the row means (BiPol,
+    Shannon), the CDF (EMD), powers of the weights (Esteban-Ray and MEC with
+    matching exponents, MECs sharing alpha) and the Esteban-Ray distance sums
+    (every alpha).
+
+    Parameters:
+        measures: A {name: measure} mapping, or a sequence of measures named by
+            their measure_id
+    """
+
+    def __init__(self, measures: Union[Dict[str, PolarizationMeasure],
+                                       Sequence[PolarizationMeasure]]) -> None:
+        if isinstance(measures, dict):
+            items = list(measures.items())
+        else:
+            items = [(measure.measure_id, measure) for measure in measures]
+
+        names = [name for name, _ in items]
+        if len(set(names)) != len(names):
+            raise ValueError("Measure names must be unique; pass a {name: measure} dict")
+
+        self.names: List[str] = names
+        self.measures: List[PolarizationMeasure] = [measure for _, measure in items]
+
+    def __len__(self) -> int:
+        return len(self.measures)
+
+    def compute_batch(
+        self,
+        x: Union[np.ndarray, Grid, HistogramBatch],
+        weights: Optional[np.ndarray] = None,
+        trusted: bool = False,
+        executor: Union[str, BatchExecutor, None] = None
+    ) -> SuiteResult:
+        """
+        Compute every measure for every row of a weights matrix.
+
+        Args:
+            x: Shared positions of shape (K,), a Grid, per-row positions of
+                shape (m, K), or a HistogramBatch (then weights is omitted)
+            weights: Weights matrix of shape (m, K)
+            trusted: Skip validation, as in PolarizationMeasure.compute_batch
+            executor: Evaluate row chunks in parallel, as in
+                PolarizationMeasure.compute_batch; every chunk is one suite pass
+
+        Returns:
+            SuiteResult: (m, n_measures) values and the row validity mask
+        """
+        executor = get_executor(executor)
+        if executor is not None:
+            values, valid = executor.evaluate(self, x, weights, trusted)
+            return SuiteResult(self.names, values, valid)
+
+        if isinstance(x, np.ndarray) and x.ndim == 2:
+            # Per-row grids cannot share a batch; evaluate measure by measure
+            columns = []
+            for measure in self.measures:
+                column, valid = measure.compute_batch(x, weights, return_mask=True,
+                                                      trusted=trusted)
+                columns.append(column)
+            return SuiteResult(self.names, np.column_stack(columns), valid)
+
+        batch = x if isinstance(x, HistogramBatch) else HistogramBatch(x, weights, trusted=trusted)
+        values = np.full((len(batch), len(self.measures)), np.nan)
+
+        if np.any(batch.valid):
+            rows = batch if np.all(batch.valid) else batch.select(batch.valid)
+            for j, measure in enumerate(self.measures):
+                values[batch.valid, j] = measure._compute_histogram_batch(rows)
+
+        return SuiteResult(self.names, values, batch.valid.copy())
+
+    def _evaluate_rows(self, x: Union[np.ndarray, Grid, HistogramBatch],
+                       weights: Optional[np.ndarray],
+                       trusted: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Values and validity mask of a chunk of rows; the task of a BatchExecutor."""
+        result = self.compute_batch(x, weights, trusted=trusted)
+        return result.values, result.valid
+
+    def __call__(self, x: Union[np.ndarray, Grid], weights: np.ndarray,
+                 trusted: bool = False) -> Dict[str, float]:
+        """
+        Compute every measure for a single histogram.
+
+        Returns:
+            Dict[str, float]: {name: value}
+
+        Raises:
+            ValueError: If the histogram is invalid
+        """
+        result = self.compute_batch(x, np.asarray(weights)[None, :], trusted=trusted)
+        if not result.valid[0]:
+            raise ValueError("Invalid histogram: weights must be non-negative with a positive, finite total")
+        return {name: float(value) for name, value in zip(self.names, result.values[0])}
@@ -3,6 +3,8 @@ Threshold data for polarization measure classification.
 These thresholds determine the boundaries for classifying polarization values.
 https://ulvenforst.vercel.app/articles/bridging-theory-and-expert-judgment-advances-in-polarization-metrics-and-their-empirical-correlations
 """
+from typing import Dict, List, Tuple
+import numpy as np
 
 THRESHOLDS = {
     "EstebanRay": {
@@ -61,3 +63,16 @@ CATEGORY_LABELS = {
     4: ["very_low", "low", "high", "very_high"],
     5: ["very_low", "low", "medium", "high", "very_high"]
 }
+
+# Threshold lists compiled to read-only arrays on first use, keyed by
+# (measure_id, param_set, method, num_categories)
+_COMPILED_THRESHOLDS: Dict[Tuple[str, str, str, int], np.ndarray] = {}
+
+def category_labels(num_categories: int) -> List[str]:
+    """Return the labels of a num_categories classification, in category order."""
+    return CATEGORY_LABELS.get(num_categories,
+                               [f"category_{i+1}" for i in range(num_categories)])
+
+def clear_compiled_thresholds() -> None:
+    """Drop the compiled arrays, e.g. after editing THRESHOLDS at runtime."""
+    _COMPILED_THRESHOLDS.clear()
@@ -0,0 +1,345 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+
+from .base import PolarizationMeasure
+from .histograms import Grid
+from .suite import MeasureSuite
+
+# Steps between rebuilds of the trackers' running sums, bounding rounding drift
+_REFRESH_EVERY = 1024
+# Halvings after which decayed counts are rescaled, well before they overflow
+_REBASE_HALVINGS = 64.0
+
+class SeriesResult(NamedTuple):
+    """
+    Values emitted by a PolarizationSeries: one row per emission time, one
+    column per measure.
+
+    Attributes:
+        names (List[str]): Measure names, in column order
+        times (np.ndarray): Emission times, shape (n,)
+        values (np.ndarray): (n, n_measures) values, NaN while the window is empty
+    """
+    names: List[str]
+    times: np.ndarray
+    values: np.ndarray
+
+    def __getitem__(self, key):
+        """Return the series of a measure by name, or a tuple field by position."""
+        if isinstance(key, str):
+            return self.values[:, self.names.index(key)]
+        return tuple.__getitem__(self, key)
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        """Return the series as a {name: (n,) values} dict."""
+        return {name: self.values[:, j] for j, name in enumerate(self.names)}
+
+class _ResponseBuffer:
+    """
+    Buffered responses in time order, appended at the back and dropped from the
+    front in amortized O(1) per response: the live responses sit in a slice of
+    preallocated arrays that are compacted, and doubled when full, only once the
+    free space at the back runs out.
+    """
+
+    def __init__(self) -> None:
+        self._times: Optional[np.ndarray] = None
+        self._bins = np.empty(0, dtype=np.intp)
+        self._weights = np.empty(0)
+        self._head = 0
+        self._tail = 0
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[self._head:self._tail]
+
+    @property
+    def bins(self) -> np.ndarray:
+        return self._bins[self._head:self._tail]
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self._weights[self._head:self._tail]
+
+    def append(self, times: np.ndarray, bins: np.ndarray, weights: np.ndarray) -> None:
+        n, live = times.size, len(self)
+        if self._times is None or self._times.dtype != np.result_type(self._times, times):
+            dtype = times.dtype if self._times is None else np.result_type(self._times, times)
+            self._times = (np.empty(0, dtype) if self._times is None
+                           else self._times.astype(dtype))
+        if self._tail + n > self._bins.size:
+            capacity = max(self._bins.size, 2 * (live + n), 64)
+            arrays = [self._times, self._bins, self._weights]
+            if capacity > self._bins.size:
+                fresh = [np.empty(capacity, array.dtype) for array in arrays]
+            else:
+                fresh = arrays
+            for old, new in zip(arrays, fresh):
+                new[:live] = old[self._head:self._tail]
+            self._times, self._bins, self._weights = fresh
+            self._head, self._tail = 0, live
+
+        end = self._tail + n
+        self._times[self._tail:end] = times
+        self._bins[self._tail:end] = bins
+        self._weights[self._tail:end] = weights
+        self._tail = end
+
+    def drop(self, n: int) -> None:
+        """Forget the n oldest responses."""
+        self._head += n
+
+class PolarizationSeries(ABC):
+    """
+    Base class of the time-series engines: ingest timestamped responses in time
+    order and emit the value of one or more measures every stride.
+
+    Values are emitted at start + stride, start + 2 * stride, ...; the value at
+    time t covers the responses strictly before t, and is emitted once a response
+    at or after t arrives or flush reaches t. The responses of every step are
+    aggregated per bin with np.bincount and applied to one PolarizationTracker
+    per measure, so a step costs O(K + responses in the step) per measure
+    however much history the window holds.
+
+    Times are numbers or np.datetime64, with stride (and the window length)
+    numbers or np.timedelta64 respectively.
+
+    Parameters:
+        measures: A MeasureSuite, a {name: measure} mapping or a sequence of measures
+        x (Union[np.ndarray, Grid]): Positions of the bins, shape (K,)
+        stride: Time between emissions
+        start: One stride before the first emission; the time of the first
+            response when None
+    """
+
+    def __init__(
+        self,
+        measures: Union[MeasureSuite, Dict[str, PolarizationMeasure], Sequence[PolarizationMeasure]],
+        x: Union[np.ndarray, Grid],
+        stride: Any,
+        start: Optional[Any] = None
+    ) -> None:
+        if not stride > 0:
+            raise ValueError("stride must be positive")
+
+        suite = measures if isinstance(measures, MeasureSuite) else MeasureSuite(measures)
+        self.names: List[str] = suite.names
+        self.grid = x if isinstance(x, Grid) else Grid(x)
+        self.trackers = [measure.tracker(self.grid) for measure in suite.measures]
+        self.stride = stride
+
+        self._next = None if start is None else start + stride
+        self._last = None
+        self._steps = 0
+
+        # Responses not yet counted, or still needed to expire them
+        self._buffer = _ResponseBuffer()
+        self._applied = 0
+
+    def update(self, times: np.ndarray, bins: np.ndarray,
+               weights: Optional[np.ndarray] = None) -> SeriesResult:
+        """
+        Ingest a chunk of responses and emit every value that became due.
+
+        Parameters:
+            times (np.ndarray): Response times, non-decreasing and not before any
+                time already seen, shape (n,)
+            bins (np.ndarray): Bin index of every response, shape (n,)
+            weights (Optional[np.ndarray]): Non-negative response weights, shape (n,)
+
+        Returns:
+            SeriesResult: The values emitted while ingesting the chunk
+        """
+        times = np.asarray(times).ravel()
+        bins = np.asarray(bins).ravel()
+        if bins.shape != times.shape:
+            raise ValueError("bins must have one entry per response")
+        if bins.size and (bins.dtype.kind not in "iu" or bins.min() < 0
+                          or bins.max() >= len(self.grid)):
+            raise ValueError("bins must be integer indices into the grid")
+
+        if weights is None:
+            weights = np.ones(times.size)
+        else:
+            weights = np.asarray(weights, dtype=np.float64).ravel()
+            if weights.shape != times.shape:
+                raise ValueError("weights must have one entry per response")
+            if np.any(weights < 0) or not np.all(np.isfinite(weights)):
+                raise ValueError("weights must be non-negative and finite")
+
+        if times.size == 0:
+            return self._result([])
+        if np.any(times[1:] < times[:-1]) or (self._last is not None and times[0] < self._last):
+            raise ValueError("Responses must arrive in time order")
+
+        if self._next is None:
+            self._next = times[0] + self.stride
+        self._buffer.append(times, bins, weights)
+        self._last = times[-1]
+        return self._emit(times[-1])
+
+    def flush(self, until: Any) -> SeriesResult:
+        """
+        Emit every value due up to and including time until, e.g. at the end of
+        a stream or through a period without responses.
+
+        Returns:
+            SeriesResult: The values emitted
+        """
+        if self._last is not None and until < self._last:
+            raise ValueError("Cannot flush before a time already seen")
+        if self._next is None:
+            raise ValueError("Nothing to flush before the first response; pass start")
+        self._last = until
+        return self._emit(until)
+
+    def _emit(self, until: Any) -> SeriesResult:
+        times, values = [], []
+        while self._next <= until:
+            time = self._next
+            stop = int(np.searchsorted(self._buffer.times, time, side="left")) if len(self._buffer) else 0
+            self._step(time, stop)
+            self._applied = stop
+
+            self._steps += 1
+            if self._steps % _REFRESH_EVERY == 0:
+                for tracker in self.trackers:
+                    tracker.refresh()
+
+            times.append(time)
+            values.append([tracker.value for tracker in self.trackers])
+            self._next = time + self.stride
+
+        self._trim()
+        return self._result(times, values)
+
+    def _result(self, times: list, values: Optional[list] = None) -> SeriesResult:
+        dtype = np.result_type(self._next) if self._next is not None else None
+        values = np.array(values or [], dtype=np.float64).reshape(len(times), len(self.names))
+        return SeriesResult(self.names, np.array(times, dtype=dtype), values)
+
+    def _bincount(self, start: int, stop: int, scale: Optional[np.ndarray] = None) -> np.ndarray:
+        """Weights of the buffered responses start:stop summed per bin."""
+        weights = self._buffer.weights[start:stop]
+        if scale is not None:
+            weights = weights * scale
+        return np.bincount(self._buffer.bins[start:stop], weights=weights,
+                           minlength=len(self.grid))
+
+    def _trim(self) -> None:
+        """Drop the responses no longer needed."""
+        keep = self._first_needed()
+        if keep:
+            self._buffer.drop(keep)
+            self._shift(keep)
+
+    def _first_needed(self) -> int:
+        return self._applied
+
+    def _shift(self, n: int) -> None:
+        self._applied -= n
+
+    @abstractmethod
+    def _step(self, time: Any, stop: int) -> None:
+        """Bring the trackers to emission time, given the responses before it end at stop."""
+
+class SlidingWindowSeries(PolarizationSeries):
+    """
+    Polarization over a sliding window: the value at time t covers the responses
+    in [t - window, t). Responses are added when they arrive and removed when
+    they expire; a bin whose responses have all expired is reset to exactly zero,
+    so removals never leave rounding residue behind.
+
+    Parameters:
+        measures: A MeasureSuite, a {name: measure} mapping or a sequence of measures
+        x (Union[np.ndarray, Grid]): Positions of the bins, shape (K,)
+        window: Length of the window
+        stride: Time between emissions
+        start: One stride before the first emission; the time of the first
+            response when None
+    """
+
+    def __init__(self, measures, x: Union[np.ndarray, Grid], window: Any, stride: Any,
+                 start: Optional[Any] = None) -> None:
+        if not window > 0:
+            raise ValueError("window must be positive")
+        super().__init__(measures, x, stride, start)
+        self.window = window
+        self._expired = 0
+        self._responses = np.zeros(len(self.grid), dtype=np.int64)
+
+    def _step(self, time: Any, stop: int) -> None:
+        if not len(self._buffer):
+            return
+        cutoff = int(np.searchsorted(self._buffer.times, time - self.window, side="left"))
+        K = len(self.grid)
+
+        deltas = self._bincount(self._applied, stop) - self._bincount(self._expired, cutoff)
+        bins = self._buffer.bins
+        self._responses += (np.bincount(bins[self._applied:stop], minlength=K)
+                            - np.bincount(bins[self._expired:cutoff], minlength=K))
+        self._expired = cutoff
+
+        counts = self.trackers[0].counts
+        empty = self._responses == 0
+        deltas = np.where(empty, -counts, np.maximum(deltas, -counts))
+        for tracker in self.trackers:
+            if np.all(empty):
+                tracker.counts[:] = 0
+                tracker.refresh()
+            else:
+                tracker.update(deltas)
+
+    def _first_needed(self) -> int:
+        return self._expired
+
+    def _shift(self, n: int) -> None:
+        super()._shift(n)
+        self._expired -= n
+
+class DecayedSeries(PolarizationSeries):
+    """
+    Polarization with exponentially decaying weights: the value at time t counts
+    a response at time s < t with its weight times 2^(-(t - s) / half_life).
+
+    Since the measures only see normalized histograms, decaying every count is
+    the same as growing the weights of new responses; responses are therefore
+    added once with weight times 2^((s - ref) / half_life), and all counts are
+    rescaled and the reference moved only every 64 half-lives.
+
+    Parameters:
+        measures: A MeasureSuite, a {name: measure} mapping or a sequence of measures
+        x (Union[np.ndarray, Grid]): Positions of the bins, shape (K,)
+        half_life: Time over which a response loses half its weight
+        stride: Time between emissions
+        start: One stride before the first emission; the time of the first
+            response when None
+    """
+
+    def __init__(self, measures, x: Union[np.ndarray, Grid], half_life: Any, stride: Any,
+                 start: Optional[Any] = None) -> None:
+        if not half_life > 0:
+            raise ValueError("half_life must be positive")
+        super().__init__(measures, x, stride, start)
+        self.half_life = half_life
+        self._ref = None
+
+    def _step(self, time: Any, stop: int) -> None:
+        if self._ref is None:
+            self._ref = time
+        halvings = float((time - self._ref) / self.half_life)
+        if halvings > _REBASE_HALVINGS:
+            for tracker in self.trackers:
+                tracker.counts *= np.exp2(-halvings)
+                tracker.refresh()
+            self._ref = time
+
+        if stop > self._applied:
+            growth = np.exp2((self._buffer.times[self._applied:stop] - self._ref) / self.half_life)
+            deltas = self._bincount(self._applied, stop, scale=growth.astype(np.float64))
+            for tracker in self.trackers:
+                tracker.update(deltas)
@@ -0,0 +1,129 @@
+from typing import Optional, Union, TYPE_CHECKING
+import operator
+import numpy as np
+
+from .histograms import Grid
+
+if TYPE_CHECKING:
+    from .base import PolarizationMeasure
+
+# Slack allowed when removing counts, for float weights that drifted while summed
+_REMOVE_RTOL = 1e-9
+_REMOVE_ATOL = 1e-12
+
+class PolarizationTracker:
+    """
+    Keep a polarization measure up to date while counts are added to and removed
+    from the bins of a fixed grid.
+
+    add and remove update the counts and whatever running sums the measure keeps
+    (in O(1) or O(K)); value is then computed from those sums on first access and
+    cached until the next update. This base tracker keeps only the counts and
+    calls the measure's compute; measures return specialized trackers from
+    PolarizationMeasure.tracker.
+
+    Parameters:
+        measure (PolarizationMeasure): The measure to track
+        x (Union[np.ndarray, Grid]): Positions of the bins, shape (K,)
+        counts (Optional[np.ndarray]): Initial counts, shape (K,)
+    """
+
+    def __init__(self, measure: "PolarizationMeasure", x: Union[np.ndarray, Grid],
+                 counts: Optional[np.ndarray] = None) -> None:
+        self.measure = measure
+        self.grid = x if isinstance(x, Grid) else Grid(x)
+        self.counts = np.zeros(len(self.grid))
+        if counts is not None:
+            counts = np.asarray(counts, dtype=np.float64)
+            if counts.shape != self.counts.shape:
+                raise ValueError("counts must have one entry per bin")
+            if np.min(counts) < 0 or not np.all(np.isfinite(counts)):
+                raise ValueError("counts must be non-negative and finite")
+            self.counts[:] = counts
+        self.refresh()
+
+    @property
+    def total(self) -> float:
+        """Total count."""
+        return self._total
+
+    @property
+    def value(self) -> float:
+        """Current polarization, NaN while the tracker is empty."""
+        if self._value is None:
+            self._value = self._compute() if self._total > 0 else float('nan')
+        return self._value
+
+    def add(self, bin: int, count: float = 1) -> None:
+        """Add count observations to a bin."""
+        bin, count = self._check(bin, count)
+        if count < 0:
+            raise ValueError("count must be non-negative; use remove")
+        self._apply(bin, count)
+
+    def remove(self, bin: int, count: float = 1) -> None:
+        """Remove count observations from a bin."""
+        bin, count = self._check(bin, count)
+        if count < 0:
+            raise ValueError("count must be non-negative; use add")
+        held = self.counts[bin]
+        # Removing what was added may over- or undershoot the bin by rounding error
+        slack = held * _REMOVE_RTOL + _REMOVE_ATOL
+        if count > held + slack:
+            raise ValueError(f"Bin {bin} holds only {held} observations")
+        # Empty the bin exactly instead of leaving residue of either sign
+        self._apply(bin, -float(held if count >= held - slack else count))
+        if self.counts[bin] == 0 and not np.any(self.counts):
+            self.refresh()
+
+    def update(self, deltas: np.ndarray) -> None:
+        """
+        Apply a change to every bin at once, e.g. the arrivals minus the
+        expirations of a time step.
+
+        Parameters:
+            deltas (np.ndarray): Count change of every bin, shape (K,)
+        """
+        deltas = np.asarray(deltas, dtype=np.float64)
+        if deltas.shape != self.counts.shape:
+            raise ValueError("deltas must have one entry per bin")
+        if not np.all(np.isfinite(deltas)):
+            raise ValueError("deltas must be finite")
+        slack = self.counts * _REMOVE_RTOL + _REMOVE_ATOL
+        if np.any(self.counts + deltas < -slack):
+            raise ValueError("Counts cannot become negative")
+        deltas = np.where((deltas < 0) & (self.counts + deltas <= slack), -self.counts, deltas)
+        for bin in np.flatnonzero(deltas):
+            self._apply(int(bin), float(deltas[bin]))
+
+    def _check(self, bin: int, count: float) -> tuple:
+        """Validate a bin index and a count, before any running sum is touched."""
+        bin = operator.index(bin)
+        if not 0 <= bin < len(self.grid):
+            raise ValueError(f"bin must be in [0, {len(self.grid)}), got {bin}")
+        count = float(count)
+        if not np.isfinite(count):
+            raise ValueError("count must be finite")
+        return bin, count
+
+    def refresh(self) -> None:
+        """Rebuild the running sums from the counts, dropping accumulated rounding error."""
+        self._total = float(np.sum(self.counts))
+        self._reset()
+        self._value = None
+
+    def _apply(self, bin: int, delta: float) -> None:
+        self.counts[bin] += delta
+        self._total += delta
+        self._update(bin, delta)
+        self._value = None
+
+    def _reset(self) -> None:
+        """Rebuild the measure's running sums from self.counts."""
+
+    def _update(self, bin: int, delta: float) -> None:
+        """Update the measure's running sums after counts[bin] changed by delta."""
+
+    def _compute(self) -> float:
+        """Compute the value from the running sums; only called when total > 0."""
+        return float(self.measure.compute(self.grid.x, self.counts / self._total))
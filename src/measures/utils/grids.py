@@ -0,0 +1,39 @@
+from collections import OrderedDict
+from typing import Hashable, Tuple
+import numpy as np
+
+_DISTANCE_CACHE: "OrderedDict[Tuple[Hashable, ...], np.ndarray]" = OrderedDict()
+_DISTANCE_CACHE_SIZE = 32
+
+def distance_matrix(x: np.ndarray) -> np.ndarray:
+    """
+    Return the pairwise distance matrix |x_i - x_j| of a grid.
+
+    Matrices are cached by grid contents (least recently used grids are evicted
+    once more than 32 are held), so histograms sharing a survey scale reuse the
+    same read-only matrix.
+
+    Parameters:
+        x (np.ndarray): Positions of shape (K,)
+
+    Returns:
+        np.ndarray: Read-only (K, K) distance matrix
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    key = (x.shape, x.tobytes())
+
+    distances = _DISTANCE_CACHE.get(key)
+    if distances is None:
+        distances = np.abs(x[:, None] - x[None, :])
+        distances.flags.writeable = False
+        _DISTANCE_CACHE[key] = distances
+        if len(_DISTANCE_CACHE) > _DISTANCE_CACHE_SIZE:
+            _DISTANCE_CACHE.popitem(last=False)
+    else:
+        _DISTANCE_CACHE.move_to_end(key)
+
+    return distances
+
+def clear_distance_cache() -> None:
+    """Drop every cached distance matrix."""
+    _DISTANCE_CACHE.clear()
@@ -0,0 +1,45 @@
+from typing import Callable
+import os
+
+try:
+    import numba
+except ImportError:
+    # Optional dependency: without it every measure runs its NumPy kernels
+    numba = None
+
+AVAILABLE = numba is not None
+
+# Set MEASURES_JIT=0 to keep the NumPy kernels even when numba is installed
+_ENABLED = AVAILABLE and os.environ.get("MEASURES_JIT", "1") != "0"
+
+def jit(function: Callable) -> Callable:
+    """
+    Compile a loop kernel with numba when it is installed.
+
+    Kernels are compiled in nopython mode with the GIL released, so batches
+    evaluated on a thread pool run in parallel, and with cache=True, so the
+    machine code is stored next to the module (or under NUMBA_CACHE_DIR) and
+    later processes skip compilation. Without numba the function is returned
+    unchanged; the measures then never call it, but it still runs as plain
+    Python, which is how the kernels are tested without numba.
+    """
+    if numba is None:
+        return function
+    return numba.njit(cache=True, nogil=True, error_model="numpy")(function)
+
+def enabled() -> bool:
+    """Whether the measures dispatch their batch kernels to the compiled versions."""
+    return _ENABLED
+
+def set_enabled(flag: bool) -> None:
+    """
+    Switch the compiled kernels on or off for the whole process, e.g. to
+    compare them with the NumPy kernels.
+
+    Raises:
+        ImportError: If flag is True and numba is not installed
+    """
+    global _ENABLED
+    if flag and not AVAILABLE:
+        raise ImportError("The compiled kernels require numba")
+    _ENABLED = bool(flag)
@@ -0,0 +1,295 @@
+"""
+Loop kernels compiled by numba (see utils.jit), one per measure.
+
+Every kernel evaluates the validated rows of an (m, K) weights matrix on one
+shared, sorted grid, row by row, keeping its running sums in scalars instead
+of the (m, K) temporaries of the NumPy kernels. They follow the NumPy kernels
+step by step, so results agree up to summation order.
+"""
+import math
+import numpy as np
+
+from .jit import jit
+
+_EPS = float(np.finfo(np.float64).eps)
+
+@jit
+def emd_rows(x, weights):
+    """EMDPol: sum_k |F_k - 0.5| (x_{k+1} - x_k) in one pass over the CDF."""
+    m, K = weights.shape
+    out = np.empty(m)
+    for r in range(m):
+        cdf = 0.0
+        area = 0.0
+        for k in range(K - 1):
+            cdf += weights[r, k]
+            area += abs(cdf - 0.5) * (x[k + 1] - x[k])
+        out[r] = 0.5 - area
+    return out
+
+@jit
+def esteban_ray_rows(x, weights, alpha, scale):
+    """EstebanRay: scale * sum_i w_i^(1+alpha) sum_j w_j |x_i - x_j|, with prefix sums."""
+    m, K = weights.shape
+    out = np.empty(m)
+    for r in range(m):
+        mass = 0.0
+        moment = 0.0
+        for k in range(K):
+            mass += weights[r, k]
+            moment += weights[r, k] * x[k]
+
+        mass_below = 0.0
+        moment_below = 0.0
+        total = 0.0
+        for i in range(K):
+            w = weights[r, i]
+            mass_below += w
+            moment_below += w * x[i]
+            if w > 0:
+                distances = ((x[i] * mass_below - moment_below)
+                             + ((moment - moment_below) - x[i] * (mass - mass_below)))
+                total += w ** (1 + alpha) * distances
+        out[r] = scale * total
+    return out
+
+@jit
+def shannon_rows(x, weights):
+    """ShannonPol: -sum_i w_i log2(1 - |x_i - mu| / d + eps)."""
+    m, K = weights.shape
+    spread = x[K - 1] - x[0]
+    out = np.empty(m)
+    for r in range(m):
+        mu = 0.0
+        for k in range(K):
+            mu += weights[r, k] * x[k]
+        total = 0.0
+        for k in range(K):
+            total += weights[r, k] * math.log2(1 - abs(x[k] - mu) / spread + _EPS)
+        out[r] = -total
+    return out
+
+@jit
+def bipol_rows(x, weights):
+    """BiPol: 4 (m_L s_R - m_R s_L) around the mean."""
+    m, K = weights.shape
+    out = np.empty(m)
+    for r in range(m):
+        mass = 0.0
+        mu = 0.0
+        for k in range(K):
+            mass += weights[r, k]
+            mu += weights[r, k] * x[k]
+        mass_L = 0.0
+        moment_L = 0.0
+        for k in range(K):
+            if x[k] < mu:
+                mass_L += weights[r, k]
+                moment_L += weights[r, k] * x[k]
+        out[r] = 4 * (mass_L * (mu - moment_L) - (mass - mass_L) * moment_L)
+    return out
+
+@jit
+def experts_rows(C, weights):
+    """Experts: n^T C n / (0.0099 n^2) / 100, skipping empty categories."""
+    m, K = weights.shape
+    out = np.empty(m)
+    for r in range(m):
+        mass = 0.0
+        numerator = 0.0
+        for i in range(K):
+            w_i = weights[r, i]
+            mass += w_i
+            if w_i == 0:
+                continue
+            row = 0.0
+            for j in range(K):
+                row += C[i, j] * weights[r, j]
+            numerator += w_i * row
+        out[r] = (numerator / (0.0099 * mass ** 2)) / 100
+    return out
+
+@jit
+def _pattern_agreement(pattern, K):
+    """Van der Eijk agreement of a pattern, counting its triples in O(K)."""
+    ones = 0.0
+    for k in range(K):
+        if pattern[k]:
+            ones += 1
+
+    TU = 0.0
+    TDU = 0.0
+    ones_before = 0.0
+    for j in range(K):
+        p = 1.0 if pattern[j] else 0.0
+        ones_after = ones - ones_before - p
+        zeros_before = j - ones_before
+        zeros_after = (K - 1 - j) - ones_after
+        TDU += (1 - p) * ones_before * ones_after
+        TU += p * (ones_before * zeros_after + zeros_before * ones_after)
+        ones_before += p
+
+    if ones == 1:
+        return 1.0
+    U = 1.0
+    if TU + TDU > 0:
+        U = ((K - 2) * TU - (K - 1) * TDU) / ((K - 2) * (TU + TDU))
+    return U * (1 - (ones - 1) / (K - 1))
+
+@jit
+def van_der_eijk_rows(weights):
+    """VanDerEijkPol: peel the layers of every row at its sorted frequencies."""
+    m, K = weights.shape
+    out = np.empty(m)
+    pattern = np.empty(K, dtype=np.bool_)
+    for r in range(m):
+        row = weights[r]
+        levels = np.sort(row)
+        mass = 0.0
+        for k in range(K):
+            mass += row[k]
+
+        agreement = 0.0
+        previous = 0.0
+        for t in range(K):
+            level = levels[t]
+            step = level - previous
+            previous = level
+            if level <= 0 or step == 0:
+                continue
+            size = 0
+            for k in range(K):
+                pattern[k] = row[k] >= level
+                if pattern[k]:
+                    size += 1
+            agreement += step * size * _pattern_agreement(pattern, K)
+        out[r] = 1 - (1 + agreement / mass) * 0.5
+    return out
+
+@jit
+def _effort(x, c, y, beta):
+    total = 0.0
+    for k in range(x.size):
+        if c[k] > 0:
+            total += c[k] * abs(x[k] - y) ** beta
+    return total
+
+@jit
+def _slope(x, c, y, beta):
+    g = 0.0
+    for k in range(x.size):
+        if c[k] > 0:
+            d = y - x[k]
+            if d > 0:
+                g += c[k] * d ** (beta - 1)
+            elif d < 0:
+                g -= c[k] * (-d) ** (beta - 1)
+    return g
+
+@jit
+def _consensus(x, c, beta, tol, max_iter):
+    """Consensus point of one row, as in minimize_effort_batch."""
+    K = x.size
+    if beta == 2:
+        mass = 0.0
+        moment = 0.0
+        for k in range(K):
+            mass += c[k]
+            moment += c[k] * x[k]
+        return moment / mass
+
+    if beta == 1:
+        mass = 0.0
+        for k in range(K):
+            mass += c[k]
+        cumulative = 0.0
+        for k in range(K):
+            cumulative += c[k]
+            if cumulative >= 0.5 * mass:
+                return x[k]
+        return x[K - 1]
+
+    if beta < 1:
+        best = np.inf
+        y = 0.0
+        for j in range(K):
+            if c[j] > 0:
+                f = _effort(x, c, x[j], beta)
+                if f < best:
+                    best = f
+                    y = x[j]
+        return y
+
+    lo = 0
+    hi = K - 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if _slope(x, c, x[mid], beta) <= 0:
+            lo = mid
+        else:
+            hi = mid
+    a = x[lo]
+    b = x[hi]
+    if not _slope(x, c, a, beta) < 0:
+        return a
+
+    q = max(1.0, 1.0 / (beta - 1))
+    t_lo = 0.0
+    t_hi = 1.0
+    tau = 0.5
+    y = a
+    for _ in range(max_iter):
+        # s, 1 - s and ds/dtau as logistic functions, as in optimization._mix
+        z = q * (math.log1p(-tau) - math.log(tau))
+        e = math.exp(-abs(z))
+        if z > 0:
+            s = e / (1 + e)
+            rest = 1 / (1 + e)
+        else:
+            s = 1 / (1 + e)
+            rest = e / (1 + e)
+        ds = q * s * rest / (tau * (1 - tau))
+        y = a + (b - a) * s if s <= 0.5 else b - (b - a) * rest
+
+        g = 0.0
+        h = 0.0
+        if a < y < b:
+            for k in range(K):
+                if c[k] > 0:
+                    d = y - x[k]
+                    scaled = c[k] * abs(d) ** (beta - 2)
+                    g += scaled * d
+                    h += scaled
+            h *= beta - 1
+            if not abs(g) > tol * h:
+                break
+        elif y <= a:
+            g = -1.0
+        else:
+            g = 1.0
+        if g < 0:
+            t_lo = tau
+        else:
+            t_hi = tau
+
+        tau_new = -1.0
+        if h > 0 and ds > 0:
+            tau_new = tau - g / (h * (b - a) * ds)
+        if not t_lo < tau_new < t_hi:
+            tau_new = 0.5 * (t_lo + t_hi)
+        if tau_new == tau:
+            break
+        tau = tau_new
+    return y
+
+@jit
+def minimize_effort_rows(x, coefficients, beta, tol, max_iter):
+    """MEC: the minimum effort and consensus point of every row."""
+    m = coefficients.shape[0]
+    efforts = np.empty(m)
+    points = np.empty(m)
+    for r in range(m):
+        y = _consensus(x, coefficients[r], beta, tol, max_iter)
+        efforts[r] = _effort(x, coefficients[r], y, beta)
+        points[r] = y
+    return efforts, points
@@ -0,0 +1,271 @@
+from typing import Optional, Tuple
+import math
+import numpy as np
+
+from . import jit, kernels
+
+def _sorted_support(x: np.ndarray, coefficients: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the points with positive coefficient, sorted by position."""
+    support = coefficients > 0
+    xs, cs = x[support], coefficients[support]
+    if xs.size > 1 and np.any(np.diff(xs) < 0):
+        order = np.argsort(xs, kind="stable")
+        xs, cs = xs[order], cs[order]
+    return xs, cs
+
+def _effort(xs: np.ndarray, cs: np.ndarray, y: float, beta: float) -> float:
+    return float(cs @ np.abs(xs - y) ** beta)
+
+def _slope_curvature(xs: np.ndarray, cs: np.ndarray, y: float, beta: float) -> Tuple[float, float]:
+    """
+    First and second derivatives of the effort, both divided by beta.
+    The second derivative is only finite away from the support points when beta < 2.
+    """
+    d = y - xs
+    with np.errstate(divide="ignore", over="ignore"):
+        scaled = cs * np.abs(d) ** (beta - 2)
+    return float(scaled @ d), float((beta - 1) * scaled.sum())
+
+def _slope(xs: np.ndarray, cs: np.ndarray, y: float, beta: float) -> float:
+    """Derivative of the effort divided by beta."""
+    d = y - xs
+    return float(cs @ (np.sign(d) * np.abs(d) ** (beta - 1)))
+
+def _mix(tau: float, q: float) -> Tuple[float, float, float]:
+    """
+    s = tau^q / (tau^q + (1 - tau)^q), 1 - s and ds/dtau, computed as logistic
+    functions of q log((1 - tau) / tau) so they neither underflow nor divide
+    0 by 0 when q = 1 / (beta - 1) is large.
+    """
+    z = q * (math.log1p(-tau) - math.log(tau))
+    e = math.exp(-abs(z))
+    s, c = (e / (1 + e), 1 / (1 + e)) if z > 0 else (1 / (1 + e), e / (1 + e))
+    return s, c, q * s * c / (tau * (1 - tau))
+
+def minimize_effort(
+    x: np.ndarray,
+    coefficients: np.ndarray,
+    beta: float,
+    tol: float = 1e-12,
+    max_iter: int = 100,
+    start: Optional[float] = None
+) -> Tuple[float, float]:
+    """
+    Minimize f(y) = sum(coefficients * |x - y| ** beta) exactly.
+
+    For beta <= 1, f is concave between support points, so the minimum is attained
+    at a support point (beta = 1 is the weighted median). For beta = 2 the minimizer
+    is the weighted mean. For beta > 1, f is strictly convex: the minimizer is
+    bracketed between two consecutive support points by bisecting on the sign of
+    f', and then refined with safeguarded Newton steps.
+
+    Parameters:
+        x (np.ndarray): Positions
+        coefficients (np.ndarray): Non-negative coefficients, usually weights ** alpha
+        beta (float): Distance exponent
+        tol (float): Tolerance on the consensus point for beta > 1
+        max_iter (int): Maximum number of Newton/bisection steps
+        start (Optional[float]): Warm start for beta > 1, e.g. the consensus point of
+            a slightly different distribution. The two support points around it
+            are tested first, which usually replaces the binary search for the
+            bracket; the Newton refinement and its result are unchanged
+
+    Returns:
+        Tuple[float, float]: The minimum effort and the consensus point attaining it
+    """
+    xs, cs = _sorted_support(np.asarray(x, dtype=float), np.asarray(coefficients, dtype=float))
+
+    if xs.size == 0:
+        return 0.0, float(np.mean(x))
+    if xs.size == 1:
+        return 0.0, float(xs[0])
+
+    if beta == 2:
+        y = float(np.sum(cs * xs) / np.sum(cs))
+        return _effort(xs, cs, y, beta), y
+
+    if beta == 1:
+        cumulative = np.cumsum(cs)
+        k = int(np.searchsorted(cumulative, 0.5 * cumulative[-1]))
+        y = float(xs[k])
+        return _effort(xs, cs, y, beta), y
+
+    if beta < 1:
+        efforts = np.sum(cs[None, :] * np.abs(xs[:, None] - xs[None, :]) ** beta, axis=1)
+        k = int(np.argmin(efforts))
+        return float(efforts[k]), float(xs[k])
+
+    # Bracket the root of f' between consecutive support points; f' < 0 at the
+    # first support point and f' > 0 at the last one
+    lo, hi = 0, xs.size - 1
+    if start is not None and hi > 1:
+        # Try the interval holding the warm start before searching the whole grid
+        k = min(max(int(np.searchsorted(xs, start)), 1), hi)
+        for end in (k - 1, k):
+            g = _slope(xs, cs, xs[end], beta)
+            if g == 0:
+                y = float(xs[end])
+                return _effort(xs, cs, y, beta), y
+            if g < 0:
+                lo = max(lo, end)
+            else:
+                hi = min(hi, end)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        g = _slope(xs, cs, xs[mid], beta)
+        if g == 0:
+            y = float(xs[mid])
+            return _effort(xs, cs, y, beta), y
+        if g < 0:
+            lo = mid
+        else:
+            hi = mid
+    a, b = float(xs[lo]), float(xs[hi])
+
+    # Newton on tau in (0, 1), with y = a + (b - a) * s(tau) and
+    # s = tau^q / (tau^q + (1 - tau)^q). With q = 1 / (beta - 1) the singular terms
+    # |y - a|^(beta - 1) and |b - y|^(beta - 1) become linear in tau near the ends,
+    # so f' is smooth in tau and Newton converges quickly even when the consensus
+    # point sits next to a heavily weighted support point.
+    q = max(1.0, 1.0 / (beta - 1))
+    t_lo, t_hi = 0.0, 1.0
+    tau = 0.5
+    for _ in range(max_iter):
+        s, c, ds = _mix(tau, q)
+        y = a + (b - a) * s if s <= 0.5 else b - (b - a) * c
+        if a < y < b:
+            g, h = _slope_curvature(xs, cs, y, beta)
+            # Stop once the Newton step in y is below the tolerance
+            if abs(g) <= tol * h:
+                break
+        else:
+            # s rounded to 0 or 1 (or the consensus point is within one ulp of a
+            # support point): f' < 0 at a and f' > 0 at b say which way to go
+            g, h = (-1.0, 0.0) if y <= a else (1.0, 0.0)
+        if g < 0:
+            t_lo = tau
+        else:
+            t_hi = tau
+
+        tau_new = tau - g / (h * (b - a) * ds) if h > 0 and ds > 0 else -1.0
+        # Fall back to bisection when Newton leaves the bracket
+        if not t_lo < tau_new < t_hi:
+            tau_new = 0.5 * (t_lo + t_hi)
+        if tau_new == tau:
+            break
+        tau = tau_new
+
+    return _effort(xs, cs, y, beta), y
+
+def _take(x: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """Pick one position per row from a shared (K,) grid or (m, K) per-row grids."""
+    if x.ndim == 1:
+        return x[index]
+    return np.take_along_axis(x, index[:, None], axis=1)[:, 0]
+
+def minimize_effort_batch(
+    x: np.ndarray,
+    coefficients: np.ndarray,
+    beta: float,
+    tol: float = 1e-12,
+    max_iter: int = 100
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimize f(y) = sum(coefficients * |x - y| ** beta) for every row at once.
+
+    Same cases as minimize_effort, with every search run in lockstep across rows:
+    the bracket is found by a binary search over the grid and refined by the same
+    reparametrized, safeguarded Newton iteration until every row has converged.
+
+    Parameters:
+        x (np.ndarray): Sorted positions, shared (K,) or per-row (m, K)
+        coefficients (np.ndarray): Non-negative (m, K) coefficients with a positive entry per row
+        beta (float): Distance exponent
+        tol (float): Tolerance on the consensus points for beta > 1
+        max_iter (int): Maximum number of Newton/bisection steps
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The (m,) minimum efforts and consensus points
+    """
+    if jit.enabled() and x.ndim == 1:
+        return kernels.minimize_effort_rows(x, coefficients, float(beta), float(tol), int(max_iter))
+
+    m, K = coefficients.shape
+
+    def effort(y: np.ndarray) -> np.ndarray:
+        return np.sum(coefficients * np.abs(x - y[:, None]) ** beta, axis=1)
+
+    if beta == 2:
+        y = np.sum(coefficients * x, axis=1) / np.sum(coefficients, axis=1)
+        return effort(y), y
+
+    if beta == 1:
+        cumulative = np.cumsum(coefficients, axis=1)
+        k = np.argmax(cumulative >= 0.5 * cumulative[:, -1:], axis=1)
+        y = _take(x, k)
+        return effort(y), y
+
+    if beta < 1:
+        # Concave between support points: the minimum is at one of them
+        best = np.full(m, np.inf)
+        y = np.zeros(m)
+        for j in range(K):
+            x_j = x[..., j] if x.ndim == 2 else np.full(m, x[j])
+            f_j = np.where(coefficients[:, j] > 0, effort(x_j), np.inf)
+            better = f_j < best
+            best = np.where(better, f_j, best)
+            y = np.where(better, x_j, y)
+        return best, y
+
+    def slope(y: np.ndarray) -> np.ndarray:
+        d = y[:, None] - x
+        return np.sum(coefficients * np.sign(d) * np.abs(d) ** (beta - 1), axis=1)
+
+    # Lockstep binary search for consecutive grid points with f'(a) <= 0 < f'(b)
+    lo, hi = np.zeros(m, dtype=np.intp), np.full(m, K - 1, dtype=np.intp)
+    for _ in range(int(np.ceil(np.log2(K - 1))) if K > 2 else 0):
+        mid = (lo + hi) // 2
+        g = slope(_take(x, mid))
+        searching = hi - lo > 1
+        lo = np.where(searching & (g <= 0), mid, lo)
+        hi = np.where(searching & (g > 0), mid, hi)
+
+    a, b = _take(x, lo), _take(x, hi)
+    y = a.copy()
+    active = slope(a) < 0
+
+    # Same reparametrized Newton iteration as minimize_effort, masked per row
+    q = max(1.0, 1.0 / (beta - 1))
+    t_lo, t_hi = np.zeros(m), np.ones(m)
+    tau = np.full(m, 0.5)
+    # |d| ** (beta - 2) overflows next to a support point for beta just above 1
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(max_iter):
+            if not np.any(active):
+                break
+            # Stable s, 1 - s and ds/dtau, as in _mix
+            z = q * (np.log1p(-tau) - np.log(tau))
+            e = np.exp(-np.abs(z))
+            s, c = np.where(z > 0, e, 1) / (1 + e), np.where(z > 0, 1, e) / (1 + e)
+            ds = q * s * c / (tau * (1 - tau))
+            y = np.where(active, np.where(s <= 0.5, a + (b - a) * s, b - (b - a) * c), y)
+            interior = (a < y) & (y < b)
+
+            d = y[:, None] - x
+            scaled = coefficients * np.abs(d) ** (beta - 2)
+            g = np.sum(scaled * d, axis=1)
+            h = (beta - 1) * np.sum(scaled, axis=1)
+            # Where s rounded to 0 or 1, bisect on the sign of f' at the bracket ends
+            g = np.where(interior, g, np.where(y <= a, -1.0, 1.0))
+            h = np.where(interior, h, 0.0)
+            active &= ~interior | (np.abs(g) > tol * h)
+
+            t_lo = np.where(active & (g < 0), tau, t_lo)
+            t_hi = np.where(active & (g >= 0), tau, t_hi)
+            tau_new = np.where((h > 0) & (ds > 0), tau - g / (h * (b - a) * ds), -1.0)
+            inside = (t_lo < tau_new) & (tau_new < t_hi)
+            tau_new = np.where(inside, tau_new, 0.5 * (t_lo + t_hi))
+            active &= tau_new != tau
+            tau = np.where(active, tau_new, tau)
+
+    return effort(y), y
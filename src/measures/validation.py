@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import NamedTuple, Optional, Tuple, Union
 import numpy as np
 
 def minmax_normalize_x(x: np.ndarray) -> np.ndarray:
@@ -8,10 +8,44 @@ def minmax_normalize_x(x: np.ndarray) -> np.ndarray:
         return np.zeros_like(x)
     return (x - x_min) / (x_max - x_min)
 
-def validate_histogram(x: np.ndarray, 
-                      weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+class Histogram(NamedTuple):
+    """
+    A validated histogram: strictly increasing positions min-max normalized to
+    [0, 1] and non-negative weights summing to 1. Measures never re-check it.
+    """
+    x: np.ndarray
+    weights: np.ndarray
+
+def _as_weights(weights: np.ndarray) -> np.ndarray:
+    """View weights as a numeric array, copying only when they are not numeric."""
+    weights = np.asarray(weights)
+    if weights.dtype.kind not in "iuf":
+        weights = weights.astype(np.float64)
+    return weights
+
+def validate_histogram(x: Union[np.ndarray, Histogram],
+                      weights: Optional[np.ndarray] = None,
+                      trusted: bool = False) -> Histogram:
+    """
+    Validate and normalize a histogram.
+
+    Parameters:
+        x (np.ndarray): Positions, or an already validated Histogram
+        weights (np.ndarray): Weights (integer counts are accepted)
+        trusted (bool): Skip every check and normalization; x must already be
+            sorted and scaled to [0, 1] and weights must sum to 1
+
+    Returns:
+        Histogram: The (x, weights) pair as float64 arrays
+    """
+    if isinstance(x, Histogram):
+        return x
+
+    if trusted:
+        return Histogram(np.asarray(x, dtype=np.float64), np.asarray(weights, dtype=np.float64))
+
     x = np.asarray(x, dtype=np.float64)
-    weights = np.asarray(weights, dtype=np.float64)
+    weights = _as_weights(weights)
     
     if x.shape != weights.shape:
         raise ValueError("x and weights must have the same shape")
@@ -21,17 +55,101 @@ def validate_histogram(x: np.ndarray,
         
     if not np.all(np.diff(x) > 0):
         raise ValueError("x values must be strictly increasing")
-        
-    if np.any(weights < 0):
+    
+    return Histogram(minmax_normalize_x(x), normalize_weights(weights))
+
+def normalize_weights(weights: np.ndarray) -> np.ndarray:
+    """
+    Check that weights are non-negative with a positive, finite total and scale
+    them to sum to 1.
+
+    Parameters:
+        weights (np.ndarray): Weights (integer counts are accepted)
+
+    Returns:
+        np.ndarray: float64 weights summing to 1
+    """
+    weights = _as_weights(weights)
+    
+    if not np.all(np.isfinite(weights)):
+        raise ValueError("weights must be finite")
+    
+    if np.min(weights) < 0:
         raise ValueError("All weights must be non-negative")
-        
-    if not np.any(weights > 0):
+    
+    total = np.sum(weights, dtype=np.float64)
+    if not total > 0:
         raise ValueError("At least one weight must be positive")
     
-    weights = weights / np.sum(weights)
-    x = minmax_normalize_x(x)
+    if not np.isfinite(total):
+        raise ValueError("The sum of the weights must be finite")
     
-    return x, weights
+    return np.true_divide(weights, total, dtype=np.float64)
+
+def validate_batch(x: np.ndarray,
+                   weights: np.ndarray,
+                   trusted: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Validate an (m, K) matrix of histograms row by row.
+
+    Structural problems (shapes, a shared grid that is not strictly increasing)
+    raise ValueError for the whole batch. Row-level problems (negative, non-finite
+    or all-zero weights, a per-row grid that is not strictly increasing) are
+    reported in the returned validity mask instead.
+
+    Each row is checked with two reductions (its minimum and its sum), and the
+    normalized weights are written in a single float64 pass, so integer counts
+    are never copied to float first.
+
+    Parameters:
+        x (np.ndarray): Shared positions of shape (K,) or per-row positions of shape (m, K)
+        weights (np.ndarray): Weights matrix of shape (m, K)
+        trusted (bool): Skip every check and normalization; every row must already be
+            a normalized histogram on a sorted grid scaled to [0, 1]
+
+    Returns:
+        Tuple: Normalized x, row-normalized weights and a boolean (m,) validity mask
+    """
+    x = np.asarray(x, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64) if trusted else _as_weights(weights)
+
+    if weights.ndim != 2:
+        raise ValueError("weights must be a 2-D (m, K) matrix")
+
+    if x.ndim == 1:
+        if x.shape[0] != weights.shape[1]:
+            raise ValueError("x must have one position per column of weights")
+    elif x.shape != weights.shape:
+        raise ValueError("x must have shape (K,) or the same shape as weights")
+
+    if trusted:
+        return x, weights, np.ones(weights.shape[0], dtype=bool)
+
+    if weights.shape[1] < 2:
+        raise ValueError("At least two points are required")
+
+    increasing = np.all(np.diff(x, axis=-1) > 0, axis=-1)
+    if x.ndim == 1 and not increasing:
+        raise ValueError("x values must be strictly increasing")
+
+    # NaN fails both comparisons and inf makes the sum non-finite
+    sums = np.sum(weights, axis=1, dtype=np.float64)
+    valid = (np.min(weights, axis=1) >= 0) & (sums > 0) & np.isfinite(sums)
+    if x.ndim == 2:
+        valid &= increasing
+
+    normalized = np.zeros(weights.shape)
+    np.true_divide(weights, sums[:, None], out=normalized, where=valid[:, None])
+
+    if x.ndim == 1:
+        x = minmax_normalize_x(x)
+    else:
+        x_min = x[:, :1]
+        x_range = x[:, -1:] - x_min
+        x = np.divide(x - x_min, x_range,
+                      out=np.zeros_like(x), where=valid[:, None])
+
+    return x, normalized, valid
 
 def validate_parameters(**parameters) -> None:
     """Validate measure-specific parameters."""
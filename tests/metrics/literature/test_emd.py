@@ -35,6 +35,32 @@ class TestEMDPol(unittest.TestCase):
         result = self.measure.compute(self.x, weights)
         self.assertLess(result, 0.3)
 
+    def test_non_uniform_grid(self):
+        """Test that the actual spacing of x is used."""
+        x = np.array([0.0, 0.1, 0.2, 0.9, 1.0])
+        weights = np.array([0.1, 0.3, 0.2, 0.3, 0.1])
+        
+        result = self.measure(x, weights)
+        expected = EMDPolSciPy()(x, weights)
+        self.assertAlmostEqual(result, expected, places=10)
+        
+        batch = self.measure.compute_batch(x, weights[None, :])
+        self.assertAlmostEqual(batch[0], expected, places=10)
+    
+    def test_compute_batch(self):
+        """Test that compute_batch matches row-by-row evaluation."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.5, 0.0, 0.0, 0.0, 0.5],
+            [0.1, 0.2, 0.4, 0.2, 0.1],
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.4, 0.3, 0.2, 0.1, 0.0]
+        ])
+        
+        result = self.measure.compute_batch(self.x, weights)
+        expected = [self.measure(self.x, w) for w in weights]
+        np.testing.assert_array_almost_equal(result, expected)
+
 class TestEMDPolSciPy(unittest.TestCase):
     def setUp(self):
         self.measure = EMDPolSciPy()
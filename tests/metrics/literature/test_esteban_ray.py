@@ -84,6 +84,77 @@ class TestEstebanRay(unittest.TestCase):
         expected_ratio = 3.0 / default_K
         self.assertAlmostEqual(fixed_K_result / default_result, expected_ratio, places=6)
     
+    def test_linear_path_matches_dense(self):
+        """Test that the prefix-sum path agrees with the dense double sum."""
+        rng = np.random.default_rng(0)
+        x = np.sort(rng.random(300))
+        weights = rng.random(300)
+        weights /= weights.sum()
+        
+        linear_measure = EstebanRay(alpha=1.2)
+        dense_measure = EstebanRay(alpha=1.2)
+        dense_measure.dense_threshold = 1000
+        
+        self.assertAlmostEqual(linear_measure.compute(x, weights),
+                               dense_measure.compute(x, weights), places=10)
+        
+        # Unsorted opinions are sorted internally
+        order = rng.permutation(300)
+        self.assertAlmostEqual(linear_measure.compute(x[order], weights[order]),
+                               dense_measure.compute(x, weights), places=10)
+        
+        batch = np.vstack([weights, weights[::-1]])
+        np.testing.assert_array_almost_equal(linear_measure.compute_batch(x, batch),
+                                             dense_measure.compute_batch(x, batch))
+    
+    def test_compute_opinions(self):
+        """Test that opinions with ties match the histogram of their distinct values."""
+        rng = np.random.default_rng(1)
+        opinions = rng.integers(0, 5, 1000) * 0.25
+        survey_weights = rng.uniform(0.5, 2, 1000)
+
+        counts = np.bincount((opinions * 4).astype(int), minlength=5)
+        self.assertAlmostEqual(self.measure.compute_opinions(opinions),
+                               self.measure(self.x, counts))
+        self.assertAlmostEqual(self.measure.compute_opinions(np.sort(opinions), assume_sorted=True),
+                               self.measure(self.x, counts))
+
+        totals = np.bincount((opinions * 4).astype(int), weights=survey_weights, minlength=5)
+        self.assertAlmostEqual(self.measure.compute_opinions(opinions, survey_weights),
+                               self.measure(self.x, totals))
+
+        self.assertEqual(self.measure.compute_opinions(np.full(10, 3.0)), 0.0)
+        for bad in (-survey_weights, np.zeros(1000), survey_weights[:10]):
+            with self.assertRaises(ValueError):
+                self.measure.compute_opinions(opinions, bad)
+        with self.assertRaises(ValueError):
+            self.measure.compute_opinions(opinions, assume_sorted=True)
+
+    def test_per_row_grids(self):
+        """Test that per-row grids match row-by-row evaluation."""
+        rng = np.random.default_rng(2)
+        x = np.sort(rng.random((20, 6)), axis=1)
+        weights = rng.random((20, 6))
+
+        expected = [self.measure(x[i], weights[i]) for i in range(20)]
+        np.testing.assert_array_almost_equal(self.measure.compute_batch(x, weights), expected)
+
+    def test_compute_batch_alphas(self):
+        """Test that several alphas at once match one batch per alpha."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.4, 0.1, 0.0, 0.1, 0.4],
+            [0.0, 0.0, 0.0, 0.0, 0.0]
+        ])
+        alphas = [0.5, 0.8, 1.6]
+        
+        result = EstebanRay.compute_batch_alphas(self.x, weights, alphas)
+        
+        self.assertEqual(result.shape, (3, 3))
+        for j, alpha in enumerate(alphas):
+            np.testing.assert_array_almost_equal(result[:, j],
+                                                 EstebanRay(alpha=alpha).compute_batch(self.x, weights))
+    
     def test_find_matching_parameter_set(self):
         """Test finding matching parameter set in thresholds."""
         param_set = self.measure.find_matching_parameter_set()
@@ -93,5 +164,19 @@ class TestEstebanRay(unittest.TestCase):
         param_set = custom_measure.find_matching_parameter_set()
         self.assertIsNone(param_set)
 
+    def test_compute_batch(self):
+        """Test that compute_batch matches row-by-row evaluation."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.5, 0.0, 0.0, 0.0, 0.5],
+            [0.1, 0.2, 0.4, 0.2, 0.1],
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.4, 0.3, 0.2, 0.1, 0.0]
+        ])
+        
+        result = self.measure.compute_batch(self.x, weights)
+        expected = [self.measure(self.x, w) for w in weights]
+        np.testing.assert_array_almost_equal(result, expected)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from src.measures.metrics.literature.experts import Experts
+from src.measures.metrics.literature.experts import Experts, interpolate_coefficients
 
 class TestExperts(unittest.TestCase):
     def setUp(self):
@@ -75,5 +75,58 @@ class TestExperts(unittest.TestCase):
         # Central unimodal should have lowest polarization
         self.assertLess(central_result, uniform_result)
 
+    def test_coefficient_matrix_matches_formula(self):
+        """Test that the 5-category quadratic form reproduces the published formula."""
+        weights = np.array([0.3, 0.1, 0.2, 0.15, 0.25])
+        n1, n2, _, n4, n5 = weights
+        
+        expected = (2.14 * n2 * n4 + 2.70 * (n1 * n4 + n2 * n5) + 3.96 * n1 * n5) / 0.0099 / 100
+        self.assertAlmostEqual(self.measure.compute(self.x, weights), expected)
+        np.testing.assert_array_almost_equal(interpolate_coefficients(5),
+                                             self.measure.coefficient_matrix(5))
+    
+    def test_interpolated_scales(self):
+        """Test interpolated matrices for 3-, 7- and 11-point scales."""
+        measure = Experts(interpolate=True)
+        
+        for K in [3, 7, 11]:
+            x = np.linspace(0, 1, K)
+            extremes = np.zeros(K)
+            extremes[[0, -1]] = 0.5
+            center = np.zeros(K)
+            center[K // 2] = 1.0
+            
+            self.assertAlmostEqual(measure(x, extremes), 1.0)
+            self.assertEqual(measure(x, center), 0.0)
+            self.assertGreater(measure(x, extremes), measure(x, np.ones(K)))
+    
+    def test_supplied_coefficients(self):
+        """Test supplying a coefficient matrix for another scale length."""
+        C = np.array([[0.0, 0.0, 1.98], [0.0, 0.0, 0.0], [1.98, 0.0, 0.0]])
+        measure = Experts(coefficients={3: C})
+        
+        x = np.array([0.0, 0.5, 1.0])
+        weights = np.array([0.5, 0.0, 0.5])
+        self.assertAlmostEqual(measure(x, weights), 1.0)
+        
+        with self.assertRaises(ValueError):
+            Experts(coefficients={2: np.array([[0.0, 1.0], [0.0, 0.0]])})
+        with self.assertRaises(ValueError):
+            Experts(coefficients={4: C})
+    
+    def test_compute_batch(self):
+        """Test that compute_batch matches row-by-row evaluation."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.5, 0.0, 0.0, 0.0, 0.5],
+            [0.1, 0.2, 0.4, 0.2, 0.1],
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.4, 0.3, 0.2, 0.1, 0.0]
+        ])
+        
+        result = self.measure.compute_batch(self.x, weights)
+        expected = [self.measure(self.x, w) for w in weights]
+        np.testing.assert_array_almost_equal(result, expected)
+
 if __name__ == "__main__":
     unittest.main()
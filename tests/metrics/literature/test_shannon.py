@@ -79,5 +79,19 @@ class TestShannonPol(unittest.TestCase):
         result = self.measure.compute(self.x, weights)
         self.assertTrue(np.isfinite(result))
 
+    def test_compute_batch(self):
+        """Test that compute_batch matches row-by-row evaluation."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.5, 0.0, 0.0, 0.0, 0.5],
+            [0.1, 0.2, 0.4, 0.2, 0.1],
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.4, 0.3, 0.2, 0.1, 0.0]
+        ])
+        
+        result = self.measure.compute_batch(self.x, weights)
+        expected = [self.measure(self.x, w) for w in weights]
+        np.testing.assert_array_almost_equal(result, expected)
+
 if __name__ == "__main__":
     unittest.main()
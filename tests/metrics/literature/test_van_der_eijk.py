@@ -1,5 +1,8 @@
+import os
+import tempfile
 import unittest
 import numpy as np
+from src.measures.metrics.literature import van_der_eijk
 from src.measures.metrics.literature.van_der_eijk import VanDerEijkPol
 
 class TestVanDerEijkPol(unittest.TestCase):
@@ -7,27 +10,6 @@ class TestVanDerEijkPol(unittest.TestCase):
         self.measure = VanDerEijkPol()
         self.x = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
     
-    def test_pattern_vector(self):
-        """Test the _pattern_vector method."""
-        v = np.array([0.5, 0.0, 0.3, 0.0, 0.2])
-        expected = np.array([1, 0, 1, 0, 1])
-        
-        result = self.measure._pattern_vector(v)
-        np.testing.assert_array_equal(result, expected)
-    
-    def test_minnz(self):
-        """Test the _minnz method."""
-        v = np.array([0.5, 0.0, 0.3, 0.0, 0.2])
-        expected = 0.2  # Smallest non-zero value
-        
-        result = self.measure._minnz(v)
-        self.assertEqual(result, expected)
-        
-        # Edge case: all zeros
-        v = np.array([0.0, 0.0, 0.0])
-        result = self.measure._minnz(v)
-        self.assertEqual(result, np.inf)
-    
     def test_pattern_agreement(self):
         """Test the _pattern_agreement method."""
         # Unimodal pattern [1,1,1,0,0]
@@ -51,13 +33,88 @@ class TestVanDerEijkPol(unittest.TestCase):
         a3 = self.measure._pattern_agreement(p3)
         self.assertEqual(a3, 1.0)
     
+    def test_pattern_agreement_triple_counts(self):
+        """Test the prefix-count triples against explicit enumeration."""
+        rng = np.random.default_rng(0)
+        
+        for K in [3, 5, 8]:
+            for _ in range(20):
+                P = (rng.random(K) < 0.5).astype(int)
+                if P.sum() == 0:
+                    continue
+                
+                TU = TDU = 0
+                for i in range(K-2):
+                    for j in range(i+1, K-1):
+                        for m in range(j+1, K):
+                            TDU += P[i] == 1 and P[j] == 0 and P[m] == 1
+                            TU += P[i] == 1 and P[j] == 1 and P[m] == 0
+                            TU += P[i] == 0 and P[j] == 1 and P[m] == 1
+                
+                U = 1 if TU == TDU == 0 else ((K-2) * TU - (K-1) * TDU) / ((K-2) * (TU + TDU))
+                S = P.sum()
+                expected = 1 if S == 1 else U * (1 - (S - 1) / (K - 1))
+                
+                self.assertAlmostEqual(self.measure._pattern_agreement(P), expected)
+    
+    def test_agreement_table(self):
+        """Test that the bitmask table matches direct agreement computation."""
+        table = VanDerEijkPol.agreement_table(5)
+        self.assertEqual(table.shape, (32,))
+        
+        for mask in [0b00111, 0b10001, 0b00100, 0b11111, 0b01010]:
+            P = np.array([(mask >> k) & 1 for k in range(5)])
+            self.assertAlmostEqual(table[mask], self.measure._pattern_agreement(P))
+    
+    def test_agreement_table_persistence(self):
+        """Test that tables are saved to and loaded from table_dir."""
+        with tempfile.TemporaryDirectory() as table_dir:
+            van_der_eijk._AGREEMENT_TABLES.pop(6, None)
+            VanDerEijkPol.table_dir = table_dir
+            try:
+                built = VanDerEijkPol.agreement_table(6)
+                path = os.path.join(table_dir, "van_der_eijk_agreement_6.npy")
+                self.assertTrue(os.path.exists(path))
+                
+                van_der_eijk._AGREEMENT_TABLES.pop(6)
+                np.testing.assert_array_equal(VanDerEijkPol.agreement_table(6), built)
+                
+                # Stale or foreign files are rebuilt
+                corrupted = built.copy()
+                corrupted[::7] = 0.5
+                for stale in (np.zeros(32), np.arange(64), corrupted):
+                    np.save(path, stale)
+                    van_der_eijk._AGREEMENT_TABLES.pop(6)
+                    np.testing.assert_array_equal(VanDerEijkPol.agreement_table(6), built)
+                np.testing.assert_array_equal(np.load(path), built)
+                
+                # A directory that cannot be created leaves the table in memory
+                VanDerEijkPol.table_dir = os.path.join(path, "tables")
+                van_der_eijk._AGREEMENT_TABLES.pop(6)
+                weights = np.array([0.3, 0.0, 0.2, 0.1, 0.0, 0.4])
+                direct = VanDerEijkPol()
+                direct.table_max_K = 0
+                self.assertAlmostEqual(VanDerEijkPol()(np.arange(6), weights),
+                                       direct(np.arange(6), weights))
+                np.testing.assert_array_equal(VanDerEijkPol.agreement_table(6), built)
+                
+                # A missing directory is created
+                VanDerEijkPol.table_dir = os.path.join(table_dir, "new")
+                van_der_eijk._AGREEMENT_TABLES.pop(6)
+                VanDerEijkPol.agreement_table(6)
+                self.assertTrue(os.path.exists(os.path.join(table_dir, "new",
+                                                            "van_der_eijk_agreement_6.npy")))
+            finally:
+                VanDerEijkPol.table_dir = None
+    
     def test_minimum_length(self):
         """Test that the measure requires at least 3 points."""
         x_small = np.array([0.0, 1.0])
         weights_small = np.array([0.5, 0.5])
         
         # Should return NaN for vectors shorter than 3
-        result = self.measure.compute(x_small, weights_small)
+        with self.assertWarns(RuntimeWarning):
+            result = self.measure.compute(x_small, weights_small)
         self.assertTrue(np.isnan(result))
     
     def test_negative_weights(self):
@@ -108,5 +165,19 @@ class TestVanDerEijkPol(unittest.TestCase):
         # The result should be polarized, but not extremely
         self.assertTrue(0.2 < result < 0.7)
 
+    def test_compute_batch(self):
+        """Test that compute_batch matches row-by-row evaluation."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.5, 0.0, 0.0, 0.0, 0.5],
+            [0.1, 0.2, 0.4, 0.2, 0.1],
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.4, 0.3, 0.2, 0.1, 0.0]
+        ])
+        
+        result = self.measure.compute_batch(self.x, weights)
+        expected = [self.measure(self.x, w) for w in weights]
+        np.testing.assert_array_almost_equal(result, expected)
+
 if __name__ == "__main__":
     unittest.main()
@@ -82,5 +82,49 @@ class TestBiPol(unittest.TestCase):
         # More concentrated should have lower polarization
         self.assertLess(result_concentrated, result_skewed)
 
+    def test_compute_opinions(self):
+        """Test that per-respondent opinions match the aggregated histogram."""
+        rng = np.random.default_rng(0)
+        opinions = rng.choice(np.array([1, 2, 3, 4, 5]), size=500, p=[0.3, 0.1, 0.1, 0.2, 0.3])
+        
+        counts = np.bincount(opinions, minlength=6)[1:]
+        expected = self.measure(np.arange(1, 6), counts)
+        
+        self.assertAlmostEqual(self.measure.compute_opinions(opinions), expected)
+        self.assertAlmostEqual(self.measure.compute_opinions(np.sort(opinions), assume_sorted=True),
+                               expected)
+        
+        survey_weights = rng.random(500)
+        weighted = np.bincount(opinions, weights=survey_weights, minlength=6)[1:]
+        self.assertAlmostEqual(self.measure.compute_opinions(opinions, survey_weights),
+                               self.measure(np.arange(1, 6), weighted))
+        
+        self.assertEqual(self.measure.compute_opinions(np.full(10, 3.0)), 0.0)
+    
+    def test_compute_opinions_validation(self):
+        """Test that invalid opinions or weights are rejected instead of leaving [0, 1]."""
+        for values in ([], [1.0, np.nan, 2.0], [1.0, np.inf]):
+            with self.assertRaises(ValueError):
+                self.measure.compute_opinions(values)
+        for weights in ([1, -1, 1], [0, 0, 0], [1, np.nan, 1], [1, 1]):
+            with self.assertRaises(ValueError):
+                self.measure.compute_opinions([0, 1, 2], weights)
+        with self.assertRaises(ValueError):
+            self.measure.compute_opinions([2, 0, 1], assume_sorted=True)
+    
+    def test_compute_batch(self):
+        """Test that compute_batch matches row-by-row evaluation."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.5, 0.0, 0.0, 0.0, 0.5],
+            [0.1, 0.2, 0.4, 0.2, 0.1],
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.4, 0.3, 0.2, 0.1, 0.0]
+        ])
+        
+        result = self.measure.compute_batch(self.x, weights)
+        expected = [self.measure(self.x, w) for w in weights]
+        np.testing.assert_array_almost_equal(result, expected)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
 import unittest
+import warnings
 import numpy as np
 from src.measures.metrics.proposed.mec import MEC, MECNormalized
+from src.measures.utils.optimization import minimize_effort
 
 class TestMEC(unittest.TestCase):
     def setUp(self):
@@ -68,6 +70,122 @@ class TestMEC(unittest.TestCase):
         # Results should be different
         self.assertNotEqual(result3, result4)
 
+    def test_weighted_median_and_mean(self):
+        """Test the closed-form cases beta=1 (weighted median) and beta=2 (weighted mean)."""
+        weights = np.array([0.1, 0.2, 0.05, 0.4, 0.25])
+        
+        result, point = MEC(alpha=1, beta=1).consensus(self.x, weights)
+        self.assertEqual(point, 0.75)
+        self.assertAlmostEqual(result, np.sum(weights * np.abs(self.x - 0.75)))
+        
+        result, point = MEC(alpha=1, beta=2).consensus(self.x, weights)
+        mean = np.sum(weights * self.x)
+        self.assertAlmostEqual(point, mean)
+        self.assertAlmostEqual(result, np.sum(weights * (self.x - mean) ** 2))
+    
+    def test_exact_minimum(self):
+        """Test that the solver is never beaten by a dense grid search."""
+        grid = np.linspace(0, 1, 20001)
+        rng = np.random.default_rng(0)
+        
+        for alpha, beta in [(2, 1.15), (1, 1.5), (2, 3.0), (1, 0.5)]:
+            for _ in range(10):
+                weights = rng.random(5)
+                weights /= weights.sum()
+                coefficients = weights ** alpha
+                
+                value, point = minimize_effort(self.x, coefficients, beta)
+                brute = np.sum(coefficients * np.abs(self.x - grid[:, None]) ** beta, axis=1)
+                
+                self.assertLessEqual(value, brute.min() + 1e-12)
+                self.assertAlmostEqual(value, np.sum(coefficients * np.abs(self.x - point) ** beta))
+    
+    def test_beta_near_one(self):
+        """Test that beta just above 1 neither divides by zero nor loses the minimum."""
+        grid = np.linspace(0, 1, 20001)
+        weights = np.array([0.3, 0.1, 0.05, 0.25, 0.3])
+
+        for beta in [1.0001, 1.001, 1.01]:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", RuntimeWarning)
+                value, point = minimize_effort(self.x, weights, beta)
+            brute = np.sum(weights * np.abs(self.x - grid[:, None]) ** beta, axis=1)
+
+            self.assertTrue(np.isfinite(value) and 0 <= point <= 1)
+            self.assertLessEqual(value, brute.min() + 1e-12)
+            self.assertAlmostEqual(MEC(alpha=1, beta=beta)(self.x, weights), value)
+
+    def test_batch_beta_near_one(self):
+        """Test that valid rows get finite values in batches with beta just above 1."""
+        weights = np.random.default_rng(2).dirichlet(np.ones(5), 50)
+        weights[7] = 0
+
+        for beta in [1.0001, 1.0005, 1.01]:
+            measure = MEC(alpha=1, beta=beta)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", RuntimeWarning)
+                values, points = measure.consensus_batch(self.x, weights)
+            valid = np.arange(50) != 7
+
+            self.assertTrue(np.all(np.isfinite(values[valid])) and np.isnan(values[7]))
+            for i in range(0, 50, 7):
+                if valid[i]:
+                    value, point = minimize_effort(self.x, weights[i], beta)
+                    self.assertAlmostEqual(values[i], value, places=12)
+                    self.assertAlmostEqual(points[i], point, places=8)
+
+    def test_warm_start(self):
+        """Test that a warm start does not change the solution."""
+        rng = np.random.default_rng(1)
+        
+        for beta in [1.05, 1.15, 1.5, 3.0]:
+            for _ in range(10):
+                coefficients = rng.random(5) ** 2
+                expected = minimize_effort(self.x, coefficients, beta)
+                for start in [0.0, 0.3, 0.5, 1.0, expected[1]]:
+                    self.assertEqual(minimize_effort(self.x, coefficients, beta, start=start),
+                                     expected)
+    
+    def test_consensus_in_original_units(self):
+        """Test that the consensus point is reported on the scale of x."""
+        x = np.array([1, 2, 3, 4, 5])
+        weights = np.array([0.0, 0.5, 0.0, 0.5, 0.0])
+        
+        _, point = MEC(alpha=1, beta=2).consensus(x, weights)
+        self.assertAlmostEqual(point, 3.0)
+    
+    def test_compute_batch(self):
+        """Test that compute_batch matches row-by-row evaluation."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.5, 0.0, 0.0, 0.0, 0.5],
+            [0.1, 0.2, 0.4, 0.2, 0.1],
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.4, 0.3, 0.2, 0.1, 0.0]
+        ])
+        
+        result = self.measure.compute_batch(self.x, weights)
+        expected = [self.measure(self.x, w) for w in weights]
+        np.testing.assert_array_almost_equal(result, expected, decimal=5)
+
+    def test_consensus_batch(self):
+        """Test that consensus_batch matches the scalar solver row by row."""
+        weights = np.array([
+            [0.1, 0.2, 0.05, 0.4, 0.25],
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, 0.0, 0.0, 0.0]
+        ])
+        
+        for alpha, beta in [(1, 1), (2, 1.15), (1, 2), (2, 3.0), (1, 0.5)]:
+            measure = MEC(alpha=alpha, beta=beta)
+            values, points = measure.consensus_batch(self.x, weights)
+            
+            for i in range(2):
+                value, point = measure.consensus(self.x, weights[i])
+                self.assertAlmostEqual(values[i], value, places=10)
+                self.assertAlmostEqual(points[i], point, places=6)
+            self.assertTrue(np.isnan(values[2]) and np.isnan(points[2]))
+
 class TestMECNormalized(unittest.TestCase):
     def setUp(self):
         self.measure = MECNormalized()
@@ -107,6 +225,17 @@ class TestMECNormalized(unittest.TestCase):
         # Should be close to 0 (minimum polarization)
         self.assertLess(result, 0.1)
     
+    def test_update_parameters(self):
+        """Test that updated parameters refresh the cached normalization constant."""
+        weights = np.array([0.1, 0.2, 0.4, 0.2, 0.1])
+        
+        self.measure.compute(self.x, weights)
+        self.measure.update_parameters(alpha=1.0, beta=2.0)
+        
+        result = self.measure.compute(self.x, weights)
+        expected = MECNormalized(alpha=1.0, beta=2.0).compute(self.x, weights)
+        self.assertAlmostEqual(result, expected)
+    
     def test_normalization_effect(self):
         """Test that normalization produces values in [0,1]."""
         # Generate various distributions
@@ -122,5 +251,19 @@ class TestMECNormalized(unittest.TestCase):
             result = self.measure.compute(self.x, weights)
             self.assertTrue(0 <= result <= 1)
 
+    def test_compute_batch(self):
+        """Test that compute_batch matches row-by-row evaluation."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.5, 0.0, 0.0, 0.0, 0.5],
+            [0.1, 0.2, 0.4, 0.2, 0.1],
+            [0.0, 0.0, 1.0, 0.0, 0.0],
+            [0.4, 0.3, 0.2, 0.1, 0.0]
+        ])
+        
+        result = self.measure.compute_batch(self.x, weights)
+        expected = [self.measure(self.x, w) for w in weights]
+        np.testing.assert_array_almost_equal(result, expected, decimal=5)
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 from src.measures.base import PolarizationMeasure, ParametricPolarizationMeasure
 from src.measures.thresholds import THRESHOLDS
+from src.measures.validation import validate_histogram
 
 class MockPolarizationMeasure(PolarizationMeasure):
     """A simple mock implementation for testing the base class."""
@@ -25,6 +26,13 @@ class TestPolarizationMeasure(unittest.TestCase):
         expected = self.measure.compute(self.x, self.weights)
         self.assertAlmostEqual(result, expected)
     
+    def test_call_with_histogram(self):
+        """Test that a validated Histogram can be passed directly."""
+        hist = validate_histogram(self.x, self.weights)
+        self.assertAlmostEqual(self.measure(hist), self.measure(self.x, self.weights))
+        self.assertAlmostEqual(self.measure(self.x, self.weights, trusted=True),
+                               self.measure(self.x, self.weights))
+    
     def test_measure_id(self):
         """Test that measure_id returns the class name by default."""
         self.assertEqual(self.measure.measure_id, "MockPolarizationMeasure")
@@ -42,6 +50,30 @@ class TestPolarizationMeasure(unittest.TestCase):
         # Mock a measure without parameter sets
         self.measure.measure_id = "BiPol"
         self.assertFalse(self.measure._has_parameter_sets())
+    
+    def test_compute_batch_fallback(self):
+        """Test the generic row-by-row compute_batch fallback."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.5, 0.0, 0.0, 0.0, 0.5]
+        ])
+        
+        result = self.measure.compute_batch(self.x, weights)
+        expected = [self.measure(self.x, w) for w in weights]
+        np.testing.assert_array_almost_equal(result, expected)
+    
+    def test_compute_batch_mask(self):
+        """Test that invalid rows are masked instead of raising."""
+        weights = np.array([
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+            [0.0, 0.0, 0.0, 0.0, 0.0],
+            [0.5, -0.1, 0.0, 0.0, 0.6]
+        ])
+        
+        result, valid = self.measure.compute_batch(self.x, weights, return_mask=True)
+        np.testing.assert_array_equal(valid, [True, False, False])
+        self.assertAlmostEqual(result[0], self.measure(self.x, weights[0]))
+        self.assertTrue(np.all(np.isnan(result[1:])))
 
 class TestParametricPolarizationMeasure(unittest.TestCase):
     def setUp(self):
@@ -59,6 +91,22 @@ class TestParametricPolarizationMeasure(unittest.TestCase):
         self.assertEqual(self.measure.parameters["factor"], 3.0)
         self.assertEqual(self.measure.parameters["new_param"], 1.0)
         
+    def test_constant_cache(self):
+        """Test that parameter-dependent constants are cached until parameters change."""
+        calls = []
+        
+        def factory():
+            calls.append(1)
+            return self.measure.parameters["factor"] * 10
+        
+        self.assertEqual(self.measure._constant("scale", factory), 20.0)
+        self.assertEqual(self.measure._constant("scale", factory), 20.0)
+        self.assertEqual(len(calls), 1)
+        
+        self.measure.update_parameters(factor=3.0)
+        self.assertEqual(self.measure._constant("scale", factory), 30.0)
+        self.assertEqual(len(calls), 2)
+        
     def test_get_parameters(self):
         """Test get_parameters returns a copy."""
         params = self.measure.get_parameters()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src.measures.chunked import compute_chunked
+from src.measures.suite import MeasureSuite
+from src.measures.metrics.literature import EMDPol, EstebanRay
+from src.measures.metrics.proposed import BiPol
+
+class TestComputeChunked(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        rng = np.random.default_rng(0)
+        self.x = np.arange(1, 6)
+        self.weights = rng.integers(0, 20, (1000, 5))
+        self.weights[[7, 512]] = 0
+        self.source = os.path.join(self.directory.name, "weights.npy")
+        np.save(self.source, self.weights)
+        self.output = os.path.join(self.directory.name, "values.npy")
+        self.measures = {'ER': EstebanRay(), 'EMD': EMDPol(), 'BiPol': BiPol()}
+
+    def test_matches_compute_batch(self):
+        """Test chunked evaluation of a .npy file against compute_batch."""
+        values = compute_chunked(self.source, self.x, self.measures, self.output, chunk_rows=128)
+        expected = MeasureSuite(self.measures).compute_batch(self.x, self.weights)
+
+        self.assertIsInstance(values, np.memmap)
+        np.testing.assert_array_equal(values, expected.values)
+        np.testing.assert_array_equal(np.load(self.output), expected.values)
+
+    def test_single_measure(self):
+        """Test that a single measure writes a one-dimensional output."""
+        source = np.load(self.source, mmap_mode="r")
+        values = compute_chunked(source, self.x, EMDPol(), self.output, chunk_rows=300)
+        np.testing.assert_array_equal(values, EMDPol().compute_batch(self.x, self.weights))
+
+    def test_resume(self):
+        """Test that an interrupted run continues after its last completed chunk."""
+        suite = MeasureSuite(self.measures)
+        compute_batch = MeasureSuite.compute_batch
+        calls = []
+
+        def interrupted(self, *args, **kwargs):
+            calls.append(1)
+            if len(calls) == 4:
+                raise RuntimeError("interrupted")
+            return compute_batch(self, *args, **kwargs)
+
+        with mock.patch.object(MeasureSuite, 'compute_batch', interrupted):
+            with self.assertRaises(RuntimeError):
+                compute_chunked(self.source, self.x, suite, self.output, chunk_rows=100)
+        self.assertEqual(len(calls), 4)
+
+        calls.clear()
+        with mock.patch.object(MeasureSuite, 'compute_batch',
+                               lambda *args, **kwargs: calls.append(1) or compute_batch(*args, **kwargs)):
+            values = compute_chunked(self.source, self.x, suite, self.output, chunk_rows=100)
+        self.assertEqual(len(calls), 7)
+        np.testing.assert_array_equal(values, suite.compute_batch(self.x, self.weights).values)
+
+        with self.assertRaises(ValueError):
+            compute_chunked(self.source, self.x, [EMDPol()], self.output)
+        values = compute_chunked(self.source, self.x, [EMDPol()], self.output, resume=False)
+        self.assertEqual(values.shape, (1000, 1))
+
+    def test_resume_checks_parameters_and_input(self):
+        """Test that resuming with other parameters, positions or input is refused."""
+        compute_batch = MeasureSuite.compute_batch
+        calls = []
+
+        def interrupted(self, *args, **kwargs):
+            calls.append(1)
+            if len(calls) == 3:
+                raise RuntimeError("interrupted")
+            return compute_batch(self, *args, **kwargs)
+
+        with mock.patch.object(MeasureSuite, 'compute_batch', interrupted):
+            with self.assertRaises(RuntimeError):
+                compute_chunked(self.source, self.x, EstebanRay(alpha=1.0), self.output,
+                                chunk_rows=250)
+
+        for measure, x in ((EstebanRay(alpha=1.6), self.x), (EstebanRay(alpha=1.0), self.x ** 2)):
+            with self.assertRaises(ValueError):
+                compute_chunked(self.source, x, measure, self.output, chunk_rows=250)
+        with self.assertRaises(ValueError):
+            compute_chunked(self.weights.astype(float), self.x, EstebanRay(alpha=1.0),
+                            self.output, chunk_rows=250)
+
+        np.save(self.source, self.weights[::-1])
+        with self.assertRaises(ValueError):
+            compute_chunked(self.source, self.x, EstebanRay(alpha=1.0), self.output, chunk_rows=250)
+        values = compute_chunked(self.source, self.x, EstebanRay(alpha=1.6), self.output,
+                                 chunk_rows=250, resume=False)
+        np.testing.assert_array_equal(
+            values, EstebanRay(alpha=1.6).compute_batch(self.x, self.weights[::-1]))
+
+if __name__ == "__main__":
+    unittest.main()
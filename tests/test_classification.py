@@ -314,5 +314,59 @@ class TestThresholdsComprehensive(unittest.TestCase):
                     param_set = param_measure_modified.find_matching_parameter_set()
                     self.assertIsNone(param_set)
 
+class TestBatchClassification(unittest.TestCase):
+    """Tests for compiled thresholds and vectorized classification."""
+    
+    def setUp(self):
+        self.measure = MockParametricMeasure(**THRESHOLDS["EstebanRay"]["_params"]["default"])
+        self.measure.measure_id = "EstebanRay"
+    
+    def test_classify_batch_matches_scalar(self):
+        """Test that batch codes agree with _classify_value, thresholds included."""
+        thresholds = THRESHOLDS["EstebanRay"]["default"]["percentile"][5]
+        values = np.concatenate([np.linspace(0, 1, 101), thresholds])
+        
+        codes, labels = self.measure.classify_batch(values, 5, method="percentile")
+        
+        self.assertEqual(codes.dtype, np.int8)
+        self.assertEqual(labels, CATEGORY_LABELS[5])
+        for value, code in zip(values, codes):
+            self.assertEqual(labels[code],
+                             self.measure._classify_value(value, 5, "percentile", "default"))
+    
+    def test_classify_batch_nan(self):
+        """Test that NaN values (invalid rows) get code -1."""
+        codes, _ = self.measure.classify_batch(np.array([[0.1, np.nan], [0.9, 0.45]]), 3)
+        np.testing.assert_array_equal(codes, [[0, -1], [2, 1]])
+    
+    def test_classify_batch_without_thresholds(self):
+        """Test that unmatched parameters raise ValueError."""
+        self.measure.update_parameters(alpha=1.2)
+        with self.assertRaises(ValueError):
+            self.measure.classify_batch(np.array([0.5]), 3)
+    
+    def test_parameter_set_cached(self):
+        """Test that the parameter set is resolved once and invalidated on updates."""
+        self.assertEqual(self.measure._resolve_parameter_set(), "default")
+        self.measure.parameters["alpha"] = 1.2
+        self.assertEqual(self.measure._resolve_parameter_set(), "default")
+        
+        self.measure.update_parameters(alpha=1.2)
+        self.assertIsNone(self.measure._resolve_parameter_set())
+        
+        self.measure.update_parameters(alpha=0.8)
+        self.assertEqual(self.measure._resolve_parameter_set(), "default")
+        
+        self.measure.measure_id = "BiPol"
+        self.assertIsNone(self.measure._resolve_parameter_set())
+    
+    def test_thresholds_compiled_once(self):
+        """Test that threshold arrays are compiled once and read-only."""
+        first = self.measure._threshold_array(3, "kmeans", "default")
+        
+        self.assertIs(first, self.measure._threshold_array(3, "kmeans", "default"))
+        self.assertFalse(first.flags.writeable)
+        np.testing.assert_array_equal(first, THRESHOLDS["EstebanRay"]["default"]["kmeans"][3])
+
 if __name__ == "__main__":
     unittest.main()
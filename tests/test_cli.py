@@ -0,0 +1,171 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src.measures.cli import main, parse_measure, parse_suite
+from src.measures.columnar import iter_record_batches, write_columns
+from src.measures.groupby import group_by
+from src.measures.suite import MeasureSuite
+from src.measures.metrics.literature import EMDPol, EstebanRay
+from src.measures.metrics.proposed import BiPol, MEC
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        rng = np.random.default_rng(0)
+        self.counts = rng.integers(0, 20, (500, 5)).astype(float)
+        self.counts[3] = 0
+        self.bins = [f'c{k}' for k in range(5)]
+        self.table = {'id': np.arange(500), **{name: self.counts[:, k]
+                                               for k, name in enumerate(self.bins)}}
+        self.x = np.arange(5)
+        self.suite = MeasureSuite({'ER': EstebanRay(), 'EMD': EMDPol(), 'BiPol': BiPol()})
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def run_main(self, *argv):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            status = main(list(argv))
+        return status, stdout.getvalue()
+
+    def read(self, path, numeric=()):
+        return {name: np.concatenate([batch[name] for batch in batches])
+                for batches in [list(iter_record_batches(path, numeric=numeric))]
+                for name in batches[0]}
+
+    def test_parse_measure(self):
+        """Test measure specs with parameters and column names."""
+        measure = parse_measure('MEC:alpha=1,beta=1.5')
+        self.assertIsInstance(measure, MEC)
+        self.assertEqual(measure.parameters, {'alpha': 1, 'beta': 1.5})
+        self.assertEqual(parse_suite(['ER16=ER:alpha=1.6', 'EMD']).names, ['ER16', 'EMD'])
+        self.assertEqual(parse_suite(['ER:alpha=1.6']).names, ['ER:alpha=1.6'])
+        for spec in ('Gini', 'ER:alpha', 'ER:gamma=2'):
+            with self.assertRaises(ValueError):
+                parse_measure(spec)
+
+    def test_score_histograms(self):
+        """Test scoring a histogram table against MeasureSuite, keeping the id column."""
+        write_columns(self.path('counts.csv'), self.table)
+        status, _ = self.run_main('score', self.path('counts.csv'), '--columns', ','.join(self.bins),
+                                  '--keep', 'id', '-m', 'ER', '-m', 'EMD', '-m', 'BiPol',
+                                  '--chunk-rows', '128', '--num-categories', '3',
+                                  '-o', self.path('values.npz'))
+        self.assertEqual(status, 0)
+
+        expected = self.suite.compute_batch(self.x, self.counts)
+        with np.load(self.path('values.npz')) as values:
+            np.testing.assert_array_equal(values['id'], np.arange(500).astype(str))
+            np.testing.assert_allclose(values['ER'], expected['ER'])
+            np.testing.assert_allclose(values['BiPol'], expected['BiPol'])
+            self.assertNotIn('EMD category', values)
+            codes, labels = BiPol().classify_batch(expected['BiPol'], 3)
+            np.testing.assert_array_equal(values['BiPol category'][codes >= 0],
+                                          np.array(labels)[codes[codes >= 0]])
+            self.assertEqual(values['ER category'][3], '')
+
+    def test_score_stdin(self):
+        """Test streaming CSV from stdin to stdout with a process executor."""
+        text = io.StringIO()
+        write_columns(text, self.table)
+        with mock.patch('sys.stdin', io.StringIO(text.getvalue())):
+            status, output = self.run_main('score', '-', '--columns', ','.join(self.bins),
+                                           '-m', 'ER', '--x', '1,2,3,4,5', '--chunk-rows', '100',
+                                           '--executor', 'processes', '--workers', '2')
+        lines = output.splitlines()
+        self.assertEqual(lines[0], 'ER')
+        self.assertEqual(len(lines), 501)
+        np.testing.assert_allclose(np.array(lines[1:], dtype=float),
+                                   EstebanRay().compute_batch(np.arange(1, 6), self.counts))
+
+    def test_score_npy(self):
+        """Test that .npy to .npy scoring runs through compute_chunked."""
+        np.save(self.path('counts.npy'), self.counts)
+        self.run_main('score', self.path('counts.npy'), '-m', 'ER', '-m', 'EMD', '-m', 'BiPol',
+                      '-o', self.path('values.npy'), '--chunk-rows', '64')
+        np.testing.assert_allclose(np.load(self.path('values.npy')),
+                                   self.suite.compute_batch(self.x, self.counts).values)
+        self.assertTrue(os.path.exists(self.path('values.npy.progress')))
+
+    def test_score_responses(self):
+        """Test respondent-level input against group_by."""
+        rng = np.random.default_rng(1)
+        country = rng.choice(np.array(['CO', 'MX']), 1000)
+        answers = rng.integers(1, 6, 1000).astype(float)
+        answers[rng.random(1000) < 0.05] = 9
+        write_columns(self.path('answers.csv'), {'country': country, 'q1': answers})
+
+        self.run_main('score', self.path('answers.csv'), '--responses', '--columns', 'q1',
+                      '--categories', '1,2,3,4,5', '--keys', 'country', '--missing', '9',
+                      '-m', 'ER', '-m', 'BiPol', '--chunk-rows', '300', '-o', self.path('out.csv'))
+        expected = group_by({'country': country}, answers, {'ER': EstebanRay(), 'BiPol': BiPol()},
+                            categories=np.arange(1, 6), missing=9)
+        values = self.read(self.path('out.csv'), ['total', 'ER', 'BiPol'])
+        np.testing.assert_array_equal(values['country'], ['CO', 'MX'])
+        np.testing.assert_allclose(values['total'], expected.totals)
+        np.testing.assert_allclose(values['ER'], expected['ER'])
+
+    def test_classify(self):
+        """Test classifying a scored file."""
+        values = self.suite.compute_batch(self.x, self.counts)
+        write_columns(self.path('values.csv'), {'id': np.arange(500), **values.as_dict()})
+        self.run_main('classify', self.path('values.csv'), '-m', 'ER', '-m', 'BiPol',
+                      '--num-categories', '4', '--method', 'percentile', '-o', self.path('out.csv'))
+        out = self.read(self.path('out.csv'), ['id'])
+        codes, labels = EstebanRay().classify_batch(values['ER'], 4, 'percentile')
+        np.testing.assert_array_equal(out['ER category'][codes >= 0],
+                                      np.array(labels)[codes[codes >= 0]])
+        np.testing.assert_array_equal(out['id'], np.arange(500))
+
+    def test_string_keys(self):
+        """Test that zero-padded ids and empty keys in CSV input stay strings."""
+        ids = np.array([f'{i:03d}' for i in range(500)])
+        write_columns(self.path('counts.csv'), {**self.table, 'id': ids})
+        self.run_main('score', self.path('counts.csv'), '--columns', ','.join(self.bins),
+                      '--keep', 'id', '-m', 'ER', '-o', self.path('values.npz'))
+        with np.load(self.path('values.npz')) as values:
+            np.testing.assert_array_equal(values['id'], ids)
+
+        country = np.array(['CO', '', '07', '', 'CO', '07'])
+        write_columns(self.path('answers.csv'), {'country': country,
+                                                 'q1': np.array([1., 2, 3, 3, 2, 1])})
+        self.run_main('score', self.path('answers.csv'), '--responses', '--columns', 'q1',
+                      '--categories', '1,2,3', '--keys', 'country', '-m', 'ER',
+                      '-o', self.path('out.npz'))
+        with np.load(self.path('out.npz')) as values:
+            np.testing.assert_array_equal(values['country'], ['', '07', 'CO'])
+            np.testing.assert_allclose(values['total'], [2, 2, 2])
+
+    def test_errors(self):
+        """Test that bad input exits with status 2 and a message."""
+        write_columns(self.path('counts.csv'), self.table)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as raised:
+            self.run_main('score', self.path('counts.csv'), '-m', 'Gini', '--columns', 'c0')
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn('Unknown measure', stderr.getvalue())
+
+    def test_broken_pipe(self):
+        """Test that a closed stdout ends the command quietly."""
+        write_columns(self.path('counts.csv'), self.table)
+        stderr = io.StringIO()
+        with mock.patch('src.measures.cli.SuiteResult.as_dict', side_effect=BrokenPipeError), \
+                contextlib.redirect_stderr(stderr):
+            status, _ = self.run_main('score', self.path('counts.csv'),
+                                      '--columns', ','.join(self.bins), '-m', 'ER')
+        self.assertEqual(status, 1)
+        self.assertEqual(stderr.getvalue(), '')
+
+    def test_bench(self):
+        status, output = self.run_main('bench', '--rows', '200', '--repeat', '1', '-m', 'ER')
+        self.assertEqual(status, 0)
+        self.assertIn('suite', output)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+import zipfile
+import numpy as np
+from src.measures import columnar
+from src.measures.columnar import (histograms_from_file, iter_record_batches, write_columns,
+                                   HistogramTable)
+from src.measures.groupby import group_by
+from src.measures.suite import MeasureSuite
+from src.measures.metrics.literature import EMDPol, EstebanRay
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        rng = np.random.default_rng(0)
+        n = 3000
+        self.columns = {
+            'country': rng.choice(np.array(['CO', 'MX', 'AR']), n),
+            'q1': rng.integers(1, 6, n).astype(float),
+            'q2': rng.integers(1, 6, n).astype(float),
+            'weight': rng.uniform(0.5, 2, n),
+        }
+        self.columns['q1'][rng.random(n) < 0.05] = 9
+        self.columns['q2'][rng.random(n) < 0.05] = np.nan
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def expected(self, item, keys=None):
+        """Weighted counts of one answer column, per country in key order when keys."""
+        answers = self.columns[item]
+        counts = []
+        for country in (['AR', 'CO', 'MX'] if keys else [None]):
+            rows = np.isin(answers, np.arange(1, 6))
+            if country is not None:
+                rows &= self.columns['country'] == country
+            counts.append(np.bincount(answers[rows].astype(int) - 1,
+                                      weights=self.columns['weight'][rows], minlength=5))
+        return np.array(counts)
+
+    def test_round_trip(self):
+        """Test that written columns stream back in batches for CSV and NPZ."""
+        for name in ('data.csv', 'data.npz'):
+            write_columns(self.path(name), self.columns)
+            batches = list(iter_record_batches(self.path(name), ['q2', 'country'], batch_rows=1000,
+                                               numeric=['q2']))
+
+            self.assertEqual(len(batches), 3)
+            self.assertEqual(list(batches[0]), ['q2', 'country'])
+            np.testing.assert_array_equal(np.concatenate([b['q2'] for b in batches]),
+                                          self.columns['q2'])
+            np.testing.assert_array_equal(np.concatenate([b['country'] for b in batches]),
+                                          self.columns['country'])
+
+    def test_npz_memory_mapped(self):
+        """Test that uncompressed NPZ members are memory-mapped and compressed ones read."""
+        np.savez(self.path('stored.npz'), **self.columns)
+        np.savez_compressed(self.path('compressed.npz'), **self.columns)
+        with zipfile.ZipFile(self.path('stored.npz')) as archive:
+            array = columnar._npz_member(self.path('stored.npz'), archive, 'weight')
+        self.assertIsInstance(array, np.memmap)
+        np.testing.assert_array_equal(array, self.columns['weight'])
+
+        batch = next(iter_record_batches(self.path('compressed.npz'), ['weight']))
+        np.testing.assert_array_equal(batch['weight'], self.columns['weight'])
+
+    def test_histograms(self):
+        """Test one histogram per answer column, and per key and column."""
+        write_columns(self.path('data.csv'), self.columns)
+        table = histograms_from_file(self.path('data.csv'), ['q1', 'q2'], np.arange(1, 6),
+                                     weights='weight', missing=9, batch_rows=700)
+
+        self.assertIsInstance(table, HistogramTable)
+        self.assertEqual(list(table.keys['item']), ['q1', 'q2'])
+        np.testing.assert_allclose(table.totals, [self.expected('q1').sum(),
+                                                  self.expected('q2').sum()])
+        np.testing.assert_allclose(table.batch.weights[0], self.expected('q1')[0]
+                                   / self.expected('q1').sum())
+
+        table = histograms_from_file(self.path('data.csv'), ['q1', 'q2'], np.arange(1, 6),
+                                     keys=['country'], weights='weight', missing=9,
+                                     batch_rows=700)
+        self.assertEqual(list(table.keys['country']), ['AR', 'AR', 'CO', 'CO', 'MX', 'MX'])
+        self.assertEqual(list(table.keys['item']), ['q1', 'q2'] * 3)
+        np.testing.assert_allclose(table.totals[0::2], self.expected('q1', True).sum(axis=1))
+        np.testing.assert_allclose(table.totals[1::2], self.expected('q2', True).sum(axis=1))
+
+        measures = {'ER': EstebanRay(), 'EMD': EMDPol()}
+        result = group_by({'country': self.columns['country']}, self.columns['q1'], measures,
+                          categories=np.arange(1, 6), weights=self.columns['weight'], missing=9)
+        values = MeasureSuite(measures).compute_batch(table.batch)
+        np.testing.assert_allclose(values.values[0::2], result.values)
+
+    def test_labels(self):
+        """Test that text answers are coded by their position in labels."""
+        labels = np.array(['Disagree', 'Neutral', 'Agree'])
+        answers = np.array(['Agree', 'Neutral', 'No answer', 'Agree', '', 'Disagree'])
+        write_columns(self.path('text.csv'), {'q': answers, 'g': np.array([1, 1, 1, 2, 2, 2])})
+
+        table = histograms_from_file(self.path('text.csv'), ['q'], labels=labels, keys=['g'],
+                                     missing='No answer', batch_rows=4)
+        np.testing.assert_array_equal(table.batch.weights * table.totals[:, None],
+                                      [[0, 1, 1], [1, 0, 1]])
+        np.testing.assert_array_equal(table.keys['g'], ['1', '2'])
+
+        with self.assertRaises(ValueError):
+            histograms_from_file(self.path('text.csv'), ['q'], labels=labels)
+        with self.assertRaises(ValueError):
+            histograms_from_file(self.path('text.csv'), ['q'])
+
+    def test_write_results(self):
+        """Test writing a result table with category labels as NPZ."""
+        result = group_by({'country': self.columns['country']}, self.columns['q1'],
+                          {'ER': EstebanRay()}, categories=np.arange(1, 6), missing=9)
+        write_columns(self.path('result.npz'), result.as_dict())
+        with np.load(self.path('result.npz')) as stored:
+            np.testing.assert_array_equal(stored['ER'], result['ER'])
+            np.testing.assert_array_equal(stored['country'], ['AR', 'CO', 'MX'])
+
+    @unittest.skipIf(columnar.pyarrow is None, "pyarrow is not installed")
+    def test_parquet(self):
+        """Test histograms from Parquet and Arrow files against CSV."""
+        write_columns(self.path('data.csv'), self.columns)
+        expected = histograms_from_file(self.path('data.csv'), ['q1', 'q2'], np.arange(1, 6),
+                                        keys=['country'], weights='weight', missing=9)
+        for name in ('data.parquet', 'data.arrow'):
+            write_columns(self.path(name), self.columns)
+            table = histograms_from_file(self.path(name), ['q1', 'q2'], np.arange(1, 6),
+                                         keys=['country'], weights='weight', missing=9,
+                                         batch_rows=500)
+            np.testing.assert_allclose(table.batch.weights, expected.batch.weights)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            write_columns(self.path('data.xlsx'), self.columns)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import pickle
+import unittest
+import numpy as np
+from src.measures.executors import ProcessExecutor, ThreadExecutor, get_executor
+from src.measures.histograms import HistogramBatch
+from src.measures.suite import MeasureSuite
+from src.measures.metrics.literature import EMDPol, EstebanRay
+from src.measures.metrics.proposed import BiPol, MEC
+
+class TestExecutors(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executors = [ThreadExecutor(2, chunk_rows=64),
+                         ProcessExecutor(2, chunk_rows=64),
+                         ProcessExecutor(2, chunk_rows=64, shared_memory=False)]
+
+    @classmethod
+    def tearDownClass(cls):
+        for executor in cls.executors:
+            executor.shutdown()
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.arange(1, 6)
+        self.weights = rng.integers(0, 20, (500, 5))
+        self.weights[[3, 200]] = 0
+        self.suite = MeasureSuite({'ER': EstebanRay(), 'EMD': EMDPol(), 'BiPol': BiPol(), 'MEC': MEC()})
+
+    def test_matches_serial(self):
+        """Test that every executor reproduces the serial results in input order."""
+        expected = self.suite.compute_batch(self.x, self.weights)
+
+        for executor in self.executors:
+            with self.subTest(executor=type(executor).__name__):
+                result = self.suite.compute_batch(self.x, self.weights, executor=executor)
+                np.testing.assert_array_equal(result.values, expected.values)
+                np.testing.assert_array_equal(result.valid, expected.valid)
+
+                values, valid = MEC().compute_batch(self.x, self.weights, return_mask=True,
+                                                    executor=executor)
+                np.testing.assert_array_equal(values, expected['MEC'])
+                np.testing.assert_array_equal(valid, expected.valid)
+
+    def test_batches_and_row_grids(self):
+        """Test HistogramBatch inputs and per-row grids."""
+        batch = HistogramBatch(self.x, self.weights)
+        grids = np.tile(self.x, (len(self.weights), 1))
+        expected = EstebanRay().compute_batch(batch)
+
+        for executor in self.executors:
+            with self.subTest(executor=type(executor).__name__):
+                np.testing.assert_array_equal(
+                    EstebanRay().compute_batch(batch, executor=executor), expected)
+                np.testing.assert_array_almost_equal(
+                    EstebanRay().compute_batch(grids, self.weights, executor=executor), expected)
+
+    def test_get_executor(self):
+        """Test resolving the executor option."""
+        self.assertIsNone(get_executor(None))
+        self.assertIs(get_executor("threads"), get_executor("threads"))
+        self.assertIsInstance(get_executor("processes"), ProcessExecutor)
+        with self.assertRaises(ValueError):
+            get_executor("gpu")
+
+    def test_pickled_measure_classifies(self):
+        """Test that a pickled measure still resolves its thresholds."""
+        measure = pickle.loads(pickle.dumps(EstebanRay()))
+        codes, _ = measure.classify_batch(np.array([0.1, 0.9]), 3)
+        self.assertEqual(codes.shape, (2,))
+
+if __name__ == "__main__":
+    unittest.main()
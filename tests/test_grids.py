@@ -0,0 +1,25 @@
+import unittest
+import numpy as np
+from src.measures.utils.grids import distance_matrix, clear_distance_cache
+
+class TestDistanceMatrix(unittest.TestCase):
+    def setUp(self):
+        clear_distance_cache()
+        self.x = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+    
+    def test_values(self):
+        """Test the pairwise distances."""
+        expected = np.abs(self.x[:, None] - self.x[None, :])
+        np.testing.assert_array_almost_equal(distance_matrix(self.x), expected)
+    
+    def test_cached_per_grid(self):
+        """Test that equal grids share one read-only matrix."""
+        first = distance_matrix(self.x)
+        second = distance_matrix(self.x.copy())
+        
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+        self.assertIsNot(first, distance_matrix(np.linspace(0, 1, 7)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+from src.measures.groupby import group_by, factorize_keys, GroupByResult
+from src.measures.metrics.literature import EMDPol, EstebanRay
+from src.measures.metrics.proposed import BiPol
+
+class TestGroupBy(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 5000
+        self.country = rng.choice(np.array(['CO', 'MX', 'AR']), n)
+        self.item = rng.integers(0, 20, n)
+        self.answers = rng.integers(1, 6, n)
+        self.answers[rng.random(n) < 0.05] = 9
+        self.weights = rng.uniform(0.5, 2, n)
+        self.measures = {'ER': EstebanRay(), 'EMD': EMDPol(), 'BiPol': BiPol()}
+
+    def test_matches_per_group(self):
+        """Test that every group equals the measure on its own histogram."""
+        result = group_by({'country': self.country, 'item': self.item}, self.answers,
+                          self.measures, categories=np.arange(1, 6),
+                          weights=self.weights, missing=9)
+
+        self.assertIsInstance(result, GroupByResult)
+        self.assertEqual(len(result), 60)
+        self.assertEqual(list(result.keys), ['country', 'item'])
+        self.assertEqual(list(result['country'][:2]), ['AR', 'AR'])
+        np.testing.assert_array_equal(result['item'][:2], [0, 1])
+
+        for g in range(len(result)):
+            rows = ((self.country == result['country'][g]) & (self.item == result['item'][g])
+                    & (self.answers != 9))
+            counts = np.bincount(self.answers[rows] - 1, weights=self.weights[rows], minlength=5)
+            self.assertAlmostEqual(result.totals[g], counts.sum())
+            for name, measure in self.measures.items():
+                self.assertAlmostEqual(result[name][g], measure(np.arange(1, 6), counts))
+
+    def test_classification(self):
+        """Test that measures with thresholds are classified and the others skipped."""
+        result = group_by([self.country], self.answers, self.measures,
+                          missing=9, num_categories=3)
+
+        self.assertEqual(set(result.classes), {'ER', 'BiPol'})
+        codes, labels = BiPol().classify_batch(result['BiPol'], 3)
+        np.testing.assert_array_equal(result.classes['BiPol'], codes)
+
+        columns = result.as_dict()
+        self.assertEqual(list(columns)[:2], ['key0', 'total'])
+        self.assertEqual(columns['ER category'][0], labels[result.classes['ER'][0]])
+
+    def test_invalid_groups(self):
+        """Test that groups with only missing answers are flagged invalid."""
+        keys = np.array([0, 0, 1, 1, 2])
+        result = group_by(keys, np.array([1, 5, 9, 9, 3]), self.measures,
+                          categories=np.arange(1, 6), missing=9)
+
+        np.testing.assert_array_equal(result.valid, [True, False, True])
+        self.assertTrue(np.all(np.isnan(result.values[1])))
+        np.testing.assert_array_equal(result.totals, [2, 0, 1])
+
+    def test_factorize_wide_keys(self):
+        """Test factorizing keys whose cardinalities overflow a combined int64 code."""
+        rng = np.random.default_rng(1)
+        keys = {f'k{i}': rng.integers(0, 2 ** 20, 1000) for i in range(4)}
+        groups, columns = factorize_keys(keys)
+
+        self.assertEqual(groups.max() + 1, columns['k0'].size)
+        for name, key in keys.items():
+            np.testing.assert_array_equal(columns[name][groups], key)
+        order = np.lexsort([columns[name] for name in reversed(list(keys))])
+        np.testing.assert_array_equal(order, np.arange(order.size))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import numpy as np
+from src.measures.histograms import Grid, HistogramBatch
+from src.measures.validation import Histogram
+from src.measures.metrics.literature import EMDPol, EstebanRay, Experts, ShannonPol, VanDerEijkPol
+from src.measures.metrics.proposed import BiPol, MEC
+
+class TestGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid(np.array([1, 2, 4, 5]))
+
+    def test_normalized_once(self):
+        """Test that positions are normalized and read-only."""
+        np.testing.assert_array_almost_equal(self.grid.x, [0.0, 0.25, 0.75, 1.0])
+        self.assertFalse(self.grid.x.flags.writeable)
+        self.assertEqual(len(self.grid), 4)
+
+    def test_cached_quantities(self):
+        """Test that spacing and distances are computed once."""
+        np.testing.assert_array_almost_equal(self.grid.spacing, [0.25, 0.5, 0.25])
+        self.assertIs(self.grid.spacing, self.grid.spacing)
+        np.testing.assert_array_almost_equal(
+            self.grid.distances, np.abs(self.grid.x[:, None] - self.grid.x[None, :]))
+        self.assertIs(self.grid.distances, self.grid.distances)
+
+    def test_histogram(self):
+        """Test validating weights on a grid."""
+        hist = self.grid.histogram(np.array([1, 1, 0, 2]))
+        self.assertIsInstance(hist, Histogram)
+        self.assertIs(hist.x, self.grid.x)
+        np.testing.assert_array_almost_equal(hist.weights, [0.25, 0.25, 0.0, 0.5])
+
+        with self.assertRaises(ValueError):
+            self.grid.histogram(np.array([1, 1, 1]))
+        with self.assertRaises(ValueError):
+            self.grid.histogram(np.array([1, -1, 1, 1]))
+
+    def test_invalid_grid(self):
+        """Test that unsorted or too short grids are rejected."""
+        with self.assertRaises(ValueError):
+            Grid(np.array([0.0, 1.0, 0.5]))
+        with self.assertRaises(ValueError):
+            Grid(np.array([0.0]))
+
+class TestHistogramBatch(unittest.TestCase):
+    def setUp(self):
+        self.x = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+        self.weights = np.array([
+            [1, 1, 1, 1, 1],
+            [5, 0, 0, 0, 5],
+            [0, 0, 0, 0, 0],
+            [4, 3, 2, 1, 0]
+        ])
+        self.batch = HistogramBatch(self.x, self.weights)
+
+    def test_validated(self):
+        """Test that rows are normalized and invalid rows flagged."""
+        np.testing.assert_array_equal(self.batch.valid, [True, True, False, True])
+        np.testing.assert_array_almost_equal(self.batch.weights[1], [0.5, 0, 0, 0, 0.5])
+        self.assertTrue(self.batch.weights.flags.c_contiguous)
+        self.assertEqual(self.batch.shape, (4, 5))
+
+    def test_cached_quantities(self):
+        """Test the shared derived quantities."""
+        W = self.batch.weights
+        np.testing.assert_array_almost_equal(self.batch.cdf, np.cumsum(W, axis=1))
+        np.testing.assert_array_almost_equal(self.batch.mean, W @ self.x)
+        np.testing.assert_array_almost_equal(self.batch.power(1.8), W ** 1.8)
+
+        self.assertIs(self.batch.cdf, self.batch.cdf)
+        self.assertIs(self.batch.mean, self.batch.mean)
+        self.assertIs(self.batch.power(2), self.batch.power(2.0))
+
+    def test_float32_storage(self):
+        """Test that float32 storage keeps the values close."""
+        batch = HistogramBatch(self.x, self.weights, dtype=np.float32)
+        self.assertEqual(batch.weights.dtype, np.float32)
+        self.assertEqual(batch.mean.dtype, np.float64)
+
+        with self.assertRaises(ValueError):
+            HistogramBatch(self.x, self.weights, dtype=np.int64)
+
+    def test_select(self):
+        """Test that selected rows share the grid."""
+        subset = self.batch.select(self.batch.valid)
+        self.assertEqual(len(subset), 3)
+        self.assertIs(subset.grid, self.batch.grid)
+
+    def test_measures_accept_batch(self):
+        """Test that every measure gives the same values on a HistogramBatch."""
+        measures = [EMDPol(), EstebanRay(), Experts(), ShannonPol(),
+                    VanDerEijkPol(), BiPol(), MEC()]
+        grid = Grid(self.x)
+
+        for measure in measures:
+            expected = measure.compute_batch(self.x, self.weights)
+            values, valid = measure.compute_batch(self.batch, return_mask=True)
+
+            np.testing.assert_array_almost_equal(values, expected)
+            np.testing.assert_array_equal(valid, self.batch.valid)
+            np.testing.assert_array_almost_equal(
+                measure.compute_batch(grid.batch(self.weights, dtype=np.float32)),
+                expected, decimal=6)
+            np.testing.assert_array_almost_equal(
+                measure.compute_batch(grid, self.weights), expected)
+            self.assertAlmostEqual(measure(grid, self.weights[3]), expected[3])
+
+if __name__ == "__main__":
+    unittest.main()
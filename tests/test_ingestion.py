@@ -0,0 +1,98 @@
+import unittest
+from unittest import mock
+import numpy as np
+from src.measures.ingestion import ResponseCounter, histogram_from_responses, batch_from_responses
+
+class TestResponseCounter(unittest.TestCase):
+    def setUp(self):
+        self.categories = np.arange(1, 6)
+        self.responses = np.array([1, 2, 2, 5, 9, 3, 5, 5])
+    
+    def test_counts(self):
+        """Test unweighted counts with a missing code."""
+        counter = ResponseCounter(self.categories, missing=9).add(self.responses)
+        np.testing.assert_array_equal(counter.counts, [1, 2, 1, 0, 3])
+    
+    def test_chunks_accumulate(self):
+        """Test that counting in chunks equals counting at once."""
+        weights = np.linspace(0.5, 2, self.responses.size)
+        whole = ResponseCounter(self.categories, missing=9).add(self.responses, weights)
+        chunked = ResponseCounter(self.categories, missing=9)
+        for start in range(0, self.responses.size, 3):
+            chunked.add(self.responses[start:start + 3], weights[start:start + 3])
+        
+        np.testing.assert_array_almost_equal(chunked.counts, whole.counts)
+        expected = np.bincount(self.responses[self.responses != 9] - 1,
+                               weights=weights[self.responses != 9], minlength=5)
+        np.testing.assert_array_almost_equal(whole.counts, expected)
+    
+    def test_unknown_response(self):
+        """Test that responses outside the scale raise ValueError."""
+        with self.assertRaises(ValueError):
+            ResponseCounter(self.categories).add(self.responses)
+        with self.assertRaises(ValueError):
+            ResponseCounter(self.categories).add(np.array([1.5]))
+    
+    def test_negative_weights(self):
+        """Test that negative survey weights raise ValueError."""
+        with self.assertRaises(ValueError):
+            ResponseCounter(self.categories).add(np.array([1, 2]), np.array([1.0, -1.0]))
+    
+    def test_rows_grow(self):
+        """Test that a multi-histogram counter grows with the row indices."""
+        counter = ResponseCounter(self.categories, n_rows=1)
+        counter.add(np.array([1, 2]), rows=np.array([0, 0]))
+        counter.add(np.array([5, 4]), rows=np.array([2, 2]))
+        
+        np.testing.assert_array_equal(counter.counts, [[1, 1, 0, 0, 0],
+                                                       [0, 0, 0, 0, 0],
+                                                       [0, 0, 0, 1, 1]])
+        batch = counter.batch()
+        np.testing.assert_array_equal(batch.valid, [True, False, True])
+
+class TestIngestionFunctions(unittest.TestCase):
+    def test_histogram_from_float_responses(self):
+        """Test float responses with NaN and inferred categories."""
+        responses = np.array([0.0, 0.5, np.nan, 1.0, 0.5, 0.5])
+        hist = histogram_from_responses(responses, chunk_size=2)
+        
+        np.testing.assert_array_almost_equal(hist.x, [0.0, 0.5, 1.0])
+        np.testing.assert_array_almost_equal(hist.weights, [0.2, 0.6, 0.2])
+    
+    def test_histogram_from_weighted_codes(self):
+        """Test integer codes on a non-contiguous scale with survey weights."""
+        responses = np.array([0, 10, 10, -1])
+        weights = np.array([3.0, 0.5, 0.5, 7.0])
+        hist = histogram_from_responses(responses, categories=np.array([0, 5, 10]),
+                                        weights=weights, missing=-1)
+        
+        np.testing.assert_array_almost_equal(hist.weights, [0.75, 0.0, 0.25])
+    
+    def test_batch_from_responses(self):
+        """Test one histogram per row index."""
+        rows = np.array([0, 0, 1, 1, 1, 3])
+        responses = np.array([1, 5, 2, 2, 4, 3])
+        batch = batch_from_responses(rows, responses, categories=np.arange(1, 6),
+                                     n_rows=5, chunk_size=4)
+        
+        self.assertEqual(batch.shape, (5, 5))
+        np.testing.assert_array_equal(batch.valid, [True, True, False, True, False])
+        np.testing.assert_array_almost_equal(batch.weights[1], [0, 2/3, 0, 1/3, 0])
+
+        with self.assertRaises(ValueError):
+            batch_from_responses(rows, responses, categories=np.arange(1, 6), n_rows=3)
+        self.assertEqual(batch_from_responses(rows, responses, categories=np.arange(1, 6)).shape,
+                         (4, 5))
+
+    def test_categories_inferred_by_chunk(self):
+        """Test that inferred categories never sort the whole input at once."""
+        responses = np.array([3.0, 9, 1, np.nan, 3, 7, 1, 9])
+        with mock.patch('numpy.unique', wraps=np.unique) as unique:
+            hist = histogram_from_responses(responses, missing=9, chunk_size=3)
+
+        self.assertTrue(all(call.args[0].size < responses.size for call in unique.call_args_list))
+        np.testing.assert_array_almost_equal(hist.x, [0, 1/3, 1])
+        np.testing.assert_array_almost_equal(hist.weights, [2/5, 2/5, 1/5])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from unittest import mock
+import numpy as np
+from src.measures.utils import jit, kernels
+from src.measures.histograms import HistogramBatch
+from src.measures.suite import MeasureSuite
+from src.measures.metrics.literature import EMDPol, EstebanRay, Experts, ShannonPol, VanDerEijkPol
+from src.measures.metrics.proposed import BiPol, MEC
+from src.measures.metrics.proposed.mec import MECNormalized
+
+class TestKernels(unittest.TestCase):
+    """
+    The kernels run as plain Python when numba is not installed, so these tests
+    check them against the NumPy kernels either way.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.arange(1, 6)
+        self.weights = rng.integers(0, 20, (60, 5)).astype(float)
+        self.weights[:10, 1:4] = 0
+        self.weights[10] = [0, 0, 7, 0, 0]
+        self.weights[11] = [0, 3, 3, 0, 0]
+        self.weights[12] = 0
+        self.measures = {
+            'EMD': EMDPol(), 'ER': EstebanRay(), 'ER(1.6)': EstebanRay(alpha=1.6),
+            'Experts': Experts(), 'Shannon': ShannonPol(), 'VanDerEijk': VanDerEijkPol(),
+            'BiPol': BiPol(), 'MEC': MEC(), 'MEC(1,2)': MEC(alpha=1, beta=2),
+            'MEC(1,1)': MEC(alpha=1, beta=1), 'MEC(2,0.7)': MEC(beta=0.7),
+            'MEC(2,1.15)N': MECNormalized()
+        }
+        self.suite = MeasureSuite(self.measures)
+        self.addCleanup(jit.set_enabled, jit.enabled())
+
+    def test_match_numpy_kernels(self):
+        """Test every compiled path against the NumPy kernels."""
+        jit.set_enabled(False)
+        expected = self.suite.compute_batch(self.x, self.weights)
+        expected_batch = self.suite.compute_batch(HistogramBatch(self.x, self.weights))
+
+        with mock.patch.object(jit, '_ENABLED', True):
+            result = self.suite.compute_batch(self.x, self.weights)
+            result_batch = self.suite.compute_batch(HistogramBatch(self.x, self.weights))
+
+        np.testing.assert_array_almost_equal(result.values, expected.values, decimal=12)
+        np.testing.assert_array_almost_equal(result_batch.values, expected_batch.values, decimal=12)
+        np.testing.assert_array_equal(result.valid, expected.valid)
+
+    def test_consensus_points(self):
+        """Test the MEC kernel's consensus points."""
+        jit.set_enabled(False)
+        measure = MEC(alpha=1, beta=1.02)
+        expected = measure.consensus_batch(self.x, self.weights)
+
+        with mock.patch.object(jit, '_ENABLED', True):
+            values, points = measure.consensus_batch(self.x, self.weights)
+
+        np.testing.assert_array_almost_equal(values, expected[0], decimal=12)
+        np.testing.assert_array_almost_equal(points, expected[1], decimal=12)
+
+    def test_consensus_beta_near_one(self):
+        """Test the MEC kernel for beta just above 1, where tau^q underflows."""
+        jit.set_enabled(False)
+        for beta in [1.0001, 1.001, 1.01]:
+            measure = MEC(alpha=1, beta=beta)
+            expected = measure.consensus_batch(self.x, self.weights)
+
+            with mock.patch.object(jit, '_ENABLED', True):
+                values, points = measure.consensus_batch(self.x, self.weights)
+
+            self.assertEqual(np.isnan(values).sum(), 1)
+            np.testing.assert_array_almost_equal(values, expected[0], decimal=12)
+            np.testing.assert_array_almost_equal(points, expected[1], decimal=8)
+
+    def test_set_enabled(self):
+        """Test that the compiled kernels cannot be enabled without numba."""
+        if jit.AVAILABLE:
+            jit.set_enabled(True)
+            self.assertTrue(jit.enabled())
+        else:
+            with self.assertRaises(ImportError):
+                jit.set_enabled(True)
+        jit.set_enabled(False)
+        self.assertFalse(jit.enabled())
+
+    def test_pattern_agreement(self):
+        """Test the scalar pattern agreement against the vectorized one."""
+        bits = (np.arange(2 ** 6)[:, None] >> np.arange(6)) & 1
+        expected = VanDerEijkPol._pattern_agreements(bits[1:])
+        agreements = [kernels._pattern_agreement(pattern.astype(bool), 6) for pattern in bits[1:]]
+        np.testing.assert_array_almost_equal(agreements, expected)
+
+if __name__ == "__main__":
+    unittest.main()
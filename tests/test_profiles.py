@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from src.measures.profiles import item_profiles
+from src.measures.suite import SuiteResult
+from src.measures.metrics.literature import EMDPol, EstebanRay
+from src.measures.metrics.proposed import BiPol, MEC
+
+class TestItemProfiles(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.scales = [5, 7, 5, np.arange(0, 11), 7]
+        self.answers = np.column_stack([
+            rng.integers(1, 6, 400), rng.integers(1, 8, 400), rng.integers(1, 6, 400),
+            rng.integers(0, 11, 400), rng.integers(1, 8, 400)]).astype(np.float64)
+        self.answers[rng.random(self.answers.shape) < 0.1] = np.nan
+        self.answers[:50, 1] = 99
+        self.weights = rng.uniform(0.5, 2, 400)
+        self.measures = {'ER': EstebanRay(), 'EMD': EMDPol(), 'BiPol': BiPol(), 'MEC': MEC()}
+
+    def test_matches_per_item(self):
+        """Test that every item equals the measures on its own column."""
+        missing = [None, 99, None, None, None]
+        result = item_profiles(self.answers, self.measures, self.scales,
+                               missing=missing, weights=self.weights)
+
+        self.assertIsInstance(result, SuiteResult)
+        self.assertEqual(result.values.shape, (5, 4))
+        self.assertTrue(np.all(result.valid))
+
+        for item, scale in enumerate(self.scales):
+            categories = np.arange(1, scale + 1) if isinstance(scale, int) else scale
+            column = self.answers[:, item]
+            keep = ~np.isnan(column) & (column != 99)
+            counts = np.array([self.weights[keep][column[keep] == c].sum() for c in categories])
+            for name, measure in self.measures.items():
+                self.assertAlmostEqual(result[name][item], measure(categories, counts))
+
+    def test_missing_items(self):
+        """Test that items without answers are NaN and invalid."""
+        answers = np.array([[1, 9], [5, 9], [3, 9]])
+        result = item_profiles(answers, self.measures, 5, missing=9)
+
+        np.testing.assert_array_equal(result.valid, [True, False])
+        self.assertTrue(np.all(np.isnan(result.values[1])))
+
+    def test_invalid(self):
+        """Test mismatched scales and answers outside the scale."""
+        with self.assertRaises(ValueError):
+            item_profiles(self.answers, self.measures, [5, 7])
+        with self.assertRaises(ValueError):
+            item_profiles(np.array([[1, 6]]), self.measures, 5)
+
+if __name__ == "__main__":
+    unittest.main()
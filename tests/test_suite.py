@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+from src.measures.suite import MeasureSuite, SuiteResult
+from src.measures.histograms import HistogramBatch
+from src.measures.utils import jit
+from src.measures.metrics.literature import EMDPol, EstebanRay, Experts, ShannonPol, VanDerEijkPol
+from src.measures.metrics.proposed import BiPol, MEC
+from src.measures.metrics.proposed.mec import MECNormalized
+
+class TestMeasureSuite(unittest.TestCase):
+    def setUp(self):
+        self.measures = {
+            'MEC(2,1.15)': MEC(),
+            'MEC(2,1.15)N': MECNormalized(),
+            'MEC(1,2)': MEC(alpha=1, beta=2),
+            'ER(0.8)': EstebanRay(),
+            'ER(1.6)': EstebanRay(alpha=1.6),
+            'EMD': EMDPol(),
+            'Experts': Experts(),
+            'Shannon': ShannonPol(),
+            'VanDerEijk': VanDerEijkPol(),
+            'BiPol': BiPol()
+        }
+        self.suite = MeasureSuite(self.measures)
+        self.x = np.array([1, 2, 3, 4, 5])
+        self.weights = np.array([
+            [12, 20, 40, 21, 7],
+            [36, 10, 8, 11, 35],
+            [0, 0, 0, 0, 0],
+            [0, 0, 1, 0, 0]
+        ])
+
+    def test_matches_individual_measures(self):
+        """Test that every column equals the measure's own compute_batch."""
+        result = self.suite.compute_batch(self.x, self.weights)
+
+        self.assertIsInstance(result, SuiteResult)
+        self.assertEqual(result.names, list(self.measures))
+        self.assertEqual(result.values.shape, (4, len(self.measures)))
+        np.testing.assert_array_equal(result.valid, [True, True, False, True])
+
+        for name, measure in self.measures.items():
+            np.testing.assert_array_almost_equal(
+                result[name], measure.compute_batch(self.x, self.weights))
+
+    def test_as_dict(self):
+        """Test the dict view of the columns."""
+        columns = self.suite.compute_batch(self.x, self.weights).as_dict()
+        self.assertEqual(list(columns), list(self.measures))
+        self.assertTrue(np.isnan(columns['EMD'][2]))
+
+    def test_batch_intermediates_shared(self):
+        """Test that intermediates are computed once on a HistogramBatch."""
+        # The compiled kernels compute every measure from the weights directly
+        self.addCleanup(jit.set_enabled, jit.enabled())
+        jit.set_enabled(False)
+        batch = HistogramBatch(self.x, self.weights[[0, 1, 3]])
+        self.suite.compute_batch(batch)
+
+        self.assertEqual(set(batch._powers), {1.0, 1.8, 2.0, 2.6})
+        efforts = [key for key in batch._shared if key[0] == 'mec_efforts']
+        self.assertEqual(len(efforts), 2)
+
+    def test_single_histogram(self):
+        """Test evaluating one histogram."""
+        values = self.suite(self.x, self.weights[0])
+        for name, measure in self.measures.items():
+            self.assertAlmostEqual(values[name], measure(self.x, self.weights[0]))
+
+        with self.assertRaises(ValueError):
+            self.suite(self.x, self.weights[2])
+
+    def test_per_row_grids(self):
+        """Test that per-row grids are evaluated measure by measure."""
+        x = np.tile(self.x, (4, 1))
+        result = self.suite.compute_batch(x, self.weights)
+        expected = self.suite.compute_batch(self.x, self.weights)
+
+        np.testing.assert_array_almost_equal(result.values, expected.values)
+        np.testing.assert_array_equal(result.valid, expected.valid)
+
+    def test_unique_names(self):
+        """Test that a list of measures is named by measure_id."""
+        suite = MeasureSuite([EMDPol(), BiPol()])
+        self.assertEqual(suite.names, ["EMDPol", "BiPol"])
+
+        with self.assertRaises(ValueError):
+            MeasureSuite([EstebanRay(), EstebanRay(alpha=1.6)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+from src.measures.timeseries import SlidingWindowSeries, DecayedSeries, SeriesResult
+from src.measures.suite import MeasureSuite
+from src.measures.metrics.literature import EMDPol, EstebanRay
+from src.measures.metrics.proposed import BiPol, MEC
+
+class TestPolarizationSeries(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.x = np.arange(5)
+        self.times = np.sort(rng.uniform(0, 100, 3000))
+        self.bins = rng.integers(0, 5, 3000)
+        self.weights = rng.uniform(0, 2, 3000)
+        self.measures = {'ER': EstebanRay(), 'EMD': EMDPol(), 'BiPol': BiPol(), 'MEC': MEC()}
+        self.suite = MeasureSuite(self.measures)
+
+    def expected(self, times, weight):
+        """Recompute every emitted value from scratch with per-response weights."""
+        W = np.array([np.bincount(self.bins, weights=weight(t), minlength=5) for t in times])
+        return self.suite.compute_batch(self.x, W).values
+
+    def test_sliding_window(self):
+        """Test that a sliding window matches re-aggregating every window."""
+        series = SlidingWindowSeries(self.measures, self.x, window=7, stride=1, start=0)
+        results = [series.update(self.times[:1000], self.bins[:1000], self.weights[:1000]),
+                   series.update(self.times[1000:], self.bins[1000:], self.weights[1000:]),
+                   series.flush(110)]
+
+        self.assertIsInstance(results[0], SeriesResult)
+        times = np.concatenate([result.times for result in results])
+        values = np.vstack([result.values for result in results])
+        np.testing.assert_array_equal(times, np.arange(1, 111))
+
+        def weight(t):
+            return self.weights * ((self.times >= t - 7) & (self.times < t))
+
+        np.testing.assert_array_almost_equal(values, self.expected(times, weight))
+        self.assertTrue(np.all(np.isnan(values[-1])))
+        self.assertEqual(len(series._buffer), 0)
+
+    def test_single_responses(self):
+        """Test response-at-a-time updates against one bulk update, with a bounded buffer."""
+        bulk = SlidingWindowSeries(self.measures, self.x, window=3, stride=1, start=0)
+        expected = bulk.update(self.times, self.bins, self.weights)
+
+        series = SlidingWindowSeries(self.measures, self.x, window=3, stride=1, start=0)
+        results = [series.update(self.times[i:i + 1], self.bins[i:i + 1], self.weights[i:i + 1])
+                   for i in range(self.times.size)]
+        np.testing.assert_array_equal(np.concatenate([r.times for r in results]), expected.times)
+        np.testing.assert_array_almost_equal(np.vstack([r.values for r in results]),
+                                             expected.values)
+        self.assertLess(series._buffer._bins.size, 4 * len(series._buffer) + 64)
+
+    def test_decayed(self):
+        """Test exponential decay, including rescaling after many half-lives."""
+        series = DecayedSeries(self.measures, self.x, half_life=1, stride=2, start=0)
+        result = series.update(self.times, self.bins, self.weights)
+
+        def weight(t):
+            before = self.times < t
+            return np.where(before, self.weights * np.exp2(-(t - self.times) / 1), 0)
+
+        np.testing.assert_array_almost_equal(result.values, self.expected(result.times, weight))
+        np.testing.assert_array_almost_equal(result['ER'], result.as_dict()['ER'])
+
+    def test_datetimes(self):
+        """Test datetime64 times with timedelta64 windows."""
+        start = np.datetime64('2024-01-01T00:00')
+        times = start + (self.times * 1440).astype('timedelta64[m]')
+        series = SlidingWindowSeries(self.measures, self.x, window=np.timedelta64(7, 'D'),
+                                     stride=np.timedelta64(1, 'D'), start=start)
+        result = series.update(times, self.bins)
+
+        self.assertEqual(result.times[0], np.datetime64('2024-01-02T00:00'))
+        self.assertEqual(len(result.times), 99)
+        last = (times >= result.times[-1] - np.timedelta64(7, 'D')) & (times < result.times[-1])
+        np.testing.assert_array_almost_equal(
+            result.values[-1],
+            list(self.suite(self.x, np.bincount(self.bins[last], minlength=5)).values()))
+
+    def test_invalid(self):
+        """Test out-of-order responses and invalid bins."""
+        series = SlidingWindowSeries(self.measures, self.x, window=7, stride=1)
+        with self.assertRaises(ValueError):
+            series.flush(10)
+        series.update([1.0, 2.0], [0, 4])
+        with self.assertRaises(ValueError):
+            series.update([1.5], [2])
+        with self.assertRaises(ValueError):
+            series.update([3.0, 2.5], [2, 2])
+        with self.assertRaises(ValueError):
+            series.update([3.0], [5])
+        with self.assertRaises(ValueError):
+            SlidingWindowSeries(self.measures, self.x, window=7, stride=0)
+
+if __name__ == "__main__":
+    unittest.main()
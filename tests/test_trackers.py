@@ -0,0 +1,128 @@
+import unittest
+import numpy as np
+from src.measures.trackers import PolarizationTracker
+from src.measures.metrics.literature import EMDPol, EstebanRay, Experts, ShannonPol, VanDerEijkPol
+from src.measures.metrics.proposed import BiPol, MEC
+from src.measures.metrics.proposed.mec import MECNormalized
+
+class TestPolarizationTrackers(unittest.TestCase):
+    def setUp(self):
+        self.x = np.array([1, 2, 3, 4, 5])
+        self.measures = [EMDPol(), BiPol(), ShannonPol(), EstebanRay(), Experts(),
+                         MEC(), MECNormalized(), VanDerEijkPol()]
+    
+    def test_matches_measure(self):
+        """Test that every tracker follows the measure through adds and removes."""
+        rng = np.random.default_rng(0)
+        
+        for measure in self.measures:
+            with self.subTest(measure=measure.measure_id):
+                tracker = measure.tracker(self.x)
+                self.assertIsInstance(tracker, PolarizationTracker)
+                counts = np.zeros(5)
+                
+                for _ in range(200):
+                    bin = int(rng.integers(5))
+                    if counts[bin] > 0 and rng.random() < 0.4:
+                        tracker.remove(bin)
+                        counts[bin] -= 1
+                    else:
+                        tracker.add(bin, 2)
+                        counts[bin] += 2
+                    if counts.sum() > 0:
+                        self.assertAlmostEqual(tracker.value, measure(self.x, counts), places=10)
+                
+                np.testing.assert_array_equal(tracker.counts, counts)
+    
+    def test_initial_counts(self):
+        """Test a tracker built from existing counts."""
+        counts = np.array([10, 2, 0, 3, 12])
+        for measure in self.measures:
+            with self.subTest(measure=measure.measure_id):
+                tracker = measure.tracker(self.x, counts)
+                self.assertAlmostEqual(tracker.value, measure(self.x, counts), places=10)
+                self.assertEqual(tracker.total, 27)
+    
+    def test_empty_tracker(self):
+        """Test that an empty tracker has no value."""
+        tracker = EMDPol().tracker(self.x)
+        self.assertTrue(np.isnan(tracker.value))
+        
+        tracker.add(0)
+        tracker.remove(0)
+        self.assertTrue(np.isnan(tracker.value))
+    
+    def test_invalid_updates(self):
+        """Test that impossible updates raise ValueError."""
+        tracker = BiPol().tracker(self.x, np.array([1, 0, 0, 0, 1]))
+        
+        with self.assertRaises(ValueError):
+            tracker.remove(1)
+        with self.assertRaises(ValueError):
+            tracker.add(1, -1)
+        with self.assertRaises(ValueError):
+            BiPol().tracker(self.x, np.array([1, -1, 0, 0, 1]))
+        with self.assertRaises(ValueError):
+            tracker.update(np.array([0, 0, 0, 0, -2]))
+        
+        value = tracker.value
+        for bin, count in [(2, np.inf), (2, np.nan), (-1, 1.0), (5, 1.0)]:
+            for apply in (tracker.add, tracker.remove):
+                with self.assertRaises(ValueError):
+                    apply(bin, count)
+        np.testing.assert_array_equal(tracker.counts, [1, 0, 0, 0, 1])
+        self.assertEqual(tracker.value, value)
+    
+    def test_remove_float_weights(self):
+        """Test removing exactly the random float weights that were added."""
+        rng = np.random.default_rng(3)
+        bins = rng.integers(0, 5, 300)
+        weights = rng.random(300)
+
+        for measure in self.measures:
+            with self.subTest(measure=measure.measure_id):
+                tracker = measure.tracker(self.x)
+                for bin, weight in zip(bins, weights):
+                    tracker.add(int(bin), weight)
+                for bin, weight in zip(bins[:150], weights[:150]):
+                    tracker.remove(int(bin), weight)
+
+                counts = np.bincount(bins[150:], weights=weights[150:], minlength=5)
+                self.assertAlmostEqual(tracker.value, measure(self.x, counts))
+                for bin, weight in zip(bins[150:], weights[150:]):
+                    tracker.remove(int(bin), weight)
+                np.testing.assert_array_equal(tracker.counts, 0)
+                self.assertTrue(np.isnan(tracker.value))
+
+    def test_vector_update(self):
+        """Test applying a change to several bins at once."""
+        for measure in self.measures:
+            with self.subTest(measure=measure.measure_id):
+                tracker = measure.tracker(self.x, np.array([3, 1, 0, 2, 4]))
+                tracker.update(np.array([-1, 2, 5, 0, -4]))
+                np.testing.assert_array_equal(tracker.counts, [2, 3, 5, 2, 0])
+                self.assertAlmostEqual(tracker.value, measure(self.x, tracker.counts))
+    
+    def test_value_cached(self):
+        """Test that the value is computed once between updates."""
+        tracker = MEC().tracker(self.x, np.array([1, 2, 3, 2, 1]))
+        first = tracker.value
+        self.assertIs(tracker.value, first)
+        
+        tracker.add(4)
+        self.assertNotEqual(tracker.value, first)
+    
+    def test_refresh(self):
+        """Test that refresh rebuilds the running sums from the counts."""
+        tracker = Experts().tracker(self.x, np.array([3, 1, 4, 1, 5]))
+        for _ in range(100):
+            tracker.add(0, 0.1)
+            tracker.remove(0, 0.1)
+        value = tracker.value
+        
+        tracker.refresh()
+        self.assertAlmostEqual(tracker.value, value)
+        self.assertAlmostEqual(tracker.value, Experts()(self.x, tracker.counts))
+
+if __name__ == "__main__":
+    unittest.main()
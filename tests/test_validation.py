@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from src.measures.validation import validate_histogram, minmax_normalize_x, validate_parameters
+from src.measures.validation import validate_histogram, validate_batch, minmax_normalize_x, validate_parameters, Histogram
 
 class TestValidation(unittest.TestCase):
     def test_minmax_normalize_x(self):
@@ -65,6 +65,86 @@ class TestValidation(unittest.TestCase):
         with self.assertRaises(ValueError):
             validate_histogram(x, weights)
     
+    def test_validate_histogram_returns_histogram(self):
+        """Test that validated histograms are returned unchanged."""
+        hist = validate_histogram(np.array([1, 2, 3]), np.array([2, 1, 1]))
+        
+        self.assertIsInstance(hist, Histogram)
+        np.testing.assert_array_almost_equal(hist.weights, [0.5, 0.25, 0.25])
+        self.assertEqual(hist.weights.dtype, np.float64)
+        self.assertIs(validate_histogram(hist), hist)
+    
+    def test_validate_histogram_trusted(self):
+        """Test that trusted inputs skip checks and normalization."""
+        x = np.array([0.0, 0.5, 1.0])
+        weights = np.array([0.2, 0.3, 0.5])
+        
+        hist = validate_histogram(x, weights, trusted=True)
+        self.assertIs(hist.x, x)
+        self.assertIs(hist.weights, weights)
+    
+    def test_validate_histogram_error_non_finite(self):
+        """Test validation fails with infinite weights."""
+        with self.assertRaises(ValueError):
+            validate_histogram(np.array([0.0, 1.0]), np.array([np.inf, 1.0]))
+        with self.assertRaisesRegex(ValueError, "weights must be finite"):
+            validate_histogram(np.array([0.0, 0.5, 1.0]), np.array([0.5, np.nan, 1.0]))
+    
+    def test_validate_batch_trusted(self):
+        """Test that trusted batches are passed through."""
+        x = np.array([0.0, 0.5, 1.0])
+        weights = np.array([[0.2, 0.3, 0.5]])
+        
+        _, w_valid, valid = validate_batch(x, weights, trusted=True)
+        self.assertIs(w_valid, weights)
+        np.testing.assert_array_equal(valid, [True])
+    
+    def test_validate_batch_integer_counts(self):
+        """Test that integer counts are normalized to float64."""
+        x = np.array([0.0, 0.5, 1.0])
+        counts = np.array([[1, 1, 2], [0, 0, 0]], dtype=np.int32)
+        
+        _, w_valid, valid = validate_batch(x, counts)
+        self.assertEqual(w_valid.dtype, np.float64)
+        np.testing.assert_array_almost_equal(w_valid[0], [0.25, 0.25, 0.5])
+        np.testing.assert_array_equal(valid, [True, False])
+    
+    def test_validate_batch_shared_grid(self):
+        """Test validating a batch on a shared grid."""
+        x = np.array([1, 2, 3, 4, 5])
+        weights = np.array([
+            [1, 1, 1, 1, 1],
+            [0, 0, 0, 0, 0],
+            [1, np.nan, 0, 0, 1]
+        ])
+        
+        x_valid, w_valid, valid = validate_batch(x, weights)
+        
+        np.testing.assert_array_almost_equal(x_valid, [0.0, 0.25, 0.5, 0.75, 1.0])
+        np.testing.assert_array_almost_equal(w_valid[0], np.full(5, 0.2))
+        np.testing.assert_array_equal(valid, [True, False, False])
+    
+    def test_validate_batch_per_row_grid(self):
+        """Test validating a batch with one grid per row."""
+        x = np.array([[1.0, 2.0, 3.0], [0.0, 0.0, 1.0]])
+        weights = np.ones((2, 3))
+        
+        x_valid, _, valid = validate_batch(x, weights)
+        
+        np.testing.assert_array_almost_equal(x_valid[0], [0.0, 0.5, 1.0])
+        np.testing.assert_array_equal(valid, [True, False])
+    
+    def test_validate_batch_errors(self):
+        """Test that structural problems raise for the whole batch."""
+        with self.assertRaises(ValueError):
+            validate_batch(np.array([0.0, 0.5, 1.0]), np.ones(3))
+        
+        with self.assertRaises(ValueError):
+            validate_batch(np.array([0.0, 1.0]), np.ones((2, 3)))
+        
+        with self.assertRaises(ValueError):
+            validate_batch(np.array([0.0, 1.0, 0.5]), np.ones((2, 3)))
+    
     def test_validate_parameters(self):
         """Test parameter validation."""
         validate_parameters(alpha=1.0, beta=2.0)